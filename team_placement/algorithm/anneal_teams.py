@@ -0,0 +1,204 @@
+# native imports
+from math import exp
+from random import Random
+import time
+
+# external imports
+from team_placement.algorithm.apply_controls import apply_controls
+from team_placement.algorithm.form_cohorts import form_cohorts
+from team_placement.constants import ANNEAL_TIME_BUDGET
+from team_placement.schemas import Control, Person, PlacementReport, Targets, Team
+from team_placement.utils.result_cache import ResultCache
+from team_placement.utils.team_score import PREFERENCE_COST
+from team_placement.utils.team_search import TeamSearch
+
+# temperatures at the start and end of annealing
+START_TEMPERATURE = PREFERENCE_COST
+END_TEMPERATURE = PREFERENCE_COST / 1000
+
+# moves tried between checks of the time budget
+CHECK_INTERVAL = 100
+
+
+def anneal_people(
+    people: list[Person],
+    controls: list[Control],
+    teams: list[Team],
+    targets: Targets,
+    time_budget: float = ANNEAL_TIME_BUDGET,
+    seed: int = 0,
+    moves: int | None = None,
+    checkpoints: ResultCache | None = None,
+    report: PlacementReport | None = None,
+) -> list[Person]:
+    """
+    Places people prepared for team placement on teams by simulated annealing.
+    Cohorts formed by the first pass and controls are placed as a whole.
+
+    Parameters
+    ----------
+    people
+        People prepared for team placement.
+    controls
+        Controls by the user to guide people assignment.
+    teams
+        Teams for people assignment.
+    targets
+        Targets for each team.
+    time_budget
+        Seconds to spend annealing. Most seconds to spend when moves are given.
+    seed
+        Seed of the random moves.
+    moves
+        Number of moves to try. Cools over the time budget if None.
+    checkpoints
+        Cohorts of recent people and teams after the first pass.
+        Not used if None.
+    report
+        Cost of the placement and whether time ran out before every move was
+        tried. Not filled if None.
+
+    Returns
+    -------
+    list[Person]
+        People with cohorts and teams assigned.
+    """
+    # form cohorts from people with 1 preferred person and controls
+    cohorts = form_cohorts(people, teams, checkpoints)
+    people = cohorts.people
+
+    print("apply controls")
+    people = apply_controls(people, controls, cohorts)
+    people = cohorts.write_back()
+
+    print("anneal teams")
+    search = TeamSearch(cohorts, targets, teams)
+    search.place(cohorts)
+    insert_units(search)
+    cost, finished = anneal_teams(search, time_budget, seed, moves)
+    if report is not None:
+        report.cost = cost
+        report.timed_out = not finished
+    return search.write_back(set(range(len(teams))))
+
+
+def insert_units(search: TeamSearch) -> None:
+    """
+    Places cohorts without teams on the team costing least in order of size.
+
+    Parameters
+    ----------
+    search
+        Running metrics of cohorts on teams.
+    """
+    units = [u for u, movable in enumerate(search.movable) if movable]
+    units.sort(key=lambda x: len(search.units[x]), reverse=True)
+    for unit in units:
+        options = [
+            (search.move_delta(unit, team), team)
+            for team in range(len(search.team_names))
+            if search.can_join(unit, team)
+        ]
+        if len(options) > 0:
+            search.move(unit, min(options)[1])
+
+
+def anneal_teams(
+    search: TeamSearch,
+    time_budget: float,
+    seed: int,
+    moves: int | None = None,
+) -> tuple[float, bool]:
+    """
+    Anneals teams of cohorts by random moves and swaps until time runs out.
+    Moves raising the cost are accepted less often as the temperature cools.
+    The lowest cost placement found is kept.
+    Placements are reproducible for a seed when the number of moves is given
+    and all moves are tried within the time budget.
+
+    Parameters
+    ----------
+    search
+        Running metrics of cohorts on teams.
+    time_budget
+        Seconds to spend annealing. Most seconds to spend when moves are given.
+    seed
+        Seed of the random moves.
+    moves
+        Number of moves to try. Cools over the time budget if None.
+
+    Returns
+    -------
+    tuple[float, bool]
+        Cost of the lowest cost placement and whether every move was tried
+        within the time budget. Never true when moves is None.
+    """
+    rng = Random(seed)
+    units = [u for u, movable in enumerate(search.movable) if movable]
+    team_count = len(search.team_names)
+    cost = search.cost()
+    best_cost = cost
+    best = list(search.teams)
+    if len(units) == 0 or team_count < 2:
+        return best_cost, True
+    if time_budget <= 0:
+        return best_cost, False
+
+    start = time.monotonic()
+    temperature = START_TEMPERATURE
+    iteration = 0
+    finished = False
+    while True:
+        # cool geometrically over the moves or the time budget
+        if moves is not None and iteration >= moves:
+            finished = True
+            break
+        if iteration % CHECK_INTERVAL == 0:
+            elapsed = (time.monotonic() - start) / time_budget
+            if elapsed >= 1:
+                break
+            progress = elapsed if moves is None else iteration / moves
+            temperature = (
+                START_TEMPERATURE * (END_TEMPERATURE / START_TEMPERATURE) ** progress
+            )
+        iteration += 1
+
+        unit = rng.choice(units)
+        source = search.teams[unit]
+        if source == -1 or rng.random() < 0.5:
+            # move the cohort to another team
+            team = rng.randrange(team_count)
+            if team == source or not search.can_join(unit, team):
+                continue
+            delta = search.move_delta(unit, team)
+            if not is_accepted(delta, temperature, rng):
+                continue
+            search.move(unit, team)
+        else:
+            # swap the cohort with a cohort on another team
+            other = rng.choice(units)
+            team = search.teams[other]
+            if team in (-1, source):
+                continue
+            if not search.can_join(unit, team, other):
+                continue
+            if not search.can_join(other, source, unit):
+                continue
+            delta = search.swap_delta(unit, other)
+            if not is_accepted(delta, temperature, rng):
+                continue
+            search.swap(unit, other)
+
+        cost += delta
+        if cost < best_cost:
+            best_cost = cost
+            best = list(search.teams)
+
+    # running metrics are recalculated for the best placement
+    search.reset(best)
+    return search.cost(), finished
+
+
+def is_accepted(delta: float, temperature: float, rng: Random) -> bool:
+    """Determines if a move changing the cost by delta is accepted."""
+    return delta <= 0 or rng.random() < exp(-delta / temperature)
@@ -1,12 +1,14 @@
 # external imports
 from team_placement.algorithm.first_pass import first_pass
 from team_placement.schemas import Control, Person
+from team_placement.utils.cohorts import Cohorts
 from team_placement.utils.helpers import join_cohorts
 
 
 def apply_controls(
     people: list[Person],
     controls: list[Control],
+    cohorts: Cohorts | None = None,
 ) -> list[Person]:
     """
     Applies user controls to people and cohorts.
@@ -17,12 +19,19 @@ def apply_controls(
         All people to assign to teams.
     controls
         Include / Exclude controls when placing people on teams.
+    cohorts
+        Cohorts shared between stages and written back to people by the caller.
+        Created from people and written back if not provided.
 
     Returns
     -------
     list[Person]
         People with controls assigned when creating teams.
     """
+    owned = cohorts is None
+    if cohorts is None:
+        cohorts = Cohorts(people)
+
     # enforce user preferences
     for control in controls:
         person_1 = next(
@@ -40,7 +49,7 @@ def apply_controls(
 
             # leaders from different teams cannot be united
             # leader separation is assumed
-            if person_1.team != "" and person_2.team != "":
+            if cohorts.team(person_1) != "" and cohorts.team(person_2) != "":
                 continue
 
             # cannot unite if the union is not blessed
@@ -48,10 +57,10 @@ def apply_controls(
                 continue
 
             # combine cohorts
-            people = join_cohorts(person_1.cohort, person_2.cohort, people)
+            cohorts = join_cohorts(person_1, person_2, cohorts)
 
             # recurse
-            people = first_pass(people)
+            people = first_pass(people, cohorts)
 
         # separate cohorts
         for person_index in control.teamExclude:
@@ -61,17 +70,13 @@ def apply_controls(
                 continue
 
             # ignore people already united
-            if person_1.cohort == person_2.cohort:
+            if cohorts.root(person_1) == cohorts.root(person_2):
                 continue
 
             # separate cohorts
-            cohort_1 = [x for x in people if x.cohort == person_1.cohort]
-            for person in cohort_1:
-                person.banned_people.append(person_2.index)
-            cohort_2 = [x for x in people if x.cohort == person_2.cohort]
-            for person in cohort_2:
-                person.banned_people.append(person_1.index)
+            cohorts.ban(person_1, person_2.index)
+            cohorts.ban(person_2, person_1.index)
 
             # recurse
-            people = first_pass(people)
-    return people
+            people = first_pass(people, cohorts)
+    return cohorts.write_back() if owned else cohorts.people
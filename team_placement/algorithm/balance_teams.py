@@ -0,0 +1,353 @@
+# external imports
+from team_placement.schemas import Person, Targets
+from team_placement.utils.cohort_metrics import (
+    AGE_SQUARES,
+    AGE_SUM,
+    COLLECTIVES,
+    GIRL_COUNT,
+    ROW_SIZE,
+    TEAM_SIZE,
+    CohortMetrics,
+)
+from team_placement.utils.cohorts import Cohorts
+from team_placement.utils.helpers import join_cohorts
+from team_placement.utils.min_cost_flow import MinCostFlow
+from team_placement.utils.team_score import (
+    PREFERENCE_COST,
+    PRIORITY_WEIGHTS,
+    float_stdev,
+    team_cost,
+)
+
+# smallest difference in cost between units of flow given separate arcs
+COST_TOLERANCE = 1e-9
+
+
+def balance_teams(
+    people: list[Person],
+    targets: Targets,
+    team_count: int,
+    cohorts: Cohorts | None = None,
+) -> list[Person]:
+    """
+    Assigns cohorts without teams to teams in one min-cost flow.
+    People without teams or cohort members are the supply and the room each team
+    has below its targets is the demand. Teams cost more to fill the further
+    their team size and collective counts grow from targets, and each person
+    costs the change in girl count, age spread and unmet preferences.
+    Cohorts of several people are never split and join the team costing least
+    whole before the flow.
+
+    Parameters
+    ----------
+    people
+        All people to assign to teams.
+    targets
+        Targets for each cohort.
+    team_count
+        Number of teams to assign people to.
+    cohorts
+        Cohorts shared between stages and written back to people by the caller.
+        Created from people and written back if not provided.
+
+    Returns
+    -------
+    list[Person]
+        People with teams assigned.
+    """
+    owned = cohorts is None
+    if cohorts is None:
+        cohorts = Cohorts(people)
+
+    leaders, team_rows = collect_teams(cohorts)
+    remaining = [x for x in cohorts.representatives() if cohorts.team(x) == ""]
+    if len(leaders) == 0 or len(remaining) == 0:
+        return cohorts.write_back() if owned else cohorts.people
+
+    # cohorts of several people join the team costing least whole by size
+    remaining.sort(key=lambda x: cohorts.size(x), reverse=True)
+    singles = [x for x in remaining if cohorts.size(x) == 1]
+    for person in remaining[: len(remaining) - len(singles)]:
+        costs = cohort_costs(person, leaders, team_rows, cohorts, targets)
+        options = [(cost, t) for t, cost in enumerate(costs) if cost is not None]
+        if len(options) == 0:
+            continue
+        team = min(options)[1]
+        for j, value in enumerate(cohorts.metrics.rows[cohorts.root(person)]):
+            team_rows[team][j] += value
+        cohorts = join_cohorts(person, leaders[team], cohorts)
+    if len(singles) == 0:
+        return cohorts.write_back() if owned else cohorts.people
+
+    # nodes of the source, people, collectives on each team, teams and the sink
+    positions = [cohorts.positions[x.index] for x in singles]
+    collective_nodes = [
+        {
+            collective: 1 + len(positions) + t * len(COLLECTIVES) + k
+            for k, collective in enumerate(COLLECTIVES)
+        }
+        for t in range(len(leaders))
+    ]
+    team_nodes = [
+        1 + len(positions) + len(leaders) * len(COLLECTIVES) + t
+        for t in range(len(leaders))
+    ]
+    sink = team_nodes[-1] + 1
+    network = MinCostFlow(sink + 1)
+
+    # people join teams through the count of their collective
+    person_arcs: list[list[tuple[int, int]]] = []
+    for p, i in enumerate(positions):
+        network.add_arc(0, 1 + p, 1, 0.0)
+        collective = cohorts.table.collective(i)
+        costs = person_costs(i, leaders, team_rows, cohorts, targets)
+        person_arcs.append(
+            [
+                (t, network.add_arc(1 + p, collective_nodes[t][collective], 1, cost))
+                for t, cost in enumerate(costs)
+                if cost is not None
+            ]
+        )
+
+    # teams cost more to fill the further counts grow from targets
+    for t, team_row in enumerate(team_rows):
+        for collective, j in COLLECTIVES.items():
+            priority = f"collective_{collective.name}"
+            add_count_arcs(
+                network,
+                collective_nodes[t][collective],
+                team_nodes[t],
+                team_row[j],
+                getattr(targets, priority),
+                PRIORITY_WEIGHTS[priority],
+                len(positions),
+            )
+        add_count_arcs(
+            network,
+            team_nodes[t],
+            sink,
+            team_row[TEAM_SIZE],
+            targets.team_size,
+            PRIORITY_WEIGHTS["team_size"],
+            len(positions),
+        )
+    network.solve(0, sink)
+
+    # people join the team the flow sends them to
+    for person, arcs in zip(singles, person_arcs):
+        for t, arc in arcs:
+            if network.flow(arc) == 0:
+                continue
+
+            # people joining the same team may ban each other
+            if not is_conflict(person, leaders[t], cohorts):
+                cohorts = join_cohorts(person, leaders[t], cohorts)
+    return cohorts.write_back() if owned else cohorts.people
+
+
+def collect_teams(cohorts: Cohorts) -> tuple[list[Person], list[list[int]]]:
+    """
+    Collects a leader and the counts and age moments of everyone on each team.
+
+    Parameters
+    ----------
+    cohorts
+        Cohorts of all people to place on teams.
+
+    Returns
+    -------
+    tuple[list[Person], list[list[int]]]
+        First person of the first cohort on each team and team counts in order
+        of the first person on each team.
+    """
+    numbers: dict[str, int] = {}
+    leaders: list[Person] = []
+    team_rows: list[list[int]] = []
+    for root in cohorts.leaders():
+        team = cohorts.teams[root]
+        if team not in numbers:
+            numbers[team] = len(leaders)
+            leaders.append(cohorts.people[cohorts.firsts[root]])
+            team_rows.append([0] * ROW_SIZE)
+        for j, value in enumerate(cohorts.metrics.rows[root]):
+            team_rows[numbers[team]][j] += value
+    return leaders, team_rows
+
+
+def is_conflict(person: Person, leader: Person, cohorts: Cohorts) -> bool:
+    """Determines if the cohorts of a person and a leader ban each other."""
+    return cohorts.is_banned(person, leader) or cohorts.is_banned(leader, person)
+
+
+def is_unmet(position: int, team: str, cohorts: Cohorts) -> bool:
+    """
+    Determines if a first time person would have no preferred people in their
+    cohort or on a team.
+
+    Parameters
+    ----------
+    position
+        Position of a person.
+    team
+        Team the cohort of the person may join.
+    cohorts
+        Cohorts of all people to place on teams.
+
+    Returns
+    -------
+    bool
+        Flag for a first time person without preferred people on the team.
+    """
+    preferred = cohorts.graph.preferred[position]
+    if not cohorts.table.first_times[position] or len(preferred) == 0:
+        return False
+
+    root = cohorts.find(position)
+    for j in preferred:
+        friend_root = cohorts.find(j)
+        if friend_root == root or cohorts.teams[friend_root] == team:
+            return False
+    return True
+
+
+def cohort_costs(
+    person: Person,
+    leaders: list[Person],
+    team_rows: list[list[int]],
+    cohorts: Cohorts,
+    targets: Targets,
+) -> list[float | None]:
+    """
+    Change in cost of the cohort of a person joining each team whole.
+
+    Parameters
+    ----------
+    person
+        A person in a cohort without a team.
+    leaders
+        A leader on each team.
+    team_rows
+        Counts and age moments of everyone on each team.
+    cohorts
+        Cohorts of all people to place on teams.
+    targets
+        Targets for each team.
+
+    Returns
+    -------
+    list[float | None]
+        Change in cost on each team otherwise None for teams with people the
+        cohort bans or who ban the cohort.
+    """
+    root = cohorts.root(person)
+    row = cohorts.metrics.rows[root]
+    costs: list[float | None] = []
+    for leader, team_row in zip(leaders, team_rows):
+        if is_conflict(person, leader, cohorts):
+            costs.append(None)
+            continue
+        joined = [x + y for x, y in zip(team_row, row)]
+        cost = team_cost(joined, targets) - team_cost(team_row, targets)
+        team = cohorts.team(leader)
+        unmet = [i for i in cohorts.members[root] if is_unmet(i, team, cohorts)]
+        costs.append(cost + PREFERENCE_COST * len(unmet))
+    return costs
+
+
+def person_costs(
+    position: int,
+    leaders: list[Person],
+    team_rows: list[list[int]],
+    cohorts: Cohorts,
+    targets: Targets,
+) -> list[float | None]:
+    """
+    Change in cost of a person without cohort members joining each team.
+    Team size and collective counts are left to the flow as teams fill.
+
+    Parameters
+    ----------
+    position
+        Position of a person without a team or cohort members.
+    leaders
+        A leader on each team.
+    team_rows
+        Counts and age moments of everyone on each team.
+    cohorts
+        Cohorts of all people to place on teams.
+    targets
+        Targets for each team.
+
+    Returns
+    -------
+    list[float | None]
+        Change in cost on each team otherwise None for teams with people the
+        person bans or who ban the person.
+    """
+    person = cohorts.people[position]
+    row = CohortMetrics.person_row(cohorts.table, position)
+    costs: list[float | None] = []
+    for leader, team_row in zip(leaders, team_rows):
+        if is_conflict(person, leader, cohorts):
+            costs.append(None)
+            continue
+        joined = [x + y for x, y in zip(team_row, row)]
+        cost = PRIORITY_WEIGHTS["girl_count"] * (
+            abs(joined[GIRL_COUNT] - targets.girl_count)
+            - abs(team_row[GIRL_COUNT] - targets.girl_count)
+        )
+        age_std = float_stdev(joined[TEAM_SIZE], joined[AGE_SUM], joined[AGE_SQUARES])
+        team_age_std = float_stdev(
+            team_row[TEAM_SIZE], team_row[AGE_SUM], team_row[AGE_SQUARES]
+        )
+        cost += PRIORITY_WEIGHTS["age_std"] * (
+            abs(age_std - targets.age_std) - abs(team_age_std - targets.age_std)
+        )
+        if is_unmet(position, cohorts.team(leader), cohorts):
+            cost += PREFERENCE_COST
+        costs.append(cost)
+    return costs
+
+
+def add_count_arcs(
+    network: MinCostFlow,
+    tail: int,
+    head: int,
+    count: int,
+    target: float,
+    weight: float,
+    units: int,
+) -> None:
+    """
+    Adds arcs costing the change in weighted distance of a count from its target
+    as each unit of flow adds to the count. Units changing the distance equally
+    share an arc and cheaper units below the target are used first.
+
+    Parameters
+    ----------
+    network
+        Network to add arcs to.
+    tail
+        Node flow leaves.
+    head
+        Node flow enters.
+    count
+        Count before any flow.
+    target
+        Target of the count.
+    weight
+        Weight of the distance from the target.
+    units
+        Most units of flow.
+    """
+    capacity = 0
+    cost = 0.0
+    for n in range(1, units + 1):
+        change = weight * (abs(count + n - target) - abs(count + n - 1 - target))
+        if capacity > 0 and abs(change - cost) > COST_TOLERANCE:
+            network.add_arc(tail, head, capacity, cost)
+            capacity = 0
+        capacity += 1
+        cost = change
+    if capacity > 0:
+        network.add_arc(tail, head, capacity, cost)
@@ -1,15 +1,17 @@
 # external imports
 from team_placement.algorithm.prioritized_friend import prioritized_friend
+from team_placement.constants import PRIORITIES
 from team_placement.schemas import Person, Targets
-from team_placement.utils.helpers import (
-    collect_metrics,
-    collect_representatives,
-    join_cohorts,
-)
+from team_placement.utils.cohort_metrics import TEAM_SIZE
+from team_placement.utils.cohorts import Cohorts
+from team_placement.utils.helpers import collect_representatives, join_cohorts
 
 
 def complete_teams(
-    people: list[Person], targets: Targets, team_count: int
+    people: list[Person],
+    targets: Targets,
+    team_count: int,
+    cohorts: Cohorts | None = None,
 ) -> list[Person]:
     """
     Assigns cohorts to teams based on their size and preferences.
@@ -22,37 +24,41 @@ def complete_teams(
         Targets for each cohort.
     team_count
         Number of teams to assign people to.
+    cohorts
+        Cohorts shared between stages and written back to people by the caller.
+        Created from people and written back if not provided.
 
     Returns
     -------
     list[Person]
         People with teams assigned.
     """
+    owned = cohorts is None
+    if cohorts is None:
+        cohorts = Cohorts(people)
+
     # complete teams based on preferences in order of cohort size
-    representatives = collect_representatives(people)
-    representatives.sort(
-        key=lambda x: len([y for y in people if y.cohort == x.cohort]), reverse=True
-    )
+    representatives = collect_representatives(people, cohorts)
+    representatives.sort(key=lambda x: cohorts.size(x), reverse=True)
 
-    leaders = [x for x in representatives if x.team != ""]
-    remaining_representatives = [x for x in representatives if x.team == ""]
+    leaders = [x for x in representatives if cohorts.team(x) != ""]
+    remaining_representatives = [x for x in representatives if cohorts.team(x) == ""]
 
     tolerance = 2
     min_allowed = targets.team_size - tolerance
     min_allowed = min_allowed if min_allowed > 0 else 0
     priority = "team_size"
+    j = PRIORITIES.index(priority)
     for person in remaining_representatives:
-        number_assigned = (
-            sum([getattr(collect_metrics(people, x.cohort), priority) for x in leaders])
-            - min_allowed * team_count
-        )
+        leader_metrics = cohorts.metrics.matrix([cohorts.root(x) for x in leaders])
+        number_assigned = cohorts.leader_row[TEAM_SIZE] - min_allowed * team_count
         number_left = (
             getattr(targets, priority) * team_count
             - number_assigned
             - min_allowed * team_count
         )
         max_value = min(
-            getattr(collect_metrics(people, person.cohort), priority) + number_left,
+            cohorts.metrics.vector(cohorts.root(person))[j] + number_left,
             getattr(targets, priority) + tolerance,
         )
 
@@ -61,29 +67,27 @@ def complete_teams(
 
         # leaders of cohorts that are not at or above the maximum team size
         valid_leaders = [
-            x
-            for x in leaders
-            if getattr(collect_metrics(people, x.cohort), priority) < max_value
+            x for x, metrics in zip(leaders, leader_metrics) if metrics[j] < max_value
         ]
         if len(valid_leaders) == 0:
             continue
 
         # find the best leader for the person
-        friend = prioritized_friend(person, valid_leaders, people, targets, team_count)
+        friend = prioritized_friend(person, valid_leaders, cohorts, targets, team_count)
         if friend is None:
             continue
 
         # combine person and their friend's cohorts
-        people = join_cohorts(person.cohort, friend.cohort, people)
+        cohorts = join_cohorts(person, friend, cohorts)
 
     # assign remaining representatives to teams
-    remaining_representatives = [x for x in people if x.team == ""]
+    remaining_representatives = [x for x in people if cohorts.team(x) == ""]
     for person in remaining_representatives:
         # find the best leader for the person
-        friend = prioritized_friend(person, leaders, people, targets, team_count)
+        friend = prioritized_friend(person, leaders, cohorts, targets, team_count)
         if friend is None:
             continue
 
         # combine person and their friend's cohorts
-        people = join_cohorts(person.cohort, friend.cohort, people)
-    return people
+        cohorts = join_cohorts(person, friend, cohorts)
+    return cohorts.write_back() if owned else cohorts.people
@@ -0,0 +1,108 @@
+# native imports
+from math import ceil
+
+# external imports
+from team_placement.algorithm.balance_teams import cohort_costs, collect_teams
+from team_placement.schemas import Person, Targets
+from team_placement.utils.assignment import assign_rows
+from team_placement.utils.cohort_metrics import TEAM_SIZE
+from team_placement.utils.cohorts import Cohorts
+from team_placement.utils.helpers import join_cohorts
+
+
+def fill_teams(
+    people: list[Person],
+    targets: Targets,
+    team_count: int,
+    cohorts: Cohorts | None = None,
+) -> list[Person]:
+    """
+    Assigns cohorts without teams to teams in rounds of optimal assignments.
+    Each round every team with room takes at most one cohort and cohorts are
+    matched to teams at the lowest total change in cost from running team
+    counts. Teams without room take cohorts once no team has room.
+
+    Parameters
+    ----------
+    people
+        All people to assign to teams.
+    targets
+        Targets for each cohort.
+    team_count
+        Number of teams to assign people to.
+    cohorts
+        Cohorts shared between stages and written back to people by the caller.
+        Created from people and written back if not provided.
+
+    Returns
+    -------
+    list[Person]
+        People with teams assigned.
+    """
+    owned = cohorts is None
+    if cohorts is None:
+        cohorts = Cohorts(people)
+
+    leaders, team_rows = collect_teams(cohorts)
+    remaining = [x for x in cohorts.representatives() if cohorts.team(x) == ""]
+    capacity = ceil(targets.team_size)
+    while len(leaders) > 0 and len(remaining) > 0:
+        costs = [
+            cohort_costs(x, leaders, team_rows, cohorts, targets) for x in remaining
+        ]
+
+        # teams with room take cohorts before teams without room
+        teams = [t for t, row in enumerate(team_rows) if row[TEAM_SIZE] < capacity]
+        pairs = match_cohorts(costs, teams)
+        if len(pairs) == 0 and len(teams) < len(leaders):
+            pairs = match_cohorts(costs, list(range(len(leaders))))
+        if len(pairs) == 0:
+            break
+
+        # each team takes one cohort so cohorts in a round never ban each other
+        for j, t in pairs:
+            person = remaining[j]
+            for k, value in enumerate(cohorts.metrics.rows[cohorts.root(person)]):
+                team_rows[t][k] += value
+            cohorts = join_cohorts(person, leaders[t], cohorts)
+
+        placed = set([j for j, _ in pairs])
+        remaining = [x for j, x in enumerate(remaining) if j not in placed]
+    return cohorts.write_back() if owned else cohorts.people
+
+
+def match_cohorts(
+    costs: list[list[float | None]], teams: list[int]
+) -> list[tuple[int, int]]:
+    """
+    Matches cohorts to teams at the lowest total cost with at most one cohort
+    per team.
+
+    Parameters
+    ----------
+    costs
+        Change in cost of each cohort joining each team with None for teams with
+        people the cohort bans or who ban the cohort.
+    teams
+        Teams that may take a cohort.
+
+    Returns
+    -------
+    list[tuple[int, int]]
+        Cohort and team of each match.
+    """
+    if len(teams) == 0:
+        return []
+
+    matrix = [[row[t] for t in teams] for row in costs]
+    if len(costs) >= len(teams):
+        columns = assign_rows(transpose(matrix))
+        return [(j, t) for t, j in zip(teams, columns) if j is not None]
+
+    rows = assign_rows(matrix)
+    return [(j, teams[k]) for j, k in enumerate(rows) if k is not None]
+
+
+def transpose(matrix: list[list[float | None]]) -> list[list[float | None]]:
+    """Swaps the rows and columns of a matrix."""
+    return [list(x) for x in zip(*matrix)]
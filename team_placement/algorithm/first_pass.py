@@ -1,41 +1,136 @@
+# native imports
+from heapq import heapify, heappop, heappush
+
 # external imports
 from team_placement.schemas import Person
-from team_placement.utils.helpers import find_friends, find_new_people, join_cohorts
+from team_placement.utils.cohorts import Cohorts
+from team_placement.utils.helpers import (
+    find_friends,
+    find_new_people,
+    is_new_person,
+    join_cohorts,
+    preferred_people,
+)
 
 
-def first_pass(people: list[Person]) -> list[Person]:
+def first_pass(
+    people: list[Person],
+    cohorts: Cohorts | None = None,
+    new_people: list[Person] | None = None,
+) -> list[Person]:
     """
     Assigns people to cohorts with 1 preferred person.
-    Recurses after each addition to collapse preferred people on cohorts.
+    New people are assigned in order and only people affected by a join are rechecked.
+    This matches restarting from the first new person after each join.
 
     Parameters
     ----------
     people
         Already existing people where cohorts are assigned.
+    cohorts
+        Cohorts shared between stages and written back to people by the caller.
+        Created from people and written back if not provided.
+    new_people
+        New people to check. All new people are checked if not provided.
+        Only valid when other new people are known to have 0 or 2+ friends.
 
     Returns
     -------
     list[Person]
         People with new people added to cohorts.
     """
-    # assign new people to cohorts
-    new_people = find_new_people(people)
-    for person in new_people:
+    owned = cohorts is None
+    if cohorts is None:
+        cohorts = Cohorts(people)
+
+    if new_people is None:
+        new_people = find_new_people(cohorts)
+
+    # new people are checked in order
+    worklist = [(x.order, cohorts.positions[x.index]) for x in new_people]
+    heapify(worklist)
+    while len(worklist) > 0:
+        _, position = heappop(worklist)
+        person = cohorts.people[position]
+
+        # a join may have paired the person with a preference
+        if not is_new_person(person, cohorts):
+            continue
+
         # find friends
-        friends = find_friends(person, people)
+        friends = find_friends(person, cohorts, preferred_people(person, cohorts))
 
         # take action when a new person has 0 or 1 possible preference
-        match len(friends):
-            case 0:
-                # no friends to add
-                continue
-            case 1:
-                # add friend to the cohort of the person
-                people = join_cohorts(person.cohort, friends[0].cohort, people)
-
-                # recurse
-                return first_pass(people)
-            case _:
-                # too many choices at this time
-                continue
-    return people
+        # with 0 friends there are no friends to add
+        # with 2+ friends there are too many choices at this time
+        if len(friends) != 1:
+            continue
+
+        # add friend to the cohort of the person
+        # recheck people who may be left with a single friend
+        for i in join_new_person(person, friends[0], cohorts):
+            if is_new_person(cohorts.people[i], cohorts):
+                heappush(worklist, (cohorts.table.orders[i], i))
+    return cohorts.write_back() if owned else cohorts.people
+
+
+def join_new_person(
+    person: Person,
+    friend: Person,
+    cohorts: Cohorts,
+) -> set[int]:
+    """
+    Joins the cohorts of a new person and their friend.
+    Collects people whose possible friends may be reduced to 1 by the join.
+    Friends merge when people prefer both cohorts.
+    Friends are excluded when cohorts gain teams or banned people.
+
+    Parameters
+    ----------
+    person
+        A new person.
+    friend
+        The only possible friend of the person.
+    cohorts
+        Cohorts of all people to place on teams.
+
+    Returns
+    -------
+    set[int]
+        Positions of people to recheck.
+    """
+    roots = cohorts.roots([person, friend])
+    smaller = min(roots, key=lambda x: len(cohorts.members[x]))
+    smaller_members = set(cohorts.members[smaller])
+    teams = {root: cohorts.teams[root] for root in roots}
+    banned = {root: cohorts.ban_count(root) for root in roots}
+    banning = set([x for root in roots for x in cohorts.banning(root)])
+
+    cohorts = join_cohorts(person, friend, cohorts)
+    root = cohorts.root(person)
+
+    # people preferring both cohorts are admirers of the smaller cohort
+    affected: set[int] = set()
+    for i in smaller_members:
+        affected.update(cohorts.graph.admirers[i])
+
+    # cohorts gaining a team or banned people exclude friends
+    for previous_root in roots:
+        team_changed = teams[previous_root] != cohorts.teams[root]
+        if not team_changed and banned[previous_root] == cohorts.ban_count(root):
+            continue
+
+        members = [
+            i
+            for i in cohorts.members[root]
+            if (i in smaller_members) == (previous_root == smaller)
+        ]
+        affected.update(members)
+        if team_changed:
+            for i in members:
+                affected.update(cohorts.graph.admirers[i])
+
+    # cohorts banning anyone in the joined cohort exclude everyone in it
+    for banner in banning:
+        affected.update(cohorts.members[cohorts.find(banner)])
+    return affected
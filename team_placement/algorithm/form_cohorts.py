@@ -0,0 +1,63 @@
+# external imports
+from team_placement.algorithm.assign_leaders import assign_leaders
+from team_placement.algorithm.first_pass import first_pass
+from team_placement.schemas import Person, Team
+from team_placement.utils.cohorts import Cohorts
+from team_placement.utils.people_table import PeopleTable
+from team_placement.utils.preference_graph import PreferenceGraph
+from team_placement.utils.result_cache import ResultCache, request_key
+
+
+def form_cohorts(
+    people: list[Person],
+    teams: list[Team],
+    checkpoints: ResultCache | None = None,
+) -> Cohorts:
+    """
+    Assigns leaders to cohorts and forms cohorts from new people with 1 preferred
+    person ahead of controls.
+    Cohorts of people and teams seen before are restored from a checkpoint so
+    requests changing only controls resume from applying controls.
+
+    Parameters
+    ----------
+    people
+        People prepared for team placement.
+    teams
+        Teams for people assignment.
+    checkpoints
+        Cohorts of recent people and teams after the first pass.
+        Not used if None.
+
+    Returns
+    -------
+    Cohorts
+        Cohorts shared by the following stages and written back to people by the
+        caller.
+    """
+    key = ""
+    if checkpoints is not None:
+        key = request_key(people, [], teams, {"stage": "first_pass"})
+        if checkpoints.get(key, people):
+            print("resume from first pass")
+            table = PeopleTable(people)
+            return Cohorts(people, PreferenceGraph(people, table), table)
+
+    # assign leaders to cohorts based on teams
+    print("assign leaders")
+    people = assign_leaders(people, teams)
+
+    # attributes and preferences are fixed for the rest of team placement
+    table = PeopleTable(people)
+    graph = PreferenceGraph(people, table)
+
+    # cohorts are shared by all stages and written back to people once placed
+    cohorts = Cohorts(people, graph, table)
+
+    # assign new people with 0 or 1 preference to cohorts
+    # restart whenever someone is added to a cohort to capture new information
+    print("perform first pass")
+    people = first_pass(people, cohorts)
+    if checkpoints is not None:
+        checkpoints.put(key, cohorts.write_back())
+    return cohorts
@@ -0,0 +1,100 @@
+# native imports
+from random import Random
+import time
+
+# external imports
+from team_placement.constants import IMPROVE_TIME_BUDGET
+from team_placement.schemas import Person, PlacementReport
+from team_placement.utils.cohorts import Cohorts
+from team_placement.utils.team_search import TeamSearch
+
+# smallest decrease in cost counted as an improvement
+IMPROVEMENT_TOLERANCE = 1e-9
+
+
+def improve_teams(
+    search: TeamSearch,
+    cohorts: Cohorts,
+    time_budget: float = IMPROVE_TIME_BUDGET,
+    seed: int = 0,
+    report: PlacementReport | None = None,
+) -> list[Person]:
+    """
+    Improves completed teams by moving and swapping cohorts between teams.
+    Cohorts without teams before cohorts joined teams are moved as a whole.
+    Moves are kept when they lower the cost until no move helps or time runs out.
+    Cohorts never share a team with people they ban or who ban them.
+
+    Parameters
+    ----------
+    search
+        Running metrics of cohorts collected before cohorts joined teams.
+    cohorts
+        Cohorts of all people after teams are completed.
+    time_budget
+        Seconds to spend improving teams.
+    seed
+        Seed of the random order cohorts are tried in.
+    report
+        Whether time ran out before no move helped. Not filled if None.
+
+    Returns
+    -------
+    list[Person]
+        People with improved teams written back.
+    """
+    deadline = time.monotonic() + time_budget
+    search.place(cohorts)
+
+    rng = Random(seed)
+    units = [u for u, movable in enumerate(search.movable) if movable]
+    team_count = len(search.team_names)
+    changed: set[int] = set()
+    improved = True
+    timed_out = False
+    while improved and not timed_out:
+        improved = False
+        rng.shuffle(units)
+        for unit in units:
+            if time.monotonic() >= deadline:
+                timed_out = True
+                break
+
+            # move the cohort to another team
+            source = search.teams[unit]
+            best = None
+            for team in range(team_count):
+                if team == source or not search.can_join(unit, team):
+                    continue
+                delta = search.move_delta(unit, team)
+                if delta < -IMPROVEMENT_TOLERANCE and (best is None or delta < best[0]):
+                    best = (delta, team)
+            if best is not None:
+                search.move(unit, best[1])
+                changed.update([source, best[1]])
+                improved = True
+                continue
+
+            # people without teams are only moved onto teams
+            if source == -1:
+                continue
+
+            # swap the cohort with a cohort on another team
+            for other in units:
+                team = search.teams[other]
+                if team in (-1, source):
+                    continue
+                if not search.can_join(unit, team, other):
+                    continue
+                if not search.can_join(other, source, unit):
+                    continue
+                if search.swap_delta(unit, other) < -IMPROVEMENT_TOLERANCE:
+                    search.swap(unit, other)
+                    changed.update([source, team])
+                    improved = True
+                    break
+
+    if report is not None:
+        report.timed_out = timed_out
+    changed.discard(-1)
+    return search.write_back(changed)
@@ -0,0 +1,185 @@
+# native imports
+from contextlib import redirect_stdout
+import io
+from multiprocessing import Pool
+from multiprocessing.pool import AsyncResult
+import os
+from random import Random
+import time
+from typing import Callable
+
+# external imports
+from team_placement.schemas import Control, Person, PlacementReport, Targets, Team
+from team_placement.utils.team_score import score_people
+
+# places people prepared for team placement given controls, teams and targets
+# and fills a report given by keyword
+Placement = Callable[..., list[Person]]
+
+
+def shuffle_people(people: list[Person], seed: int) -> list[Person]:
+    """
+    Copies people in a random order.
+    People keep the same set of orders so sorting by order follows the new order.
+
+    Parameters
+    ----------
+    people
+        People prepared for team placement.
+    seed
+        Seed of the random order.
+
+    Returns
+    -------
+    list[Person]
+        Copies of people in a random order.
+    """
+    shuffled = [x.model_copy(deep=True) for x in people]
+    Random(seed).shuffle(shuffled)
+    orders = sorted([x.order for x in shuffled])
+    for person, order in zip(shuffled, orders):
+        person.order = order
+    return shuffled
+
+
+def place_start(
+    place: Placement,
+    people: list[Person],
+    controls: list[Control],
+    teams: list[Team],
+    targets: Targets,
+    seed: int,
+) -> tuple[float, list[Person], PlacementReport]:
+    """
+    Places people on teams from a random order without progress messages.
+
+    Parameters
+    ----------
+    place
+        Places people on teams in order of people.
+    people
+        People prepared for team placement.
+    controls
+        Controls by the user to guide people assignment.
+    teams
+        Teams for people assignment.
+    targets
+        Targets for each team.
+    seed
+        Seed of the random order.
+
+    Returns
+    -------
+    tuple[float, list[Person], PlacementReport]
+        Score of the placement, copies of people placed on teams and the report
+        of the placement.
+    """
+    shuffled = shuffle_people(people, seed)
+    report = PlacementReport()
+    with redirect_stdout(io.StringIO()):
+        placed = place(shuffled, controls, teams, targets, report=report)
+    return score_people(placed, teams, targets), placed, report
+
+
+def multi_start(
+    place: Placement,
+    people: list[Person],
+    controls: list[Control],
+    teams: list[Team],
+    targets: Targets,
+    starts: int,
+    workers: int | None = None,
+    time_budget: float | None = None,
+    seed: int = 0,
+    report: PlacementReport | None = None,
+) -> list[Person]:
+    """
+    Places people on teams from several orders of people and keeps the best.
+    The given order is placed in this process while random orders are placed
+    by other processes. Processes still placing after the time budget are
+    terminated so the given order is always available.
+
+    Parameters
+    ----------
+    place
+        Places people on teams in order of people.
+        Must be defined at module level to be sent to other processes.
+    people
+        People prepared for team placement.
+    controls
+        Controls by the user to guide people assignment.
+    teams
+        Teams for people assignment.
+    targets
+        Targets for each team.
+    starts
+        Number of orders of people including the given order.
+    workers
+        Number of processes placing random orders. Defaults to the number of processors.
+    time_budget
+        Seconds to wait for random orders. Waits for all orders if None.
+    seed
+        Seed of the first random order. Later orders use the following seeds.
+    report
+        Report of the best placement that also counts as timed out when any
+        order ran out of time or was stopped. Not filled if None.
+
+    Returns
+    -------
+    list[Person]
+        People with the placement scoring lowest written back.
+    """
+    deadline = None if time_budget is None else time.monotonic() + time_budget
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    pool = Pool(processes=max(min(workers, starts - 1), 1))
+    try:
+        # people are sent to other processes as they are now
+        pending: dict[int, AsyncResult] = {
+            k: pool.apply_async(
+                place_start, (place, people, controls, teams, targets, seed + k)
+            )
+            for k in range(1, starts)
+        }
+
+        # the given order is placed from copies while random orders are placed
+        given = PlacementReport()
+        placed = place(
+            [x.model_copy(deep=True) for x in people],
+            controls,
+            teams,
+            targets,
+            report=given,
+        )
+        results = [(score_people(placed, teams, targets), 0, placed, given)]
+
+        timed_out = False
+        for k, result in pending.items():
+            remaining = None
+            if deadline is not None:
+                remaining = max(deadline - time.monotonic(), 0)
+            result.wait(remaining)
+            if result.ready():
+                score, placed, start = result.get()
+                results.append((score, k, placed, start))
+            else:
+                timed_out = True
+    finally:
+        # orders still being placed are stopped rather than left running
+        pool.terminate()
+        pool.join()
+
+    # ties are broken by the order placed first
+    _, _, best, best_report = min(results, key=lambda x: (x[0], x[1]))
+    if report is not None:
+        report.cost = best_report.cost
+        report.proved = best_report.proved
+        report.counters = best_report.counters
+        report.timed_out = timed_out or any([x[3].timed_out for x in results])
+    best_people = {x.index: x for x in best}
+    for person in people:
+        person.cohort = best_people[person.index].cohort
+        person.team = best_people[person.index].team
+        person.banned_people = best_people[person.index].banned_people
+    return people
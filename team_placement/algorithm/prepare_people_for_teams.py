@@ -1,6 +1,3 @@
-# native imports
-import shortuuid
-
 # external imports
 from team_placement.constants import MAXIMUM_AGE, MINIMUM_AGE
 from team_placement.schemas import BooleanEnum, Person
@@ -48,7 +45,7 @@ def prepare_people_for_teams(all_people: list[Person]) -> list[Person]:
         elif person.age > MAXIMUM_AGE:
             person.age = MAXIMUM_AGE
 
-    # assign people to cohorts
+    # people without a cohort name start in their own cohorts by position
     for person in people:
-        person.cohort = shortuuid.ShortUUID().random(length=6)
+        person.cohort = ""
     return people
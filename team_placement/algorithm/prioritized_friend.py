@@ -1,18 +1,54 @@
-# native imports
-from statistics import stdev
-
 # external imports
-from team_placement.schemas import Collective, Gender, Person, Targets
+from team_placement.schemas import Collective, Person, Targets
 from team_placement.constants import PRIORITIES
-from team_placement.utils.helpers import (
-    collect_metrics,
-    find_friends,
+from team_placement.utils.cohort_metrics import (
+    AGE_SQUARES,
+    AGE_SUM,
+    COLLECTIVES,
+    GIRL_COUNT,
+    PRIORITY_COLUMNS,
+    TEAM_SIZE,
+    adjusted_sample_stdev,
 )
+from team_placement.utils.cohorts import Cohorts, bits
+from team_placement.utils.helpers import find_friends
+
+# position of the age offset in offsets ordered by priorities
+AGE_STD = PRIORITIES.index("age_std")
+
+# collective of each collective priority
+COLLECTIVE_PRIORITIES = {
+    "collective_new": Collective.new,
+    "collective_newish": Collective.newish,
+    "collective_oldish": Collective.oldish,
+    "collective_old": Collective.old,
+}
+
+
+def find_other_mask(people_in_cohort: list[Person], cohorts: Cohorts) -> int:
+    """
+    Collects people who could potentially cohort with people in cohort as a bitset.
+
+    Parameters
+    ----------
+    people_in_cohort
+        People in a cohort.
+    cohorts
+        Cohorts of all people to assign to teams.
+
+    Returns
+    -------
+    int
+        Bitset of positions of people who could potentially cohort with people
+        already in cohort.
+    """
+    candidates = cohorts.everyone
+    for person in people_in_cohort:
+        candidates &= cohorts.candidates(person)
+    return candidates
 
 
-def find_other_people(
-    people_in_cohort: list[Person], people: list[Person]
-) -> list[Person]:
+def find_other_people(people_in_cohort: list[Person], cohorts: Cohorts) -> list[Person]:
     """
     Collects people who could potentially cohort with people in cohort.
 
@@ -20,23 +56,24 @@ def find_other_people(
     ----------
     people_in_cohort
         People in a cohort.
-    people
-        All people to assign to teams.
+    cohorts
+        Cohorts of all people to assign to teams.
 
     Returns
     -------
     list[Person]
         People who could potentially cohort with people already in cohort.
     """
-    all_friends = [find_friends(x, people, None, False, True) for x in people_in_cohort]
-    return [x for x in people if all([x in y for y in all_friends])]
+    candidates = find_other_mask(people_in_cohort, cohorts)
+    return [cohorts.people[i] for i in bits(candidates)]
 
 
 def age_offset(
     people_in_cohort: list[Person],
-    people: list[Person],
+    cohorts: Cohorts,
     team_size: int,
     target_age_std: float,
+    other_mask: int | None = None,
 ) -> int:
     """
     Finds the number of people to add to a cohort to meet the target age standard deviation.
@@ -46,68 +83,99 @@ def age_offset(
     ----------
     people_in_cohort
         People in a cohort. Representatives only is okay.
-    people
-        All people to assign to teams.
+    cohorts
+        Cohorts of all people to assign to teams.
     team_size
         Number of people to add to a team.
     target_age_std
         Target age standard deviation.
+    other_mask
+        Bitset of people who could potentially cohort with people in cohort.
+        Collected from people in cohort if not provided.
 
     Returns
     -------
     int
         Number of people to add to a cohort to meet the target age standard deviation.
     """
-    # collect ages of people in cohort
-    ages = [x.age for x in people if x.cohort in [y.cohort for y in people_in_cohort]]
+    # collect age moments of people in cohort
+    row = cohorts.metrics.row(cohorts.roots(people_in_cohort))
+    age_count, age_sum, age_squares = row[TEAM_SIZE], row[AGE_SUM], row[AGE_SQUARES]
 
     # collect ages of people who could potentially cohort with people in cohort
-    other_people = find_other_people(people_in_cohort, people)
-    other_ages = [x.age for x in other_people]
+    # ages are sorted once with the people of each age kept as a bitset
+    if other_mask is None:
+        other_mask = find_other_mask(people_in_cohort, cohorts)
+    other_ages = {
+        age: other_mask & mask
+        for age, mask in sorted(cohorts.age_masks.items())
+        if other_mask & mask
+    }
+    sorted_ages = list(other_ages)
+    youngest, oldest = 0, len(sorted_ages) - 1
 
     # find the number of worst matches based on age to add to cohort to meet target
     for count in range(team_size):
         # no more people to add to cohort
         # the limit does not exist
-        if len(other_ages) == 0:
+        if youngest > oldest:
             return team_size
 
         # calculate the standard deviation of ages based on a full team size
         # add the mean age as best case scenario
-        mean_age = sum(ages) / len(ages)
-        new_ages = ages + [mean_age] * (team_size - len(ages))
-        age_std = stdev(new_ages)
+        mean_age = age_sum / age_count
+        age_std = adjusted_sample_stdev(age_count, age_sum, age_squares, team_size)
 
         # target age standard deviation is met
         if age_std > target_age_std:
-            # print(new_ages)
             return count
 
         # add the worst match based on age to the cohort
-        worst_age = max(other_ages, key=lambda x: abs(x - mean_age))
-        ages = ages + [worst_age]
-        other_ages.remove(worst_age)
+        # the worst match is the youngest or oldest age left
+        # ties go to the earliest person
+        young_age, old_age = sorted_ages[youngest], sorted_ages[oldest]
+        young_offset, old_offset = abs(young_age - mean_age), abs(old_age - mean_age)
+        worst_age = young_age
+        if old_offset > young_offset or (
+            old_offset == young_offset
+            and lowest(other_ages[old_age]) < lowest(other_ages[young_age])
+        ):
+            worst_age = old_age
+
+        age_count += 1
+        age_sum += worst_age
+        age_squares += worst_age * worst_age
+        other_ages[worst_age] &= other_ages[worst_age] - 1
+        if other_ages[worst_age] == 0:
+            if worst_age == young_age:
+                youngest += 1
+            else:
+                oldest -= 1
     return team_size
 
 
-def collect_offsets(
+def lowest(mask: int) -> int:
+    """Position of the lowest person in a bitset."""
+    return (mask & -mask).bit_length() - 1
+
+
+def collect_max_values(
     person: Person,
-    friend: Person,
-    people: list[Person],
+    cohorts: Cohorts,
     targets: Targets,
     team_count: int,
-) -> Targets:
+) -> dict[str, float]:
     """
-    Collects the number of people to add to a cohort to meet the target values.
+    Collects the maximum value of each count priority for the cohort of a person.
+    Maximum values do not depend on the friend joining the cohort.
+    Leader totals are kept up to date by cohorts as cohorts join teams.
 
     Parameters
     ----------
     person
         A person.
-    friend
-        A friend of the person.
-    people
-        All people to assign to teams.
+    cohorts
+        Cohorts of all people to assign to teams.
     targets
         Targets for each cohort.
     team_count
@@ -115,18 +183,16 @@ def collect_offsets(
 
     Returns
     -------
-    Targets
-        Number of people to add to a cohort to meet the target values.
+    dict[str, float]
+        Maximum value of each count priority.
     """
-    friend_metrics = collect_metrics(people, [person.cohort, friend.cohort])
-    other_people = find_other_people([person, friend], people)
-
     # calculate the maximum number of people to add on each priority
     # based on people left to be assigned
     max_values = {}
     tolerance = 1
-    leader_cohorts = list(set([x.cohort for x in people if x.team != ""]))
-    for priority in PRIORITIES:
+    leader_row = cohorts.leader_row
+    person_row = cohorts.metrics.rows[cohorts.root(person)]
+    for priority, j in PRIORITY_COLUMNS.items():
         # minimum value to meet targets
         min_allowed = getattr(targets, priority) - tolerance
         min_allowed = min_allowed if min_allowed > 0 else 0
@@ -137,74 +203,202 @@ def collect_offsets(
         # for example 99 of 100 people are assigned, so 1 person is left
         # a team may have 7 people and the target is 9
         # 8 is the max as there is only one more person to assign
-        number_assigned = (
-            sum([getattr(collect_metrics(people, x), priority) for x in leader_cohorts])
-            - min_allowed * team_count
-        )
+        number_assigned = leader_row[j] - min_allowed * team_count
         number_left = (
             getattr(targets, priority) * team_count
             - number_assigned
             - min_allowed * team_count
         )
         max_value = min(
-            getattr(collect_metrics(people, person.cohort), priority) + number_left,
+            person_row[j] + number_left,
             getattr(targets, priority),
         )
 
         # minimum value must be maintained
         max_value = max_value if max_value > min_allowed else min_allowed
         max_values[priority] = max_value
+    return max_values
+
+
+def count_offsets(
+    person: Person,
+    friend: Person,
+    cohorts: Cohorts,
+    targets: Targets,
+    max_values: dict[str, float],
+    other_mask: int,
+) -> list[float | None]:
+    """
+    Collects the number of people to add to a cohort to meet count targets.
+    The age offset is left to be calculated when needed.
+
+    Parameters
+    ----------
+    person
+        A person.
+    friend
+        A friend of the person.
+    cohorts
+        Cohorts of all people to assign to teams.
+    targets
+        Targets for each cohort.
+    max_values
+        Maximum value of each priority for the cohort of the person.
+    other_mask
+        Bitset of people who could potentially cohort with the person and friend.
+
+    Returns
+    -------
+    list[float | None]
+        Number of people to add to a cohort in order of priorities.
+    """
+    row = cohorts.metrics.row(cohorts.roots([person, friend]))
+    available = {
+        "team_size": (row[TEAM_SIZE], other_mask),
+        "girl_count": (row[GIRL_COUNT], other_mask & cohorts.girl_mask),
+    }
+    for priority, collective in COLLECTIVE_PRIORITIES.items():
+        mask = other_mask & cohorts.collective_masks[collective]
+        available[priority] = (row[COLLECTIVES[collective]], mask)
+
+    # offsets are limited by the people left to add
+    offsets: list[float | None] = []
+    for priority in PRIORITIES:
+        if priority == "age_std":
+            offsets.append(None)
+            continue
+
+        count, mask = available[priority]
+        offset = max_values[priority] - count
+        if offset > mask.bit_count():
+            offset = targets.team_size
+        offsets.append(offset)
+    return offsets
+
 
-    team_size_offset = max_values["team_size"] - friend_metrics.team_size
-    if team_size_offset > len(other_people):
-        team_size_offset = targets.team_size
-
-    new_offset = max_values["collective_new"] - friend_metrics.collective_new
-    if new_offset > len([x for x in other_people if x.collective == Collective.new]):
-        new_offset = targets.team_size
-
-    newish_offset = max_values["collective_newish"] - friend_metrics.collective_newish
-    if newish_offset > len(
-        [x for x in other_people if x.collective == Collective.newish]
-    ):
-        newish_offset = targets.team_size
-
-    oldish_offset = max_values["collective_oldish"] - friend_metrics.collective_oldish
-    if oldish_offset > len(
-        [x for x in other_people if x.collective == Collective.oldish]
-    ):
-        oldish_offset = targets.team_size
-
-    old_offset = max_values["collective_old"] - friend_metrics.collective_old
-    if old_offset > len([x for x in other_people if x.collective == Collective.old]):
-        old_offset = targets.team_size
-
-    girl_offset = max_values["girl_count"] - friend_metrics.girl_count
-    if girl_offset > len([x for x in other_people if x.gender == Gender.female]):
-        girl_offset = targets.team_size
-
-    return Targets(
-        team_size=team_size_offset,
-        collective_new=new_offset,
-        collective_newish=newish_offset,
-        collective_oldish=oldish_offset,
-        collective_old=old_offset,
-        age_std=age_offset(
-            [person, friend], people, int(targets.team_size), targets.age_std
-        ),
-        girl_count=girl_offset,
+def collect_offsets(
+    person: Person,
+    friend: Person,
+    cohorts: Cohorts,
+    targets: Targets,
+    team_count: int,
+) -> Targets:
+    """
+    Collects the number of people to add to a cohort to meet the target values.
+
+    Parameters
+    ----------
+    person
+        A person.
+    friend
+        A friend of the person.
+    cohorts
+        Cohorts of all people to assign to teams.
+    targets
+        Targets for each cohort.
+    team_count
+        Number of teams for team placement.
+
+    Returns
+    -------
+    Targets
+        Number of people to add to a cohort to meet the target values.
+    """
+    max_values = collect_max_values(person, cohorts, targets, team_count)
+    other_mask = find_other_mask([person, friend], cohorts)
+    offsets = count_offsets(person, friend, cohorts, targets, max_values, other_mask)
+    offsets[AGE_STD] = age_offset(
+        [person, friend], cohorts, int(targets.team_size), targets.age_std, other_mask
     )
+    return Targets(**dict(zip(PRIORITIES, offsets)))
+
+
+def is_more_flexible(selected: list[float], friend: list[float]) -> bool:
+    """
+    Determines if a friend has more flexibility than the selected friend.
+
+    Parameters
+    ----------
+    selected
+        Offsets of the selected friend in order of priorities.
+    friend
+        Offsets of a friend in order of priorities.
+
+    Returns
+    -------
+    bool
+        Flag for the friend replacing the selected friend.
+    """
+    # find priorities where friends are not equal
+    local_priorities = [j for j in range(len(PRIORITIES)) if selected[j] != friend[j]]
+
+    # no priorities are different
+    if len(local_priorities) == 0:
+        return False
+
+    # find the flexibility for each friend to have additional people added to their cohort
+    min_offset = min([selected[j] for j in local_priorities])
+    friend_min_offset = min([friend[j] for j in local_priorities])
+
+    # current friend is flexible
+    if min_offset > friend_min_offset:
+        return False
+
+    # new friend is more flexible
+    if friend_min_offset > min_offset:
+        return True
+
+    # runoff based on demographic priorities
+    for j in range(len(PRIORITIES)):
+        if selected[j] == min_offset:
+            # current friend is flexible
+            return False
+        elif friend[j] == min_offset:
+            # new friend is more flexible
+            return True
+    return False
+
+
+def could_be_more_flexible(
+    selected: list[float], friend: list[float | None], team_size: int
+) -> bool:
+    """
+    Determines if a friend could replace the selected friend with any age offset.
+    Age offsets are at most the team size.
+
+    Parameters
+    ----------
+    selected
+        Offsets of the selected friend in order of priorities.
+    friend
+        Offsets of a friend in order of priorities without an age offset.
+    team_size
+        Number of people on a team.
+
+    Returns
+    -------
+    bool
+        Flag for a friend possibly replacing the selected friend.
+    """
+    offsets = list(friend)
+    for age in range(team_size + 1):
+        offsets[AGE_STD] = age
+        if is_more_flexible(selected, offsets):
+            return True
+    return False
 
 
 def prioritized_friend(
     person: Person,
     possible_friends: list[Person],
-    people: list[Person],
+    cohorts: Cohorts,
     targets: Targets,
     team_count: int,
 ) -> Person | None:
     """
     Finds the best friend for a person based on possible friends while meeting targets.
+    Count offsets are collected for all friends at once.
+    Age offsets are only calculated for friends who could replace the selected friend.
 
     Parameters
     ----------
@@ -212,8 +406,8 @@ def prioritized_friend(
         A person.
     possible_friends
         Possible friends to be on a team with a person.
-    people
-        All people to assign to teams.
+    cohorts
+        Cohorts of all people to assign to teams.
     targets
         Targets for each cohort.
     team_count
@@ -229,77 +423,33 @@ def prioritized_friend(
     # one or both cohorts must not have a team
     # the union cannot be banned
     # friends do not have to be preferred by the person
-    friends = find_friends(person, people, possible_friends, False)
-
-    if person.firstName == "None":
-        print([str(x) for x in friends])
-
-    # collect metrics from each prospective union
-    offsets_dict: dict[str, Targets] = {}
-    for friend in friends:
-        offsets_dict[friend.index] = collect_offsets(
-            person, friend, people, targets, team_count
-        )
-
-    if person.firstName == "None":
-        print(offsets_dict)
-        assert False
+    friends = find_friends(person, cohorts, possible_friends, False)
 
     # no friends form a valid pair
-    if len(offsets_dict) == 0:
+    if len(friends) == 0:
         return None
 
+    # collect count offsets from each prospective union
+    max_values = collect_max_values(person, cohorts, targets, team_count)
+    other_masks = [find_other_mask([person, x], cohorts) for x in friends]
+    offsets = [
+        count_offsets(person, friend, cohorts, targets, max_values, other_mask)
+        for friend, other_mask in zip(friends, other_masks)
+    ]
+    team_size = int(targets.team_size)
+
     # find the friend having the maximum offset from target values
-    selected_friend = friends[0]
-    for friend in friends[1:]:
-        # find priorities where friends are not equal
-        local_priorities = [
-            priority
-            for priority in PRIORITIES
-            if not all(
-                [
-                    getattr(offsets_dict[x.index], priority)
-                    == getattr(offsets_dict[selected_friend.index], priority)
-                    for x in [selected_friend, friend]
-                ]
-            )
-        ]
-
-        # no priorities are different
-        if len(local_priorities) == 0:
+    # friends who cannot replace the selected friend are skipped before age offsets
+    selected = None
+    for j, friend in enumerate(friends):
+        if selected is not None and not could_be_more_flexible(
+            offsets[selected], offsets[j], team_size
+        ):
             continue
 
-        # find the flexibility for each friend to have additional people added to their cohort
-        min_offset = min(
-            [
-                getattr(offsets_dict[selected_friend.index], priority)
-                for priority in local_priorities
-            ]
+        offsets[j][AGE_STD] = age_offset(
+            [person, friend], cohorts, team_size, targets.age_std, other_masks[j]
         )
-
-        friend_min_offset = min(
-            [
-                getattr(offsets_dict[friend.index], priority)
-                for priority in local_priorities
-            ]
-        )
-
-        # current friend is flexible
-        if min_offset > friend_min_offset:
-            continue
-
-        # new friend is more flexible
-        if friend_min_offset > min_offset:
-            selected_friend = friend
-            continue
-
-        # runoff based on demographic priorities
-        for priority in PRIORITIES:
-            if getattr(offsets_dict[selected_friend.index], priority) == min_offset:
-                # current friend is flexible
-                break
-            elif getattr(offsets_dict[friend.index], priority) == min_offset:
-                # new friend is more flexible
-                selected_friend = friend
-                break
-    return selected_friend
+        if selected is None or is_more_flexible(offsets[selected], offsets[j]):
+            selected = j
+    return friends[selected]
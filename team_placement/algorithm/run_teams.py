@@ -1,29 +1,65 @@
+# native imports
+from functools import partial
+
 # third-party imports
 from fastapi import HTTPException
 
 # external imports
+from team_placement.algorithm.anneal_teams import anneal_people
 from team_placement.algorithm.apply_controls import apply_controls
-from team_placement.algorithm.assign_leaders import assign_leaders
+from team_placement.algorithm.balance_teams import balance_teams
 from team_placement.algorithm.complete_teams import complete_teams
 from team_placement.algorithm.define_targets import define_targets
-from team_placement.algorithm.first_pass import first_pass
+from team_placement.algorithm.fill_teams import fill_teams
+from team_placement.algorithm.form_cohorts import form_cohorts
+from team_placement.algorithm.improve_teams import improve_teams
+from team_placement.algorithm.multi_start import multi_start
 from team_placement.algorithm.third_pass import third_pass
 from team_placement.algorithm.sift_cohorts import sift_cohorts
 from team_placement.algorithm.prepare_people_for_teams import prepare_people_for_teams
 from team_placement.algorithm.second_pass import second_pass
-from team_placement.constants import PRIORITIES
+from team_placement.algorithm.solve_teams import solve_people
+from team_placement.constants import (
+    ANNEAL_MOVES,
+    ANNEAL_TIME_BUDGET,
+    EXACT_TIME_BUDGET,
+    PRIORITIES,
+)
 from team_placement.schemas import (
     Collective,
+    Completion,
     Control,
+    Engine,
+    PassCounters,
     Person,
+    PlacementReport,
+    Targets,
     Team,
 )
+from team_placement.utils.cohorts import Cohorts
 from team_placement.utils.helpers import find_new_people_complete, list_cohorts
+from team_placement.utils.result_cache import ResultCache, request_key
+from team_placement.utils.team_search import TeamSearch
 
 
 def run_teams(
-    all_people: list[Person], controls: list[Control], teams: list[Team]
-) -> list[Person] | None:
+    all_people: list[Person],
+    controls: list[Control],
+    teams: list[Team],
+    starts: int = 1,
+    workers: int | None = None,
+    time_budget: float | None = None,
+    seed: int = 0,
+    improve: bool = False,
+    engine: Engine = Engine.greedy,
+    completion: Completion = Completion.greedy,
+    anneal_time_budget: float = ANNEAL_TIME_BUDGET,
+    anneal_moves: int | None = ANNEAL_MOVES,
+    exact_time_budget: float = EXACT_TIME_BUDGET,
+    cache: ResultCache | None = None,
+    checkpoints: ResultCache | None = None,
+    report: PlacementReport | None = None,
+) -> list[Person]:
     """
     Sorts people into teams.
 
@@ -35,11 +71,45 @@ def run_teams(
         Controls by the user to guide people assignment.
     teams
         Teams for people assignment.
+    starts
+        Number of orders of people to place people from.
+        The best placement is kept when more than 1 order is tried.
+    workers
+        Number of processes placing people. Defaults to the number of processors.
+    time_budget
+        Seconds to wait for placements from other orders. Waits for all if None.
+    seed
+        Seed of the random orders of people and of annealing.
+    improve
+        Flag to improve completed teams by moving cohorts between teams.
+    engine
+        Greedy passes, simulated annealing or branch and bound to place people.
+    completion
+        Greedy passes, a min-cost flow or rounds of optimal assignments to assign
+        cohorts left once new people are placed with their preferences.
+    anneal_time_budget
+        Seconds to spend annealing when annealing places people.
+        Most seconds to spend when the number of moves is given.
+    anneal_moves
+        Number of moves to try when annealing places people so a seed gives the
+        same placement on any machine. Cools over the time budget if None.
+    exact_time_budget
+        Seconds to spend proving the best placement when branch and bound places
+        people.
+    cache
+        Placements of recent requests reused for equal requests. Only placements
+        finished without running out of time are kept. Not used if None.
+    checkpoints
+        Cohorts of recent people and teams after the first pass reused for requests
+        changing only controls. Not used if None or when placing several orders.
+    report
+        Cost of the placement, whether it is proved optimal and whether time ran
+        out first. Not filled if None or when an equal placement is reused.
 
     Returns
     -------
-    list[Person] | None
-        People with teams assigned otherwise None.
+    list[Person]
+        People taking part in teams with teams assigned.
     """
     # people and teams are needed
     if len(all_people) == 0 or len(teams) == 0:
@@ -47,61 +117,66 @@ def run_teams(
         print(message)
         raise HTTPException(status_code=420, detail={"message": message})
 
+    # requests are identified before people are prepared
+    options = {
+        "starts": starts,
+        "workers": workers,
+        "time_budget": time_budget,
+        "seed": seed,
+        "improve": improve,
+        "engine": engine.value,
+        "completion": completion.value,
+        "anneal_time_budget": anneal_time_budget,
+        "anneal_moves": anneal_moves,
+        "exact_time_budget": exact_time_budget,
+    }
+    key = "" if cache is None else request_key(all_people, controls, teams, options)
+
     # prepare people for team placement
     people = prepare_people_for_teams(all_people)
 
     # define targets per team
     targets = define_targets(people, teams)
 
-    # assign leaders to cohorts based on teams
-    print("assign leaders")
-    people = assign_leaders(people, teams)
-
-    # assign new people with 0 or 1 preference to cohorts
-    # restart whenever someone is added to a cohort to capture new information
-    print("perform first pass")
-    people = first_pass(people)
-
-    print("apply controls")
-    people = apply_controls(people, controls)
-
-    # assign new people with 0 or 1 preference to cohorts while
-    # respecting demographic targets and cohorts forming teams
-    # restart whenever someone is added to a cohort to capture new information
-    print("perform second pass")
-    people = second_pass(people, targets, len(teams))
-
-    # assign new people with 2+ preferences
-    print("perform second pass must assign")
-    people = second_pass(people, targets, len(teams), must_assign=True)
-
-    # assign cohorts to cohorts with leaders having 0 or 1 possibilities
-    # based on demographic targets
-    print("sift cohorts")
-    people = sift_cohorts(people, targets, teams)
-
-    # place the rest of preferred people for each new person
-    print("perform third pass")
-    people = third_pass(people, targets, teams, find_new_people_complete)
-
-    # place people by preferences in order of priorities
-    order = [
-        Collective.new,
-        Collective.newish,
-        Collective.oldish,
-        Collective.old,
-    ]
-    for category in order:
-        people = third_pass(
-            people,
-            targets,
-            teams,
-            lambda group: [x for x in group if getattr(x, "collective") == category],
+    # place people on teams in order of people or from several orders
+    if engine == Engine.anneal:
+        place = partial(
+            anneal_people,
+            time_budget=anneal_time_budget,
+            seed=seed,
+            moves=anneal_moves,
         )
+    elif engine == Engine.exact:
+        place = partial(solve_people, time_budget=exact_time_budget, seed=seed)
+    else:
+        place = partial(place_people, improve=improve, completion=completion)
 
-    # final assigns to all teams
-    print("complete teams")
-    people = complete_teams(people, targets, len(teams))
+    # the placement of an equal request is reused
+    # placements cut short by time may differ for equal requests so are not kept
+    report = PlacementReport() if report is None else report
+    if cache is not None and cache.get(key, people):
+        print("reuse placement")
+    else:
+        if starts > 1:
+            people = multi_start(
+                place,
+                people,
+                controls,
+                teams,
+                targets,
+                starts,
+                workers,
+                time_budget,
+                seed,
+                report,
+            )
+        else:
+            people = place(
+                people, controls, teams, targets, checkpoints=checkpoints, report=report
+            )
+        if cache is not None and not report.timed_out:
+            cache.put(key, people)
+    cohorts = Cohorts(people)
 
     target_metrics = {priority: (getattr(targets, priority)) for priority in PRIORITIES}
     for k, v in target_metrics.items():
@@ -110,26 +185,146 @@ def run_teams(
 
     from team_placement.utils.helpers import collect_metrics, collect_representatives
 
-    representatives = collect_representatives(people)
+    representatives = collect_representatives(people, cohorts)
     for person in sorted(representatives, key=lambda x: x.team):
         print(person.team)
         metrics = {
-            priority: (getattr(collect_metrics(people, person.cohort), priority))
+            priority: (getattr(collect_metrics(cohorts, person), priority))
             for priority in PRIORITIES
         }
         for k, v in metrics.items():
             print(f"{k}: {v}")
         print(
             {
-                priority: (getattr(collect_metrics(people, person.cohort), priority))
+                priority: (getattr(collect_metrics(cohorts, person), priority))
                 for priority in PRIORITIES
             },
             person.team,
         )
         print("-------------------------------------------------------")
 
-    print(list_cohorts(people))
-    return None
+    print(list_cohorts(cohorts))
+    return people
+
+
+def place_people(
+    people: list[Person],
+    controls: list[Control],
+    teams: list[Team],
+    targets: Targets,
+    improve: bool = False,
+    completion: Completion = Completion.greedy,
+    checkpoints: ResultCache | None = None,
+    report: PlacementReport | None = None,
+) -> list[Person]:
+    """
+    Places people prepared for team placement on teams in order of people.
+
+    Parameters
+    ----------
+    people
+        People prepared for team placement.
+    controls
+        Controls by the user to guide people assignment.
+    teams
+        Teams for people assignment.
+    targets
+        Targets for each team.
+    improve
+        Flag to improve completed teams by moving cohorts between teams.
+    completion
+        Greedy passes, a min-cost flow or rounds of optimal assignments to assign
+        cohorts left once new people are placed with their preferences.
+    checkpoints
+        Cohorts of recent people and teams after the first pass.
+        Not used if None.
+    report
+        Work done by the second pass and whether time ran out improving teams.
+        Not filled if None.
+
+    Returns
+    -------
+    list[Person]
+        People with cohorts and teams assigned.
+    """
+    # cohorts are shared by all stages and written back to people once placed
+    cohorts = form_cohorts(people, teams, checkpoints)
+    people = cohorts.people
+
+    print("apply controls")
+    people = apply_controls(people, controls, cohorts)
+
+    # assign new people with 0 or 1 preference to cohorts while
+    # respecting demographic targets and cohorts forming teams
+    # restart whenever someone is added to a cohort to capture new information
+    print("perform second pass")
+    counters = PassCounters() if report is None else report.counters
+    people = second_pass(
+        people, targets, len(teams), cohorts=cohorts, counters=counters
+    )
+
+    # assign new people with 2+ preferences
+    print("perform second pass must assign")
+    people = second_pass(
+        people,
+        targets,
+        len(teams),
+        must_assign=True,
+        cohorts=cohorts,
+        counters=counters,
+    )
+
+    # cohorts formed by preferences and controls may move between teams
+    # once teams are completed
+    search = TeamSearch(cohorts, targets, teams) if improve else None
+
+    # assign cohorts to cohorts with leaders having 0 or 1 possibilities
+    # based on demographic targets
+    print("sift cohorts")
+    people = sift_cohorts(people, targets, teams, cohorts)
+
+    # place the rest of preferred people for each new person
+    print("perform third pass")
+    people = third_pass(people, targets, teams, find_new_people_complete, cohorts)
+
+    # balance teams by assigning the remaining cohorts together
+    # in place of the greedy passes
+    if completion == Completion.flow:
+        print("balance teams")
+        people = balance_teams(people, targets, len(teams), cohorts)
+    elif completion == Completion.assignment:
+        print("fill teams")
+        people = fill_teams(people, targets, len(teams), cohorts)
+    else:
+        # place people by preferences in order of priorities
+        order = [
+            Collective.new,
+            Collective.newish,
+            Collective.oldish,
+            Collective.old,
+        ]
+        for category in order:
+            people = third_pass(
+                people,
+                targets,
+                teams,
+                lambda group: [
+                    x for x in group.people if getattr(x, "collective") == category
+                ],
+                cohorts,
+            )
+
+    # final assigns to all teams
+    # only cohorts banned from every team are left after balancing teams
+    print("complete teams")
+    people = complete_teams(people, targets, len(teams), cohorts)
+    people = cohorts.write_back()
+
+    if search is not None:
+        print("improve teams")
+        people = improve_teams(search, cohorts, report=report)
+
+    return people
 
 
 if __name__ == "__main__":
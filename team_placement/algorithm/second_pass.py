@@ -1,13 +1,17 @@
 # external imports
-from team_placement.schemas import Person, Targets
+from team_placement.schemas import PassCounters, Person, Targets
 from team_placement.algorithm.first_pass import first_pass
 from team_placement.algorithm.prioritized_friend import prioritized_friend
+from team_placement.utils.cohorts import Cohorts
 from team_placement.utils.helpers import (
     find_friends,
     find_friends_strict,
     find_new_people,
+    is_new_person,
     join_cohorts,
+    preferred_people,
 )
+from team_placement.utils.schedule import Dependency, Schedule
 
 
 def second_pass(
@@ -15,9 +19,13 @@ def second_pass(
     targets: Targets,
     team_count: int,
     must_assign: bool = False,
+    cohorts: Cohorts | None = None,
+    counters: PassCounters | None = None,
 ) -> list[Person]:
     """
     Assigns people to cohorts based on their demographics and preferences.
+    The first new person in order with a choice is assigned after each join.
+    New people are only evaluated again when cohorts they depend on change.
 
     Parameters
     ----------
@@ -29,28 +37,106 @@ def second_pass(
         Number of teams to create.
     must_assign
         Flag to force assignment of people to cohorts.
+    cohorts
+        Cohorts shared between stages and written back to people by the caller.
+        Created from people and written back if not provided.
+    counters
+        Counters for evaluations and joins. Created if not provided.
 
     Returns
     -------
     list[Person]
         People with cohorts assigned.
     """
-    # find new friends for each person to assign
-    new_people = find_new_people(people)
-    for person in new_people:
-        if person.firstName == "None" and must_assign:
-            from team_placement.utils.helpers import list_cohorts
-
-            print([str(x) for x in new_people])
-            print([x for x in list_cohorts(people) if len(x) > 1])
-            assert False
+    owned = cohorts is None
+    if cohorts is None:
+        cohorts = Cohorts(people)
+    if counters is None:
+        counters = PassCounters()
+
+    # each mode keeps its own queue of new people to evaluate
+    new_people = find_new_people(cohorts)
+    schedule = Schedule(cohorts, new_people)
+    forced_schedule = Schedule(cohorts, new_people) if must_assign else schedule
+
+    # first pass is repeated for all new people after the first join
+    collapsed = False
+    while True:
+        choice = choose_friend(
+            forced_schedule, cohorts, targets, team_count, must_assign, counters
+        )
+        if choice is None:
+            break
+
+        while choice is not None:
+            # combine person and their friend's cohorts
+            cohorts = join_cohorts(*choice, cohorts)
+            counters.joins += 1
+
+            # assign new people with 1 preferred person affected by the join
+            affected = [cohorts.people[i] for i in schedule.refresh()]
+            people = first_pass(people, cohorts, affected if collapsed else None)
+            collapsed = True
+
+            # assign people without forcing a choice before forcing another
+            choice = choose_friend(
+                schedule, cohorts, targets, team_count, False, counters
+            )
+    return cohorts.write_back() if owned else cohorts.people
+
+
+def choose_friend(
+    schedule: Schedule,
+    cohorts: Cohorts,
+    targets: Targets,
+    team_count: int,
+    must_assign: bool,
+    counters: PassCounters,
+) -> tuple[Person, Person] | None:
+    """
+    Finds the first new person in order with a friend to join.
+
+    Parameters
+    ----------
+    schedule
+        New people to evaluate.
+    cohorts
+        Cohorts of all people to assign to teams.
+    targets
+        Targets for each cohort.
+    team_count
+        Number of teams to create.
+    must_assign
+        Flag to force assignment of people to cohorts.
+    counters
+        Counters for evaluations and joins.
+
+    Returns
+    -------
+    tuple[Person, Person] | None
+        New person and their friend otherwise None when nothing is pending.
+    """
+    schedule.refresh()
+    while (person := schedule.pop()) is not None:
+        if not is_new_person(person, cohorts):
+            continue
+
         # find friends
-        friends = find_friends(person, people)
+        friends = find_friends(person, cohorts, preferred_people(person, cohorts))
+        counters.evaluations += 1
+        counters.candidates += len(friends)
+        if len(friends) == 0:
+            schedule.park(person, Dependency.local)
+            continue
 
         # find new friends based on targets
+        # leader cohorts are screened when neither cohort has a team
         strict_friends = find_friends_strict(
-            person, friends, people, targets, team_count
+            person, friends, cohorts, targets, team_count
         )
+        dependency = Dependency.local
+        if cohorts.team(person) == "" and any([cohorts.team(x) == "" for x in friends]):
+            dependency = Dependency.leaders
 
         # take action when a new person has 0 or 1 possible preferences
         match len(strict_friends):
@@ -58,7 +144,7 @@ def second_pass(
                 # adding person to a cohort with any of their friends
                 # will exceed targets
                 friend = prioritized_friend(
-                    person, friends, people, targets, team_count
+                    person, friends, cohorts, targets, team_count
                 )
             case 1:
                 # this is the person's choice
@@ -67,27 +153,16 @@ def second_pass(
                 # 2+ people are reasonable additions
                 # too many choices at this time
                 if not must_assign:
+                    schedule.park(person, dependency)
                     continue
 
                 friend = prioritized_friend(
-                    person, strict_friends, people, targets, team_count
+                    person, strict_friends, cohorts, targets, team_count
                 )
 
-                if person.firstName == "None" and must_assign:
-                    print(str(friend))
-                    assert False
-
         # no new friends found
         if friend is None:
+            schedule.park(person, Dependency.overall)
             continue
-
-        # combine person and their friend's cohorts
-        people = join_cohorts(person.cohort, friend.cohort, people)
-
-        # recurse
-        people = first_pass(people)
-        people = second_pass(people, targets, team_count)
-        if must_assign:
-            people = second_pass(people, targets, team_count, must_assign=must_assign)
-        return people
-    return people
+        return person, friend
+    return None
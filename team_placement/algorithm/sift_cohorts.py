@@ -1,23 +1,21 @@
 # external imports
 from team_placement.algorithm.prioritized_friend import prioritized_friend
-from team_placement.constants import PRIORITIES
+from team_placement.constants import PRIORITIES, UNNAMED_COHORT_LENGTH
 from team_placement.schemas import Person, Targets, Team
-from team_placement.utils.helpers import (
-    collect_metrics,
-    collect_representatives,
-    find_friends_strict,
-    join_cohorts,
-    list_cohorts,
-)
+from team_placement.utils.cohorts import Cohorts
+from team_placement.utils.helpers import collect_metrics, join_cohorts, meets_targets
 
 
 def sift_cohorts(
     people: list[Person],
     targets: Targets,
     teams: list[Team],
+    cohorts: Cohorts | None = None,
 ) -> list[Person]:
     """
     Assigns cohorts to leader cohorts based on targets.
+    Sweeps are repeated until no cohorts are combined.
+    Cohorts are only checked again against leader cohorts changed since then.
 
     Parameters
     ----------
@@ -27,94 +25,204 @@ def sift_cohorts(
         Targets for each cohort.
     teams
         Teams for cohort assignment.
+    cohorts
+        Cohorts shared between stages and written back to people by the caller.
+        Created from people and written back if not provided.
 
     Returns
     -------
     list[Person]
         People after cohort assignment.
     """
-    # used for comparison to determine if any cohorts are combined
-    previous_cohorts = list_cohorts(people)
+    owned = cohorts is None
+    if cohorts is None:
+        cohorts = Cohorts(people)
 
-    # combine cohorts based on targets and sort by cohort size
-    representatives = collect_representatives(people)
-    representatives.sort(
-        key=lambda x: len([y for y in people if y.cohort == x.cohort]), reverse=True
-    )
-    for person in representatives:
-        # ignore leader cohorts
-        if person.team != "":
-            continue
-
-        # collect leaders
-        leaders = [x for x in people if x.team != ""]
-        leaders = collect_representatives(leaders)
-        leaders.sort(
-            key=lambda x: len([y for y in people if y.cohort == x.cohort]), reverse=True
-        )
-
-        # determine if cohorts are sufficiently small to stop sifting
-        gaurenteed = []
-        for leader in leaders:
-            leader_metrics = collect_metrics(
-                people,
-                leader.cohort,
-                adjust_age=True,
-                target_team_size=targets.team_size,
-            )
-            min_condition = min(
-                [
-                    getattr(targets, priority) - getattr(leader_metrics, priority)
-                    for priority in PRIORITIES
-                ]
-            )
-            if len([x for x in people if x.cohort == leader.cohort]) < min_condition:
-                gaurenteed += leader.cohort
-
-        if len(gaurenteed) == 2:
-            break
-
-        # collect teams without members
-        available_teams = [
-            x.name for x in teams if x.name not in [y.team for y in people]
+    # feasibility of cohorts with leader cohorts as of their last evaluation
+    # cohorts are evaluated again only after cohorts change
+    feasible: dict[int, dict[int, bool]] = {}
+    evaluated: dict[int, int] = {}
+
+    # leader cohorts are collected again only after cohorts change
+    guarantees: dict[int, int] = {}
+    leaders: list[Person] = []
+    available_teams: list[str] = []
+    gaurenteed = 0
+    version: int | None = None
+
+    # sweep until no cohorts are combined
+    joined = True
+    while joined:
+        joined = False
+
+        # combine cohorts based on targets and sort by cohort size
+        representatives = [
+            cohorts.people[cohorts.firsts[root]]
+            for root in sort_roots(cohorts, [x for x in cohorts.teams])
         ]
+        for person in representatives:
+            # ignore leader cohorts
+            if cohorts.team(person) != "":
+                continue
 
-        # find leader cohorts that can be combined with this cohort while meeting targets
-        valid_leaders = find_friends_strict(
-            person, leaders, people, targets, len(teams)
-        )
-        match len(valid_leaders):
-            case 0:
-                # assign to a new team if allowed
-                if len(available_teams) > 0:
-                    for member in [x for x in people if x.cohort == person.cohort]:
-                        member.team = available_teams[0]
-                    continue
+            if version != cohorts.version:
+                changed = cohorts.changed[version:] if version is not None else []
+                for root in set([cohorts.find(x) for x in changed]):
+                    guarantees.pop(root, None)
+                version = cohorts.version
 
-                # cohort cannot be combined with any leader cohorts
-                # combine with best option based on targets
-                best_leader = prioritized_friend(
-                    person, leaders, people, targets, len(teams)
+                # collect leaders
+                leader_roots = sort_roots(
+                    cohorts, [x for x, team in cohorts.teams.items() if team != ""]
                 )
-            case 1:
-                # a team is unavailable - too many choices at this time
-                if len(available_teams) > 0:
+                leaders = [cohorts.people[cohorts.firsts[x]] for x in leader_roots]
+
+                # determine if cohorts are sufficiently small to stop sifting
+                gaurenteed = 0
+                for root, leader in zip(leader_roots, leaders):
+                    if root not in guarantees:
+                        guarantees[root] = guarantee(cohorts, leader, targets)
+                    gaurenteed += guarantees[root]
+
+                # collect teams without members
+                used_teams = set(cohorts.teams.values())
+                available_teams = [x.name for x in teams if x.name not in used_teams]
+
+            if gaurenteed == 2:
+                break
+
+            # nothing changed since the cohort was last evaluated without action
+            root = cohorts.root(person)
+            if evaluated.get(root) == version:
+                continue
+
+            # only leader cohorts changed since the last evaluation are checked again
+            checks = feasible.setdefault(root, {})
+            if root in evaluated:
+                changed = cohorts.changed[evaluated[root] :]
+                for leader_root in set([cohorts.find(x) for x in changed]):
+                    checks.pop(leader_root, None)
+            evaluated[root] = version
+
+            # find leader cohorts that can be combined while meeting targets
+            valid_leaders: list[Person] = []
+            for leader in leaders:
+                leader_root = cohorts.root(leader)
+                if leader_root not in checks:
+                    checks[leader_root] = meets_targets(
+                        cohorts, [person, leader], targets
+                    )
+                if checks[leader_root]:
+                    valid_leaders.append(leader)
+
+            match len(valid_leaders):
+                case 0:
+                    # assign to a new team if allowed
+                    if len(available_teams) > 0:
+                        cohorts.set_team(person, available_teams[0])
+                        continue
+
+                    # cohort cannot be combined with any leader cohorts
+                    # combine with best option based on targets
+                    best_leader = prioritized_friend(
+                        person, leaders, cohorts, targets, len(teams)
+                    )
+                case 1:
+                    # a team is unavailable - too many choices at this time
+                    if len(available_teams) > 0:
+                        continue
+
+                    # combine with leader cohort
+                    best_leader = valid_leaders[0]
+                case _:
+                    # too many choices at this time
                     continue
 
-                # combine with leader cohort
-                best_leader = valid_leaders[0]
-            case _:
-                # too many choices at this time
+            # no leader found to cohort with while meeting targets
+            if best_leader is None:
                 continue
 
-        # no leader found to cohort with while meeting targets
-        if best_leader is None:
-            continue
+            # combine person and their friend's cohorts
+            cohorts = join_cohorts(person, best_leader, cohorts)
+            joined = True
+    return cohorts.write_back() if owned else cohorts.people
+
+
+def sort_roots(cohorts: Cohorts, roots: list[int]) -> list[int]:
+    """
+    Sorts cohorts by size with ties kept in order of their first person.
+
+    Parameters
+    ----------
+    cohorts
+        Cohorts of all people to assign to teams.
+    roots
+        Root positions of cohorts.
 
-        # combine person and their friend's cohorts
-        people = join_cohorts(person.cohort, best_leader.cohort, people)
+    Returns
+    -------
+    list[int]
+        Root positions of cohorts from largest to smallest.
+    """
+    return sorted(roots, key=lambda x: (-len(cohorts.members[x]), cohorts.firsts[x]))
 
-    # restart if any cohorts are combined
-    if previous_cohorts != list_cohorts(people):
-        return sift_cohorts(people, targets, teams)
-    return people
+
+def guarantee(cohorts: Cohorts, leader: Person, targets: Targets) -> int:
+    """
+    Counts a leader cohort toward stopping sifting when it is sufficiently small.
+
+    Parameters
+    ----------
+    cohorts
+        Cohorts of all people to assign to teams.
+    leader
+        Representative of a leader cohort.
+    targets
+        Targets for each cohort.
+
+    Returns
+    -------
+    int
+        Name length of a sufficiently small leader cohort otherwise 0.
+    """
+    leader_metrics = collect_metrics(
+        cohorts,
+        leader,
+        adjust_age=True,
+        target_team_size=targets.team_size,
+    )
+    min_condition = min(
+        [
+            getattr(targets, priority) - getattr(leader_metrics, priority)
+            for priority in PRIORITIES
+        ]
+    )
+    if cohorts.size(leader) < min_condition:
+        return name_length(cohorts, cohorts.root(leader))
+    return 0
+
+
+def name_length(cohorts: Cohorts, root: int) -> int:
+    """
+    Counts characters in the name of a cohort for the stopping rule of sifting.
+    Sifting has always added the characters of guaranteed leader cohort names
+    rather than the cohorts themselves, so it stops only once those names total
+    2 characters. The rule is kept as is to leave placements unchanged.
+    Cohorts without a name count as the random ids they were once given.
+
+    Parameters
+    ----------
+    cohorts
+        Cohorts of all people to assign to teams.
+    root
+        Root position of a cohort.
+
+    Returns
+    -------
+    int
+        Characters in the name of the cohort.
+    """
+    label = cohorts.labels[root]
+    if label not in cohorts.names:
+        return UNNAMED_COHORT_LENGTH
+    return len(cohorts.names[label])
@@ -0,0 +1,324 @@
+# native imports
+from math import sqrt
+import time
+
+# external imports
+from team_placement.algorithm.anneal_teams import anneal_teams, insert_units
+from team_placement.algorithm.apply_controls import apply_controls
+from team_placement.algorithm.form_cohorts import form_cohorts
+from team_placement.algorithm.improve_teams import IMPROVEMENT_TOLERANCE
+from team_placement.constants import EXACT_TIME_BUDGET
+from team_placement.schemas import Control, Person, PlacementReport, Targets, Team
+from team_placement.utils.cohort_metrics import (
+    AGE_SQUARES,
+    AGE_SUM,
+    GIRL_COUNT,
+    PRIORITY_COLUMNS,
+    ROW_SIZE,
+    TEAM_SIZE,
+)
+from team_placement.utils.result_cache import ResultCache
+from team_placement.utils.team_score import (
+    PREFERENCE_COST,
+    PRIORITY_WEIGHTS,
+    UNPLACED_COST,
+)
+from team_placement.utils.team_search import TeamSearch
+
+# nodes searched between checks of the time budget
+CHECK_INTERVAL = 1000
+
+# most partial placements remembered as already searched
+MEMO_LIMIT = 1_000_000
+
+# moves and share of the time budget spent annealing before searching
+INCUMBENT_MOVES = 5000
+INCUMBENT_SHARE = 0.25
+
+# weights of the targets bounded on each team
+AGE_WEIGHT = PRIORITY_WEIGHTS["age_std"]
+GIRL_WEIGHT = PRIORITY_WEIGHTS["girl_count"]
+SIZE_WEIGHT = PRIORITY_WEIGHTS["team_size"]
+
+
+def solve_people(
+    people: list[Person],
+    controls: list[Control],
+    teams: list[Team],
+    targets: Targets,
+    time_budget: float = EXACT_TIME_BUDGET,
+    seed: int = 0,
+    checkpoints: ResultCache | None = None,
+    report: PlacementReport | None = None,
+) -> list[Person]:
+    """
+    Places people prepared for team placement on teams by branch and bound.
+    Cohorts formed by the first pass and controls are placed as a whole.
+    The search starts from a placement found by annealing so fewer placements
+    need to be searched. The lowest cost placement found is kept when time runs
+    out before it is proved optimal.
+
+    Parameters
+    ----------
+    people
+        People prepared for team placement.
+    controls
+        Controls by the user to guide people assignment.
+    teams
+        Teams for people assignment.
+    targets
+        Targets for each team.
+    time_budget
+        Seconds to spend proving the lowest cost placement including annealing.
+    seed
+        Seed of the random moves of annealing.
+    checkpoints
+        Cohorts of recent people and teams after the first pass.
+        Not used if None.
+    report
+        Cost of the placement, whether it is proved optimal and whether time ran
+        out first. Not filled if None.
+
+    Returns
+    -------
+    list[Person]
+        People with cohorts and teams assigned.
+    """
+    # form cohorts from people with 1 preferred person and controls
+    cohorts = form_cohorts(people, teams, checkpoints)
+    people = cohorts.people
+    people = apply_controls(people, controls, cohorts)
+    people = cohorts.write_back()
+
+    # annealing finds a low cost placement for the search to beat
+    deadline = time.monotonic() + time_budget
+    search = TeamSearch(cohorts, targets, teams)
+    search.place(cohorts)
+    insert_units(search)
+    _, finished = anneal_teams(
+        search, time_budget * INCUMBENT_SHARE, seed, INCUMBENT_MOVES
+    )
+    cost, proved = solve_teams(search, max(deadline - time.monotonic(), 0))
+    if report is not None:
+        report.cost = cost
+        report.proved = proved
+
+        # ties with the incumbent are kept so it must not depend on time either
+        report.timed_out = not (proved and finished)
+    return search.write_back(set(range(len(teams))))
+
+
+def solve_teams(search: TeamSearch, time_budget: float) -> tuple[float, bool]:
+    """
+    Searches every placement of cohorts on teams for the lowest cost.
+    Cohorts are placed largest first on teams in order of the change in cost.
+    Placements are skipped when a lower bound on their cost cannot beat the
+    lowest cost found. Empty teams are interchangeable so only the first is
+    tried, and partial placements matching one already searched are skipped.
+    The current placement is the first lowest cost placement.
+
+    Parameters
+    ----------
+    search
+        Running metrics of cohorts on teams.
+    time_budget
+        Seconds to spend searching.
+
+    Returns
+    -------
+    tuple[float, bool]
+        Cost of the lowest cost placement and a flag for a placement proved
+        optimal within the time budget.
+    """
+    deadline = time.monotonic() + time_budget
+    best_cost = search.cost()
+    best = list(search.teams)
+
+    # cohorts are placed largest first on top of cohorts with fixed teams
+    order = [u for u, movable in enumerate(search.movable) if movable]
+    order.sort(key=lambda x: len(search.units[x]), reverse=True)
+    for unit in order:
+        if search.teams[unit] != -1:
+            search.unplace(unit)
+    depth = len(order)
+
+    # counts of cohorts still to place from each depth
+    remaining = [[0] * ROW_SIZE for _ in range(depth + 1)]
+    sizes = [0] * (depth + 1)
+    for d in range(depth - 1, -1, -1):
+        unit = order[d]
+        sizes[d] = sizes[d + 1] + len(search.units[unit])
+        for j, value in enumerate(search.rows[unit]):
+            remaining[d][j] = remaining[d + 1][j] + value
+
+    # preferences are settled once a person and their preferred people are placed
+    placed_at = [-1] * len(search.team_of)
+    for d, unit in enumerate(order):
+        for i in search.units[unit]:
+            placed_at[i] = d
+    settled: list[list[int]] = [[] for _ in range(depth + 1)]
+    for i, tracked in enumerate(search.tracked):
+        if tracked:
+            preferred = search.cohorts.graph.preferred[i]
+            last = max([placed_at[i]] + [placed_at[j] for j in preferred])
+            settled[last + 1].append(i)
+    unmet = [0] * (depth + 1)
+    unmet[0] = len([i for i in settled[0] if search.is_unmet(i)])
+
+    visited: set[tuple[int, tuple[int, ...]]] = set()
+    stack = [(team_options(search, order[0]), 0)] if depth > 0 else []
+    nodes = 0
+    while len(stack) > 0:
+        level = len(stack) - 1
+        unit = order[level]
+        if search.teams[unit] != -1:
+            search.unplace(unit)
+        options, k = stack[-1]
+        if k == len(options):
+            stack.pop()
+            continue
+        stack[-1] = (options, k + 1)
+        if options[k] != -1:
+            search.move(unit, options[k])
+
+        nodes += 1
+        if nodes % CHECK_INTERVAL == 0 and time.monotonic() >= deadline:
+            break
+
+        unmet[level + 1] = unmet[level] + len(
+            [i for i in settled[level + 1] if search.is_unmet(i)]
+        )
+        if level + 1 == depth:
+            cost = search.cost()
+            if cost < best_cost - IMPROVEMENT_TOLERANCE:
+                best_cost = cost
+                best = list(search.teams)
+            continue
+
+        # placements are the same for any order of teams
+        key = (level + 1, tuple(sorted(search.team_masks)))
+        if key in visited:
+            continue
+        if len(visited) < MEMO_LIMIT:
+            visited.add(key)
+
+        unplaced = search.unplaced - sizes[level + 1]
+        bound = lower_bound(search, remaining[level + 1], unplaced, unmet[level + 1])
+        if bound >= best_cost - IMPROVEMENT_TOLERANCE:
+            continue
+        stack.append((team_options(search, order[level + 1]), 0))
+
+    # running metrics are recalculated for the lowest cost placement
+    search.reset(best)
+    return search.cost(), len(stack) == 0
+
+
+def team_options(search: TeamSearch, unit: int) -> list[int]:
+    """
+    Teams a cohort without a team may join in order of the change in cost.
+    Only the first empty team is included and -1 for no team is last.
+
+    Parameters
+    ----------
+    search
+        Running metrics of cohorts on teams.
+    unit
+        A cohort without a team.
+
+    Returns
+    -------
+    list[int]
+        Teams to try for the cohort.
+    """
+    options = []
+    empty = False
+    for team, mask in enumerate(search.team_masks):
+        if mask == 0:
+            if empty:
+                continue
+            empty = True
+        if search.can_join(unit, team):
+            options.append((search.move_delta(unit, team), team))
+    return [team for _, team in sorted(options)] + [-1]
+
+
+def lower_bound(
+    search: TeamSearch, remaining: list[int], unplaced: int, unmet: int
+) -> float:
+    """
+    Lower bound on the cost of any placement completing the current one.
+    Counts over targets only grow as cohorts are placed, and counts under
+    targets shrink by at most the counts of cohorts left to place. Leaving a
+    person without a team costs more than any count they could fill.
+    Each team is also bounded on its own. Girls filling a team past its size
+    target add to its size, and the spread of ages on a team never shrinks
+    below its spread over every person left to place.
+
+    Parameters
+    ----------
+    search
+        Running metrics of cohorts on teams.
+    remaining
+        Counts of cohorts left to place.
+    unplaced
+        Number of people already left without a team.
+    unmet
+        Number of first time people with unmet preferences that cannot be met.
+
+    Returns
+    -------
+    float
+        Lower bound on the cost of the placement.
+    """
+    targets = search.targets
+    cost = UNPLACED_COST * unplaced + PREFERENCE_COST * unmet
+    counts = 0.0
+    for priority, j in PRIORITY_COLUMNS.items():
+        target = getattr(targets, priority)
+        excess = 0.0
+        deficit = 0.0
+        for row in search.team_rows:
+            if row[j] > target:
+                excess += row[j] - target
+            else:
+                deficit += target - row[j]
+        bound = PRIORITY_WEIGHTS[priority] * (excess + abs(deficit - remaining[j]))
+        if j == GIRL_COUNT or j == TEAM_SIZE:
+            counts += bound
+        else:
+            cost += bound
+
+    # each team bounded on its own
+    joining = remaining[TEAM_SIZE]
+    team_counts = 0.0
+    wanted = 0
+    for row in search.team_rows:
+        # girls joining are counted again by size past the size target
+        girls = targets.girl_count - row[GIRL_COUNT]
+        size = targets.team_size - row[TEAM_SIZE]
+        if size < 0:
+            team_counts += SIZE_WEIGHT * -size
+            size = 0
+        if girls <= 0:
+            team_counts -= GIRL_WEIGHT * girls
+        else:
+            wanted += girls
+            if girls > size:
+                team_counts += min(GIRL_WEIGHT, SIZE_WEIGHT) * (girls - size)
+
+        # ages only spread further as people join a team
+        count = row[TEAM_SIZE]
+        age_std = 0.0
+        if count > 1:
+            spread = row[AGE_SQUARES] - row[AGE_SUM] * row[AGE_SUM] / count
+            if spread > 0:
+                age_std = sqrt(spread / (count - 1 + joining))
+        if joining == 0:
+            cost += AGE_WEIGHT * abs(age_std - targets.age_std)
+        elif age_std > targets.age_std:
+            cost += AGE_WEIGHT * (age_std - targets.age_std)
+
+    # girls short of every team cost at least the difference of the weights
+    shortage = max(wanted - remaining[GIRL_COUNT], 0)
+    team_counts += max(GIRL_WEIGHT - SIZE_WEIGHT, 0) * shortage
+    return cost + max(counts, team_counts)
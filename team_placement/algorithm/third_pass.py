@@ -5,11 +5,12 @@ from typing import Callable
 from team_placement.algorithm.prioritized_friend import prioritized_friend
 from team_placement.algorithm.sift_cohorts import sift_cohorts
 from team_placement.schemas import Person, Targets, Team
+from team_placement.utils.cohorts import Cohorts
 from team_placement.utils.helpers import (
     find_friends,
     find_friends_strict,
     join_cohorts,
-    list_cohorts,
+    preferred_people,
 )
 
 
@@ -17,10 +18,13 @@ def third_pass(
     people: list[Person],
     targets: Targets,
     teams: list[Team],
-    find_people: Callable[[list[Person]], list[Person]],
+    find_people: Callable[[Cohorts], list[Person]],
+    cohorts: Cohorts | None = None,
 ) -> list[Person]:
     """
     Assigns people to cohorts based on their demographics and preferences.
+    People are assigned until no cohorts are combined.
+    People are only evaluated again after their cohort or friends' cohorts change.
 
     Parameters
     ----------
@@ -30,23 +34,52 @@ def third_pass(
         Targets for each cohort.
     teams
         Teams for people assignment.
+    find_people
+        Finds people to assign from cohorts.
+    cohorts
+        Cohorts shared between stages and written back to people by the caller.
+        Created from people and written back if not provided.
 
     Returns
     -------
     list[Person]
         People with cohorts assigned.
     """
-    while True:
-        people_in_cohorts = list_cohorts(people)
+    owned = cohorts is None
+    if cohorts is None:
+        cohorts = Cohorts(people)
 
-        new_people = find_people(people)
+    # version of cohorts when people were evaluated without action
+    # and if leader cohorts were screened
+    evaluated: dict[int, tuple[int, bool]] = {}
+
+    # repeat until no cohorts are combined
+    merges = None
+    while merges != cohorts.merges:
+        merges = cohorts.merges
+
+        new_people = find_people(cohorts)
         for person in new_people:
+            # skip people whose cohort and friends' cohorts are unchanged
+            position = cohorts.positions[person.index]
+            preferred = preferred_people(person, cohorts)
+            if position in evaluated and not is_changed(
+                person, preferred, cohorts, *evaluated[position]
+            ):
+                continue
+
             # find friends
-            friends = find_friends(person, people)
+            friends = find_friends(person, cohorts, preferred)
 
             # find new friends based on targets
+            # leader cohorts are screened when neither cohort has a team
             new_friends = find_friends_strict(
-                person, friends, people, targets, len(teams)
+                person, friends, cohorts, targets, len(teams)
+            )
+            evaluated[position] = (
+                cohorts.version,
+                cohorts.team(person) == ""
+                and any([cohorts.team(x) == "" for x in friends]),
             )
 
             # take action when a new person has 0 or 1 possible preferences remaining
@@ -62,7 +95,7 @@ def third_pass(
                     # 2+ people are reasonable additions
                     # assign the best choice for the cohort
                     new_friend = prioritized_friend(
-                        person, new_friends, people, targets, len(teams)
+                        person, new_friends, cohorts, targets, len(teams)
                     )
 
             # no new friends found
@@ -70,11 +103,41 @@ def third_pass(
                 continue
 
             # combine person and their friend's cohorts
-            people = join_cohorts(person.cohort, new_friend.cohort, people)
+            cohorts = join_cohorts(person, new_friend, cohorts)
 
             # place cohorts with 0 or 1 possible to leader cohorts
-            people = sift_cohorts(people, targets, teams)
+            people = sift_cohorts(people, targets, teams, cohorts)
+    return cohorts.write_back() if owned else cohorts.people
+
+
+def is_changed(
+    person: Person,
+    preferred: list[Person],
+    cohorts: Cohorts,
+    version: int,
+    leaders: bool,
+) -> bool:
+    """
+    Determines if cohorts deciding friends for a person changed after a version.
+
+    Parameters
+    ----------
+    person
+        A person.
+    preferred
+        People preferred by the person.
+    cohorts
+        Cohorts of all people to assign to teams.
+    version
+        Version of cohorts when the person was last evaluated.
+    leaders
+        Flag for leader cohorts screened when the person was last evaluated.
 
-        if list_cohorts(people) == people_in_cohorts:
-            break
-    return people
+    Returns
+    -------
+    bool
+        Flag for a changed cohort of the person, their friends or leaders.
+    """
+    if leaders and cohorts.leaders_changed > version:
+        return True
+    return any([cohorts.changed_since(x, version) for x in [person] + preferred])
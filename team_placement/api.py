@@ -2,15 +2,18 @@
 from typing import Annotated
 
 # third-party imports
-from fastapi import Body, FastAPI, File, HTTPException, UploadFile
+from fastapi import Body, FastAPI, File, HTTPException, Query, UploadFile
 from fastapi.middleware.cors import CORSMiddleware
 
 # external imports
 from team_placement.algorithm.run_teams import run_teams
+from team_placement.constants import ANNEAL_MOVES, CHECKPOINT_CACHE_SIZE
 from team_placement.filesystem import collect_objects, save_objects
 from team_placement.schemas import (
     Cell,
+    Completion,
     Control,
+    Engine,
     Nicknames,
     Person,
     Room,
@@ -21,10 +24,17 @@ from team_placement.utils.export_to_excel import export_to_excel
 from team_placement.utils.find_preferred_people import find_preferred_people
 from team_placement.utils.read_excel import read_excel
 from team_placement.utils.read_json import read_json
+from team_placement.utils.result_cache import ResultCache
 
 # create a Fast API application
 app = FastAPI()
 
+# placements of recent requests to run teams
+result_cache = ResultCache()
+
+# cohorts of recent requests to run teams after the first pass
+checkpoint_cache = ResultCache(CHECKPOINT_CACHE_SIZE)
+
 # add middleware to communicate with ReactJS
 origins = [
     "http://localhost:5173",
@@ -132,16 +142,64 @@ async def run_teams_post(
         list[Team],
         Body(description="Teams for people assignment."),
     ],
-) -> list[Person] | None:
+    improve: Annotated[
+        bool,
+        Query(description="Improve teams by moving cohorts between teams."),
+    ] = False,
+    engine: Annotated[
+        Engine,
+        Query(
+            description="Greedy passes, annealing or branch and bound to place people."
+        ),
+    ] = Engine.greedy,
+    completion: Annotated[
+        Completion,
+        Query(description="Greedy, min-cost flow or assignment for the last cohorts."),
+    ] = Completion.greedy,
+    starts: Annotated[
+        int,
+        Query(description="Number of orders of people to place people from."),
+    ] = 1,
+    workers: Annotated[
+        int | None,
+        Query(description="Number of processes placing other orders of people."),
+    ] = None,
+    time_budget: Annotated[
+        float | None,
+        Query(description="Seconds to wait for placements from other orders."),
+    ] = None,
+    seed: Annotated[
+        int,
+        Query(description="Seed of orders and annealing for repeatable placements."),
+    ] = 0,
+    anneal_moves: Annotated[
+        int,
+        Query(description="Number of moves to try when annealing places people."),
+    ] = ANNEAL_MOVES,
+) -> list[Person]:
     """
     Sorts people into teams.
 
     Returns
     -------
-    list[Person] | None
-        People with teams assigned otherwise None.
-    """
-    return run_teams(people, controls, teams)
+    list[Person]
+        People taking part in teams with teams assigned.
+    """
+    return run_teams(
+        people,
+        controls,
+        teams,
+        starts=starts,
+        workers=workers,
+        time_budget=time_budget,
+        improve=improve,
+        engine=engine,
+        completion=completion,
+        seed=seed,
+        anneal_moves=anneal_moves,
+        cache=result_cache,
+        checkpoints=checkpoint_cache,
+    )
 
 
 @app.post("/run-rooms")
@@ -29,3 +29,25 @@ FIRST_TIME_COST = 35
 # age restrictions
 MINIMUM_AGE = 18
 MAXIMUM_AGE = 30
+
+# sifting counts cohorts without names as the 6 characters of the random
+# ids cohorts were once given
+UNNAMED_COHORT_LENGTH = 6
+
+# seconds spent improving completed teams by moving and swapping cohorts
+IMPROVE_TIME_BUDGET = 1.0
+
+# seconds spent annealing teams when annealing replaces the greedy passes
+ANNEAL_TIME_BUDGET = 2.0
+
+# moves tried when annealing teams so a seed gives the same placement anywhere
+ANNEAL_MOVES = 50_000
+
+# seconds spent proving the best placement when solving teams exactly
+EXACT_TIME_BUDGET = 10.0
+
+# most placements kept for repeated requests to place people on teams
+RESULT_CACHE_SIZE = 32
+
+# most cohorts after the first pass kept for requests changing only controls
+CHECKPOINT_CACHE_SIZE = 8
@@ -3,7 +3,7 @@ from enum import Enum
 from typing import Literal
 
 # third-party imports
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class BaseObject(BaseModel):
@@ -27,6 +27,18 @@ class Collective(str, Enum):
     old = "I basically live at Collective."
 
 
+class Completion(str, Enum):
+    greedy = "greedy"
+    flow = "flow"
+    assignment = "assignment"
+
+
+class Engine(str, Enum):
+    greedy = "greedy"
+    anneal = "anneal"
+    exact = "exact"
+
+
 class Gender(str, Enum):
     male = "Male"
     female = "Female"
@@ -94,3 +106,16 @@ class Targets(BaseModel):
     collective_old: float
     age_std: float
     girl_count: float
+
+
+class PassCounters(BaseModel):
+    evaluations: int = 0
+    candidates: int = 0
+    joins: int = 0
+
+
+class PlacementReport(BaseModel):
+    cost: float = 0.0
+    proved: bool = False
+    timed_out: bool = False
+    counters: PassCounters = Field(default_factory=PassCounters)
@@ -0,0 +1,80 @@
+# native imports
+from math import inf
+
+
+def assign_rows(costs: list[list[float | None]]) -> list[int | None]:
+    """
+    Assigns each row of a cost matrix a different column at the lowest total
+    cost by the Hungarian algorithm with potentials.
+    Rows must not outnumber columns.
+
+    Parameters
+    ----------
+    costs
+        Cost of each row taking each column with None for forbidden pairs.
+
+    Returns
+    -------
+    list[int | None]
+        Column of each row otherwise None for rows only left with forbidden
+        columns.
+    """
+    row_count = len(costs)
+    if row_count == 0:
+        return []
+    column_count = len(costs[0])
+
+    # forbidden pairs cost more than any allowed assignment
+    allowed = [abs(x) for row in costs for x in row if x is not None]
+    forbidden = (sum(allowed) + 1) * 2
+    matrix = [[forbidden if x is None else x for x in row] for row in costs]
+
+    # row and column potentials with column 0 standing for a row being placed
+    row_potentials = [0.0] * (row_count + 1)
+    column_potentials = [0.0] * (column_count + 1)
+    owners = [0] * (column_count + 1)
+    previous = [0] * (column_count + 1)
+    for i in range(1, row_count + 1):
+        owners[0] = i
+        column = 0
+        slack = [inf] * (column_count + 1)
+        used = [False] * (column_count + 1)
+        while True:
+            # grow the tree of tight columns by the smallest slack
+            used[column] = True
+            row = owners[column]
+            delta = inf
+            next_column = 0
+            for j in range(1, column_count + 1):
+                if used[j]:
+                    continue
+                reduced = (
+                    matrix[row - 1][j - 1] - row_potentials[row] - column_potentials[j]
+                )
+                if reduced < slack[j]:
+                    slack[j] = reduced
+                    previous[j] = column
+                if slack[j] < delta:
+                    delta = slack[j]
+                    next_column = j
+            for j in range(column_count + 1):
+                if used[j]:
+                    row_potentials[owners[j]] += delta
+                    column_potentials[j] -= delta
+                else:
+                    slack[j] -= delta
+            column = next_column
+            if owners[column] == 0:
+                break
+
+        # shift owners along the path to the free column
+        while column != 0:
+            owners[column] = owners[previous[column]]
+            column = previous[column]
+
+    assignment: list[int | None] = [None] * row_count
+    for j in range(1, column_count + 1):
+        i = owners[j]
+        if i != 0 and costs[i - 1][j - 1] is not None:
+            assignment[i - 1] = j - 1
+    return assignment
@@ -0,0 +1,353 @@
+# native imports
+from math import sqrt
+from statistics import StatisticsError
+
+# external imports
+from team_placement.constants import PRIORITIES
+from team_placement.schemas import Collective, Targets
+from team_placement.utils.people_table import PeopleTable
+
+# relative error allowed when screening age spread with floats
+SPREAD_TOLERANCE = 1e-9
+
+# position of each count in a cohort row
+TEAM_SIZE = 0
+COLLECTIVES = {
+    Collective.new: 1,
+    Collective.newish: 2,
+    Collective.oldish: 3,
+    Collective.old: 4,
+}
+GIRL_COUNT = 5
+AGE_SUM = 6
+AGE_SQUARES = 7
+ROW_SIZE = 8
+
+# position of each collective count by collective code
+COLLECTIVE_COLUMNS = [COLLECTIVES[collective] for collective in Collective]
+
+# position of each count by priority
+PRIORITY_COLUMNS = {
+    "team_size": TEAM_SIZE,
+    "collective_new": COLLECTIVES[Collective.new],
+    "collective_newish": COLLECTIVES[Collective.newish],
+    "collective_oldish": COLLECTIVES[Collective.oldish],
+    "collective_old": COLLECTIVES[Collective.old],
+    "girl_count": GIRL_COUNT,
+}
+
+
+def sample_stdev(count: int, total: int, squares: int) -> float:
+    """
+    Sample standard deviation from running moments with floats.
+
+    Parameters
+    ----------
+    count
+        Number of values.
+    total
+        Sum of values.
+    squares
+        Sum of squared values.
+
+    Returns
+    -------
+    float
+        Sample standard deviation of the values.
+    """
+    spread = squares - total * (total / count)
+    return sqrt(spread / (count - 1)) if spread > 0 else 0.0
+
+
+def adjusted_sample_stdev(
+    count: int, total: int, squares: int, team_size: float
+) -> float:
+    """
+    Sample standard deviation of ages from running moments adjusted for a team size.
+    Missing people are added at the mean age as with adjusted_stdev, which leaves
+    the spread of ages around the mean unchanged and only adds to the count.
+
+    Parameters
+    ----------
+    count
+        Number of ages.
+    total
+        Sum of ages.
+    squares
+        Sum of squared ages.
+    team_size
+        Number of people on a team.
+
+    Returns
+    -------
+    float
+        Adjusted sample standard deviation of the ages.
+    """
+    size = max(count, int(team_size))
+    if size < 2:
+        raise StatisticsError("stdev requires at least two data points")
+
+    spread = squares - total * (total / count)
+    return sqrt(spread / (size - 1)) if spread > 0 else 0.0
+
+
+def count_rows(labels: list[int], rows: list[list[int]]) -> dict[int, list[int]]:
+    """
+    Sums rows by label in a single pass.
+
+    Parameters
+    ----------
+    labels
+        Label of each row.
+    rows
+        Counts and age moments to sum.
+
+    Returns
+    -------
+    dict[int, list[int]]
+        Summed counts and age moments keyed by label.
+    """
+    counts: dict[int, list[int]] = {}
+    for label, row in zip(labels, rows):
+        count = counts.setdefault(label, [0] * len(row))
+        for i, value in enumerate(row):
+            count[i] += value
+    return counts
+
+
+def row_priorities(row: list[int]) -> list[float]:
+    """
+    Metrics from counts and age moments in order of priorities.
+
+    Parameters
+    ----------
+    row
+        Counts and age moments of a cohort.
+
+    Returns
+    -------
+    list[float]
+        Metrics of the cohort matching targets in order of priorities.
+    """
+    team_size = row[TEAM_SIZE]
+    age_std = 0.0
+    if team_size > 1:
+        age_std = sample_stdev(team_size, row[AGE_SUM], row[AGE_SQUARES])
+
+    return [
+        age_std if priority == "age_std" else float(row[PRIORITY_COLUMNS[priority]])
+        for priority in PRIORITIES
+    ]
+
+
+class CohortMetrics:
+    """
+    Running counts and age moments of each cohort.
+    Rows are keyed by cohort root and added together when cohorts join.
+
+    Parameters
+    ----------
+    table
+        Attributes of all people to place on teams.
+    labels
+        Root of the cohort of each person.
+    """
+
+    def __init__(self, table: PeopleTable, labels: list[int]) -> None:
+        self.person_rows = [self.person_row(table, i) for i in range(len(table))]
+        self.rows = count_rows(labels, self.person_rows)
+
+        # metrics in order of priorities are kept until cohorts join
+        self.vectors: dict[int, list[float]] = {}
+
+    @staticmethod
+    def person_row(table: PeopleTable, position: int) -> list[int]:
+        """
+        Counts and age moments of a single person.
+
+        Parameters
+        ----------
+        table
+            Attributes of all people to place on teams.
+        position
+            Position of the person in people.
+
+        Returns
+        -------
+        list[int]
+            Counts and age moments of the person.
+        """
+        age = table.ages[position]
+        row = [0] * ROW_SIZE
+        row[TEAM_SIZE] = 1
+        row[COLLECTIVE_COLUMNS[table.collectives[position]]] = 1
+        row[GIRL_COUNT] = int(table.is_female(position))
+        row[AGE_SUM] = age
+        row[AGE_SQUARES] = age * age
+        return row
+
+    def merge(self, root_1: int, root_2: int) -> None:
+        """Merges the row of the second cohort into the first cohort."""
+        self.vectors.pop(root_1, None)
+        self.vectors.pop(root_2, None)
+        row = self.rows[root_1]
+        for i, value in enumerate(self.rows.pop(root_2)):
+            row[i] += value
+
+    def row(self, roots: list[int]) -> list[int]:
+        """
+        Combines rows of cohorts.
+
+        Parameters
+        ----------
+        roots
+            Unique roots of cohorts.
+
+        Returns
+        -------
+        list[int]
+            Counts and age moments of the combined cohorts.
+        """
+        if len(roots) == 1:
+            return self.rows[roots[0]]
+
+        row = [0] * ROW_SIZE
+        for root in roots:
+            for i, value in enumerate(self.rows[root]):
+                row[i] += value
+        return row
+
+    def targets(self, roots: list[int]) -> Targets:
+        """
+        Metrics of combined cohorts.
+
+        Parameters
+        ----------
+        roots
+            Unique roots of cohorts.
+
+        Returns
+        -------
+        Targets
+            Metrics of the combined cohorts.
+        """
+        return Targets(**dict(zip(PRIORITIES, row_priorities(self.row(roots)))))
+
+    def meets(self, row: list[int], targets: Targets) -> bool:
+        """
+        Determines if counts and age moments of combined cohorts meet targets.
+        Age standard deviation is adjusted to the target team size.
+
+        Parameters
+        ----------
+        row
+            Counts and age moments of combined cohorts.
+        targets
+            Targets for each cohort.
+
+        Returns
+        -------
+        bool
+            Flag for combined cohorts meeting targets.
+        """
+        for priority, column in PRIORITY_COLUMNS.items():
+            if row[column] > getattr(targets, priority):
+                return False
+
+        # screen age spread without square roots and settle close calls by stdev
+        count, total, squares = row[TEAM_SIZE], row[AGE_SUM], row[AGE_SQUARES]
+        size = max(count, int(targets.team_size))
+        if size > 1:
+            spread = squares - total * (total / count)
+            limit = targets.age_std * targets.age_std * (size - 1)
+            margin = SPREAD_TOLERANCE * (squares + 1)
+            if spread < limit - margin:
+                return True
+            if spread > limit + margin:
+                return False
+
+        age_std = adjusted_sample_stdev(count, total, squares, targets.team_size)
+        return age_std <= targets.age_std
+
+    def feasibility(
+        self,
+        roots: list[int],
+        friend_roots: list[int],
+        leader_roots: list[int],
+        targets: Targets,
+    ) -> list[list[bool]]:
+        """
+        Determines if cohorts combined with each friend and leader cohort meet targets.
+
+        Parameters
+        ----------
+        roots
+            Unique roots of cohorts combined with every friend and leader cohort.
+        friend_roots
+            Roots of friend cohorts.
+        leader_roots
+            Roots of leader cohorts.
+        targets
+            Targets for each cohort.
+
+        Returns
+        -------
+        list[list[bool]]
+            Flags with a row for each friend and a column for each leader cohort.
+        """
+        base = self.row(roots)
+        matrix: list[list[bool]] = []
+        for friend_root in friend_roots:
+            friend_row = [x + y for x, y in zip(base, self.rows[friend_root])]
+            matrix.append(
+                [
+                    self.meets(
+                        [x + y for x, y in zip(friend_row, self.rows[leader_root])],
+                        targets,
+                    )
+                    for leader_root in leader_roots
+                ]
+            )
+        return matrix
+
+    def vector(self, root: int) -> list[float]:
+        """Metrics of a cohort in order of priorities."""
+        if root not in self.vectors:
+            self.vectors[root] = row_priorities(self.rows[root])
+        return self.vectors[root]
+
+    def matrix(self, roots: list[int]) -> list[list[float]]:
+        """
+        Metrics of each cohort in order of priorities.
+
+        Parameters
+        ----------
+        roots
+            Roots of cohorts.
+
+        Returns
+        -------
+        list[list[float]]
+            Metrics with a row for each cohort and a column for each priority.
+        """
+        return [self.vector(root) for root in roots]
+
+    def totals(self, roots: list[int]) -> dict[str, float]:
+        """
+        Sums metrics of cohorts for each priority in order of cohorts.
+
+        Parameters
+        ----------
+        roots
+            Roots of cohorts.
+
+        Returns
+        -------
+        dict[str, float]
+            Sum of metrics over cohorts by priority.
+        """
+        matrix = self.matrix(roots)
+        return {
+            priority: sum([row[j] for row in matrix])
+            for j, priority in enumerate(PRIORITIES)
+        }
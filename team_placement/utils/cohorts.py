@@ -0,0 +1,545 @@
+# external imports
+from team_placement.schemas import Collective, Person
+from team_placement.utils.cohort_metrics import ROW_SIZE, CohortMetrics
+from team_placement.utils.people_table import PeopleTable
+from team_placement.utils.preference_graph import PreferenceGraph
+
+
+class Cohorts:
+    """
+    Disjoint-set index of cohorts shared by the team placement stages.
+    Cohorts are stored by the position of their root member in people.
+    Person attributes are only updated when changes are written back.
+
+    Parameters
+    ----------
+    people
+        All people to place on teams with cohorts already assigned.
+    graph
+        Preferences between people. Created from people if not provided.
+    table
+        Attributes of people. Created from people if not provided.
+    """
+
+    def __init__(
+        self,
+        people: list[Person],
+        graph: PreferenceGraph | None = None,
+        table: PeopleTable | None = None,
+    ) -> None:
+        self.people = people
+        self.table = PeopleTable(people) if table is None else table
+        self.positions = self.table.positions
+        self.graph = PreferenceGraph(people, self.table) if graph is None else graph
+        self.parents = list(self.table.cohorts)
+
+        # cohort details are keyed by root position
+        self.members: dict[int, list[int]] = {}
+        self.firsts: dict[int, int] = {}
+        self.labels: dict[int, int] = {}
+        self.teams: dict[int, str] = {}
+
+        # cohorts are identified by dense integers
+        # names people arrived with are kept for writing back such as team names
+        self.names: dict[int, str] = {}
+
+        # members and banned people are bitsets of positions
+        # banned people missing from people are kept by index
+        self.masks: dict[int, int] = {}
+        self.banned: dict[int, int] = {}
+        self.banned_missing: dict[int, set[str]] = {}
+
+        # group people by their existing cohort
+        for i, person in enumerate(people):
+            root = self.parents[i]
+            if root == i:
+                self.members[root] = []
+                self.firsts[root] = i
+                self.labels[root] = root
+                if person.cohort != "":
+                    self.names[root] = person.cohort
+                self.teams[root] = person.team
+                self.masks[root] = 0
+                self.banned[root] = 0
+                self.banned_missing[root] = set()
+            self.members[root].append(i)
+            self.masks[root] |= 1 << i
+            for index in person.banned_people:
+                if index in self.positions:
+                    self.banned[root] |= 1 << self.positions[index]
+                else:
+                    self.banned_missing[root].add(index)
+            if self.teams[root] == "":
+                self.teams[root] = person.team
+
+        # counts and age moments of each cohort
+        self.metrics = CohortMetrics(self.table, self.parents)
+
+        # running counts and age moments of all cohorts with teams
+        self.leader_row = [0] * ROW_SIZE
+        for root, team in self.teams.items():
+            if team != "":
+                self.add_leader_row(root, 1)
+
+        # people in cohorts without teams
+        self.everyone = (1 << len(people)) - 1
+        self.teamless = 0
+        for root, team in self.teams.items():
+            if team == "":
+                self.teamless |= self.masks[root]
+
+        # people by collective, gender and age
+        self.collective_masks = {collective: 0 for collective in Collective}
+        self.girl_mask = 0
+        self.age_masks: dict[int, int] = {}
+        for i, age in enumerate(self.table.ages):
+            self.collective_masks[self.table.collective(i)] |= 1 << i
+            if self.table.is_female(i):
+                self.girl_mask |= 1 << i
+            self.age_masks[age] = self.age_masks.get(age, 0) | 1 << i
+
+        # people each cohort may merge with as of a version of cohorts
+        self.candidate_masks: tuple[int, dict[int, int]] = (0, {})
+
+        # roots of cohorts changed by joins or team assignments in order
+        self.changed: list[int] = []
+        self.stamps: dict[int, int] = {}
+        self.leaders_changed = 0
+        self.merges = 0
+
+        # roots of leader cohorts as of the latest change to leader cohorts
+        self.leader_roots: tuple[int, list[int]] | None = None
+
+        # cohorts banning anyone in each cohort
+        self.banners: dict[int, set[int]] = {root: set() for root in self.members}
+        for root, banned in self.banned.items():
+            for i in bits(banned):
+                self.banners[self.find(i)].add(root)
+
+    def find(self, position: int) -> int:
+        """
+        Finds the root position of a cohort with path halving.
+
+        Parameters
+        ----------
+        position
+            Position of a person in people.
+
+        Returns
+        -------
+        int
+            Root position of the cohort.
+        """
+        parents = self.parents
+        while parents[position] != position:
+            parents[position] = parents[parents[position]]
+            position = parents[position]
+        return position
+
+    def root(self, person: Person) -> int:
+        """
+        Identifies the cohort of a person.
+
+        Parameters
+        ----------
+        person
+            A person.
+
+        Returns
+        -------
+        int
+            Root position of the cohort of the person.
+        """
+        return self.find(self.positions[person.index])
+
+    def cohort(self, person: Person) -> list[Person]:
+        """
+        Collects people in the cohort of a person.
+
+        Parameters
+        ----------
+        person
+            A person.
+
+        Returns
+        -------
+        list[Person]
+            People in the cohort of the person.
+        """
+        return [self.people[i] for i in self.members[self.root(person)]]
+
+    def name(self, root: int) -> str:
+        """Name of a cohort by its root written back to people."""
+        label = self.labels[root]
+        return self.names.get(label, str(label))
+
+    def size(self, person: Person) -> int:
+        """Number of people in the cohort of a person."""
+        return len(self.members[self.root(person)])
+
+    def team(self, person: Person) -> str:
+        """Team of the cohort of a person."""
+        return self.teams[self.root(person)]
+
+    def set_team(self, person: Person, team: str) -> None:
+        """Assigns the cohort of a person to a team."""
+        root = self.root(person)
+        if (self.teams[root] == "") != (team == ""):
+            self.add_leader_row(root, 1 if team != "" else -1)
+        self.teams[root] = team
+        if team != "":
+            self.teamless &= ~self.masks[root]
+        else:
+            self.teamless |= self.masks[root]
+        self.touch(root)
+
+    def add_leader_row(self, root: int, sign: int) -> None:
+        """Adds or removes the row of a cohort from the leader totals."""
+        for i, value in enumerate(self.metrics.rows[root]):
+            self.leader_row[i] += sign * value
+
+    @property
+    def version(self) -> int:
+        """Number of changes to cohorts which only increases."""
+        return len(self.changed)
+
+    def touch(self, root: int) -> None:
+        """Records a change to a cohort by its root position."""
+        self.changed.append(root)
+        self.stamps[root] = self.version
+        if self.teams[root] != "":
+            self.leaders_changed = self.version
+
+    def changed_since(self, person: Person, version: int) -> bool:
+        """
+        Determines if the cohort of a person changed after a version.
+
+        Parameters
+        ----------
+        person
+            A person.
+        version
+            Version of cohorts when the person was last checked.
+
+        Returns
+        -------
+        bool
+            Flag for a changed cohort.
+        """
+        return self.stamps.get(self.root(person), 0) > version
+
+    def leaders(self) -> list[int]:
+        """
+        Collects cohorts with teams.
+
+        Returns
+        -------
+        list[int]
+            Root positions of leader cohorts in order of their first person.
+        """
+        if self.leader_roots is None or self.leader_roots[0] != self.leaders_changed:
+            roots = [root for root, team in self.teams.items() if team != ""]
+            roots.sort(key=lambda x: self.firsts[x])
+            self.leader_roots = (self.leaders_changed, roots)
+        return self.leader_roots[1]
+
+    def candidates(self, person: Person) -> int:
+        """
+        Collects people the cohort of a person may merge with.
+        People must be in a different cohort that is not banned.
+        Cohorts with teams may only merge with people without teams.
+
+        Parameters
+        ----------
+        person
+            A person.
+
+        Returns
+        -------
+        int
+            Bitset of positions of people the cohort may merge with.
+        """
+        version, candidates = self.candidate_masks
+        if version != self.version:
+            candidates = {}
+            self.candidate_masks = (self.version, candidates)
+
+        root = self.root(person)
+        if root not in candidates:
+            mask = self.everyone if self.teams[root] == "" else self.teamless
+            mask &= ~self.masks[root]
+            for i in bits(self.banned[root]):
+                mask &= ~self.masks[self.find(i)]
+            candidates[root] = mask
+        return candidates[root]
+
+    def is_banned(self, person: Person, friend: Person) -> bool:
+        """
+        Determines if the cohort of a person bans anyone in the cohort of a friend.
+
+        Parameters
+        ----------
+        person
+            A person.
+        friend
+            A friend of the person.
+
+        Returns
+        -------
+        bool
+            Flag for a banned union.
+        """
+        return self.banned[self.root(person)] & self.masks[self.root(friend)] != 0
+
+    def bans(self, person: Person, index: str) -> bool:
+        """
+        Determines if the cohort of a person bans a person by index.
+
+        Parameters
+        ----------
+        person
+            A person.
+        index
+            Index of a person possibly banned from the cohort.
+
+        Returns
+        -------
+        bool
+            Flag for a banned person.
+        """
+        root = self.root(person)
+        if index in self.positions:
+            return self.banned[root] >> self.positions[index] & 1 == 1
+        return index in self.banned_missing[root]
+
+    def ban_count(self, root: int) -> int:
+        """Number of people banned from a cohort by its root position."""
+        return self.banned[root].bit_count() + len(self.banned_missing[root])
+
+    def banned_people(self, root: int) -> list[str]:
+        """
+        Collects indices of people banned from a cohort.
+
+        Parameters
+        ----------
+        root
+            Root position of a cohort.
+
+        Returns
+        -------
+        list[str]
+            Sorted indices of banned people.
+        """
+        banned = [self.people[i].index for i in bits(self.banned[root])]
+        return sorted(banned + list(self.banned_missing[root]))
+
+    def ban(self, person: Person, index: str) -> None:
+        """
+        Bans a person from the cohort of another person.
+
+        Parameters
+        ----------
+        person
+            A person.
+        index
+            Index of the person to ban from the cohort.
+        """
+        root = self.root(person)
+        if index in self.positions:
+            self.banned[root] |= 1 << self.positions[index]
+            self.banners[self.find(self.positions[index])].add(root)
+        else:
+            self.banned_missing[root].add(index)
+        self.touch(root)
+
+    def join(self, person_1: Person, person_2: Person) -> int:
+        """
+        Joins the cohorts of two people.
+        The label of the first cohort is adopted.
+
+        Parameters
+        ----------
+        person_1
+            A person.
+        person_2
+            A second person.
+
+        Returns
+        -------
+        int
+            Root position of the joined cohort.
+        """
+        root_1 = self.root(person_1)
+        root_2 = self.root(person_2)
+        if root_1 != root_2:
+            root_1 = self.union(root_1, root_2)
+            self.touch(root_1)
+
+        # update banned people for all cohorts effected by joining cohorts
+        for root in self.banning(root_1):
+            banned = self.banned[root]
+            self.banned[root] |= self.masks[root_1]
+            if self.banned[root] != banned:
+                self.touch(root)
+        return root_1
+
+    def union(self, root_1: int, root_2: int) -> int:
+        """
+        Merges two different cohorts by size.
+        The label of the first cohort is adopted.
+
+        Parameters
+        ----------
+        root_1
+            Root position of a cohort.
+        root_2
+            Root position of a second cohort.
+
+        Returns
+        -------
+        int
+            Root position of the merged cohort.
+        """
+        # the team of the earliest person with a team is adopted
+        team = self.teams[root_1]
+        if self.teams[root_2] != "" and (
+            team == "" or self.firsts[root_2] < self.firsts[root_1]
+        ):
+            team = self.teams[root_2]
+
+        # cohorts without teams join the leader totals with the merged team
+        if team != "":
+            for root in (root_1, root_2):
+                if self.teams[root] == "":
+                    self.add_leader_row(root, 1)
+
+        # union by size
+        self.merges += 1
+        label = self.labels[root_1]
+        if len(self.members[root_1]) < len(self.members[root_2]):
+            root_1, root_2 = root_2, root_1
+        self.parents[root_2] = root_1
+        self.members[root_1] += self.members.pop(root_2)
+        self.masks[root_1] |= self.masks.pop(root_2)
+        self.firsts[root_1] = min(self.firsts[root_1], self.firsts.pop(root_2))
+        self.metrics.merge(root_1, root_2)
+        self.labels[root_1] = label
+        self.labels.pop(root_2)
+        self.teams[root_1] = team
+        self.teams.pop(root_2)
+        if team != "":
+            self.teamless &= ~self.masks[root_1]
+
+        # collect banned people
+        self.banned[root_1] |= self.banned.pop(root_2)
+        self.banned_missing[root_1] |= self.banned_missing.pop(root_2)
+        self.banners[root_1] |= self.banners.pop(root_2)
+        return root_1
+
+    def banning(self, root: int) -> set[int]:
+        """
+        Collects cohorts banning anyone in a cohort.
+
+        Parameters
+        ----------
+        root
+            Root position of a cohort.
+
+        Returns
+        -------
+        set[int]
+            Root positions of cohorts banning anyone in the cohort.
+        """
+        banners = set([self.find(x) for x in self.banners[root]])
+        self.banners[root] = banners
+        return banners
+
+    def roots(self, people: list[Person]) -> list[int]:
+        """
+        Collects unique cohorts of people.
+
+        Parameters
+        ----------
+        people
+            People in cohorts.
+
+        Returns
+        -------
+        list[int]
+            Unique root positions of cohorts in order of people.
+        """
+        roots: list[int] = []
+        seen: set[int] = set()
+        for person in people:
+            root = self.root(person)
+            if root not in seen:
+                seen.add(root)
+                roots.append(root)
+        return roots
+
+    def representatives(self, people: list[Person] | None = None) -> list[Person]:
+        """
+        Collects the first person from each cohort within people.
+
+        Parameters
+        ----------
+        people
+            People to collect representatives from. Defaults to all people.
+
+        Returns
+        -------
+        list[Person]
+            Representatives from unique cohorts.
+        """
+        if people is None:
+            people = self.people
+
+        roots: set[int] = set()
+        representatives: list[Person] = []
+        for person in people:
+            root = self.root(person)
+            if root not in roots:
+                roots.add(root)
+                representatives.append(person)
+        return representatives
+
+    def write_back(self) -> list[Person]:
+        """
+        Writes cohorts, teams and banned people back to people.
+
+        Returns
+        -------
+        list[Person]
+            People with updated cohorts.
+        """
+        for root, members in self.members.items():
+            banned = self.banned_people(root)
+            name = self.name(root)
+            for i in members:
+                person = self.people[i]
+                person.cohort = name
+                person.team = self.teams[root]
+                person.banned_people = list(banned)
+        return self.people
+
+
+def bits(mask: int) -> list[int]:
+    """
+    Collects positions set in a bitset.
+
+    Parameters
+    ----------
+    mask
+        Bitset of positions.
+
+    Returns
+    -------
+    list[int]
+        Positions in ascending order.
+    """
+    positions: list[int] = []
+    while mask:
+        low = mask & -mask
+        positions.append(low.bit_length() - 1)
+        mask ^= low
+    return positions
@@ -1,14 +1,18 @@
-# native imports
-from statistics import stdev
-
 # external imports
-from team_placement.constants import PRIORITIES
-from team_placement.schemas import BooleanEnum, Collective, Gender, Person, Targets
+from team_placement.schemas import BooleanEnum, Person, Targets
+from team_placement.utils.cohort_metrics import (
+    AGE_SQUARES,
+    AGE_SUM,
+    TEAM_SIZE,
+    adjusted_sample_stdev,
+)
+from team_placement.utils.cohorts import Cohorts
 
 
 def adjusted_stdev(ages: list[int], team_size: int) -> float:
     """
     Adjusts the standard deviation of ages for a team size.
+    People missing from the team are added at the mean age from age moments.
 
     Parameters
     ----------
@@ -22,14 +26,13 @@ def adjusted_stdev(ages: list[int], team_size: int) -> float:
     float
         Adjusted standard deviation of ages for a team size.
     """
-    mean_age = sum(ages) / len(ages)
-    new_ages = ages + [mean_age] * (int(team_size) - len(ages))
-    return stdev(new_ages)
+    squares = sum([x * x for x in ages])
+    return adjusted_sample_stdev(len(ages), sum(ages), squares, team_size)
 
 
 def collect_metrics(
-    people: list[Person],
-    cohorts: str | list[str],
+    cohorts: Cohorts,
+    representatives: Person | list[Person],
     adjust_age: bool = False,
     target_team_size: int | None = None,
 ) -> Targets:
@@ -38,10 +41,10 @@ def collect_metrics(
 
     Parameters
     ----------
-    people
-        All people to place on teams.
-    cohort
-        Cohort(s) to collect metrics for.
+    cohorts
+        Cohorts of all people to place on teams.
+    representatives
+        Representative(s) of the cohort(s) to collect metrics for.
     adjust_age
         Flag to adjust the standard deviation of ages for a team size.
     target_team_size
@@ -52,69 +55,44 @@ def collect_metrics(
     Targets
         Metrics for cohort(s).
     """
-    if isinstance(cohorts, str):
-        cohorts = [cohorts]
-
-    people_in_cohort = [x for x in people if x.cohort in cohorts]
+    if isinstance(representatives, Person):
+        representatives = [representatives]
 
-    team_size = len(people_in_cohort)
-    ages = [x.age for x in people_in_cohort]
+    # counts and age moments are kept up to date as cohorts join
+    roots = cohorts.roots(representatives)
+    metrics = cohorts.metrics.targets(roots)
 
     # scale age standard deviation to a full team size
-    age_std = stdev(ages) if len(ages) > 1 else 0
     if adjust_age and target_team_size is not None:
-        age_std = adjusted_stdev(ages, target_team_size)
-
-    collective_new = len(
-        [x for x in people_in_cohort if x.collective == Collective.new]
-    )
-    collective_newish = len(
-        [x for x in people_in_cohort if x.collective == Collective.newish]
-    )
-    collective_oldish = len(
-        [x for x in people_in_cohort if x.collective == Collective.oldish]
-    )
-    collective_old = len(
-        [x for x in people_in_cohort if x.collective == Collective.old]
-    )
-    girl_count = len([x for x in people_in_cohort if x.gender == Gender.female])
-
-    return Targets(
-        team_size=team_size,
-        collective_new=collective_new,
-        collective_newish=collective_newish,
-        collective_oldish=collective_oldish,
-        collective_old=collective_old,
-        age_std=age_std,
-        girl_count=girl_count,
-    )
+        row = cohorts.metrics.row(roots)
+        metrics.age_std = adjusted_sample_stdev(
+            row[TEAM_SIZE], row[AGE_SUM], row[AGE_SQUARES], target_team_size
+        )
+    return metrics
 
 
-def collect_representatives(people: list[Person]) -> list[Person]:
+def collect_representatives(people: list[Person], cohorts: Cohorts) -> list[Person]:
     """
     Collects representative friends from each cohort within friends.
 
     Parameters
     ----------
-    friends
+    people
         Friends to possibly cohort with a person.
+    cohorts
+        Cohorts of all people to place on teams.
 
     Returns
     -------
     list[Person]
         Representative friends from unique cohorts to possibly cohort with a person.
     """
-    # find friend representatives
-    friend_representatives: list[Person] = []
-    for friend in people:
-        if friend.cohort not in [x.cohort for x in friend_representatives]:
-            friend_representatives.append(friend)
-    return friend_representatives
+    return cohorts.representatives(people)
 
 
 def find_friends(
     person: Person,
-    people: list[Person],
+    cohorts: Cohorts,
     possible_friends: list[Person] | None = None,
     preferred: bool = True,
     all_people: bool = False,
@@ -128,8 +106,8 @@ def find_friends(
     ----------
     person
         A person.
-    people
-        All people to assign to teams.
+    cohorts
+        Cohorts of all people to assign to teams.
     possible_friends
         Possible friends to be on a team with a person.
     preferred
@@ -143,31 +121,34 @@ def find_friends(
         Friends to possibly cohort with a person.
     """
     if possible_friends is None:
-        possible_friends = people
+        possible_friends = (
+            preferred_people(person, cohorts) if preferred else cohorts.people
+        )
 
     # find friends and their cohorts
+    position = cohorts.positions[person.index]
+    root = cohorts.find(position)
+    team = cohorts.teams[root]
     friends = [
         friend
         for friend in possible_friends
-        if (person.team == "" or friend.team == "")
-        and friend.cohort != person.cohort
-        and (friend.index in person.preferredPeople or not preferred)
-        and all(
-            [
-                x not in person.banned_people
-                for x in [y.index for y in people if y.cohort == friend.cohort]
-            ]
+        if (team == "" or cohorts.team(friend) == "")
+        and cohorts.root(friend) != root
+        and (
+            not preferred
+            or cohorts.graph.is_preferred(position, cohorts.positions[friend.index])
         )
+        and not cohorts.is_banned(person, friend)
     ]
     if all_people:
         return friends
-    return collect_representatives(friends)
+    return collect_representatives(friends, cohorts)
 
 
 def find_friends_strict(
     person: Person,
     possible_friends: list[Person],
-    people: list[Person],
+    cohorts: Cohorts,
     targets: Targets,
     team_count: int,
 ) -> list[Person]:
@@ -181,8 +162,8 @@ def find_friends_strict(
         A person.
     possible_friends
         Possible friends to be on a team with a person.
-    people
-        All people to assign to teams.
+    cohorts
+        Cohorts of all people to assign to teams.
     targets
         Targets for each cohort.
     team_count
@@ -194,99 +175,140 @@ def find_friends_strict(
         Possible friends for a person that will meet targets when cohorting.
     """
     # friends cannot already cohort with the person
-    possible_friends = [x for x in possible_friends if x.cohort != person.cohort]
-    friends = collect_representatives(possible_friends)
+    root = cohorts.root(person)
+    possible_friends = [x for x in possible_friends if cohorts.root(x) != root]
+    friends = collect_representatives(possible_friends, cohorts)
 
     # collect leaders of teams in use
-    leaders = collect_representatives([x for x in people if x.team != ""])
+    leader_roots = cohorts.leaders()
+
+    # friends without teams must add to a team while meeting targets
+    # when the person has no team and all teams are in use
+    screened = cohorts.team(person) == "" and len(leader_roots) == team_count
+    adding = [x for x in friends if screened and cohorts.team(x) == ""]
+    feasible = cohorts.metrics.feasibility(
+        [root], [cohorts.root(x) for x in adding], leader_roots, targets
+    )
+    feasible_leaders = dict(zip([x.index for x in adding], feasible))
 
     # check for validity based on targets and adding to leader cohorts
     friends_strict: list[Person] = []
     for friend in friends:
-        metrics = collect_metrics(
-            people,
-            [person.cohort, friend.cohort],
-            adjust_age=True,
-            target_team_size=targets.team_size,
-        )
-
         # team must meet targets
-        if person.team != "" or friend.team != "" or len(leaders) != team_count:
-            if all(
-                [
-                    getattr(metrics, priority) <= getattr(targets, priority)
-                    for priority in PRIORITIES
-                ]
-            ):
+        if friend.index not in feasible_leaders:
+            if meets_targets(cohorts, [person, friend], targets):
                 friends_strict.append(friend)
             continue
 
-        # cohort must add to a team while meeting targets
-        people_in_cohort = [
-            x for x in people if x.cohort in [person.cohort, friend.cohort]
-        ]
-        for leader in leaders:
-            if any([x.index in leader.banned_people for x in people_in_cohort]):
-                continue
-
-            # friend is valid if a leader cohort can be joined
-            metrics = collect_metrics(
-                people,
-                [person.cohort, friend.cohort, leader.cohort],
-                adjust_age=True,
-                target_team_size=targets.team_size,
-            )
-
-            if all(
-                [
-                    getattr(metrics, priority) <= getattr(targets, priority)
-                    for priority in PRIORITIES
-                ]
+        # friend is valid if a leader cohort can be joined
+        for leader_root, valid in zip(leader_roots, feasible_leaders[friend.index]):
+            leader = cohorts.people[leader_root]
+            if valid and not (
+                cohorts.is_banned(leader, person) or cohorts.is_banned(leader, friend)
             ):
                 friends_strict.append(friend)
                 break
     return friends_strict
 
 
-def find_new_people(people: list[Person]) -> list[Person]:
+def meets_targets(
+    cohorts: Cohorts,
+    representatives: list[Person],
+    targets: Targets,
+) -> bool:
+    """
+    Determines if the combined cohorts of representatives meet targets.
+
+    Parameters
+    ----------
+    cohorts
+        Cohorts of all people to assign to teams.
+    representatives
+        People from cohorts to combine.
+    targets
+        Targets for each cohort.
+
+    Returns
+    -------
+    bool
+        Flag for combined cohorts meeting targets.
+    """
+    row = cohorts.metrics.row(cohorts.roots(representatives))
+    return cohorts.metrics.meets(row, targets)
+
+
+def is_new_person(person: Person, cohorts: Cohorts) -> bool:
+    """
+    Determines if a first time person is not yet paired with any of their preferences.
+
+    Parameters
+    ----------
+    person
+        A person.
+    cohorts
+        Cohorts of all people to place on teams.
+
+    Returns
+    -------
+    bool
+        Flag for a first time person without any preferred people in their cohort.
+    """
+    position = cohorts.positions[person.index]
+    if not cohorts.table.first_times[position] or cohorts.graph.degree(position) == 0:
+        return False
+
+    root = cohorts.find(position)
+    return all([cohorts.find(i) != root for i in cohorts.graph.preferred[position]])
+
+
+def preferred_people(person: Person, cohorts: Cohorts) -> list[Person]:
+    """
+    Collects people preferred by a person.
+
+    Parameters
+    ----------
+    person
+        A person.
+    cohorts
+        Cohorts of all people to place on teams.
+
+    Returns
+    -------
+    list[Person]
+        People preferred by the person in order of people.
+    """
+    positions = cohorts.graph.preferred[cohorts.positions[person.index]]
+    return [cohorts.people[i] for i in sorted(positions)]
+
+
+def find_new_people(cohorts: Cohorts) -> list[Person]:
     """
     Collects indices to first time people from a list of people.
     They are not yet paired with any of their preferences.
 
     Parameters
     ----------
-    people
-        All people to place on teams.
+    cohorts
+        Cohorts of all people to place on teams.
 
     Returns
     -------
     list[Person]
         People who are not matched with any of their preferences.
     """
-    new_people = [
-        x
-        for x in people
-        if x.firstTime == BooleanEnum.yes
-        and len(x.preferredPeople) != 0
-        and all(
-            [
-                index not in [y.index for y in people if y.cohort == x.cohort]
-                for index in x.preferredPeople
-            ]
-        )
-    ]
+    new_people = [x for x in cohorts.people if is_new_person(x, cohorts)]
     new_people.sort(key=lambda x: x.order)
     return new_people
 
 
-def find_new_people_complete(people: list[Person]) -> list[Person]:
+def find_new_people_complete(cohorts: Cohorts) -> list[Person]:
     """
     Collects new people with unmet preferences that meet targets.
 
     Parameters
     ----------
-    people
-        All people to place on teams.
+    cohorts
+        Cohorts of all people to place on teams.
 
     Returns
     -------
@@ -295,76 +317,80 @@ def find_new_people_complete(people: list[Person]) -> list[Person]:
     """
     new_people = [
         x
-        for x in people
-        if x.firstTime == BooleanEnum.yes
-        and len(x.preferredPeople) != 0
-        and any(
-            [
-                index not in [y.index for y in people if y.cohort == x.cohort]
-                and index not in x.banned_people
-                for index in x.preferredPeople
-            ]
-        )
+        for x in cohorts.people
+        if x.firstTime == BooleanEnum.yes and len(unmet_preferences(x, cohorts)) != 0
     ]
     new_people.sort(key=lambda x: x.order)
     return new_people
 
 
-def join_cohorts(cohort_1: str, cohort_2: str, people: list[Person]) -> list[Person]:
+def unmet_preferences(person: Person, cohorts: Cohorts) -> list[str]:
     """
-    Joins cohorts.
-    The identifier for the first cohort is adopted.
+    Collects people preferred by a person outside of their cohort who are not banned.
 
     Parameters
     ----------
-    cohort_1
-        A cohort.
-    cohort_2
-        A second cohort.
-    people
-        All people to place on teams.
+    person
+        A person.
+    cohorts
+        Cohorts of all people to place on teams.
 
     Returns
     -------
-    list[Person]
-        People with updated cohorts.
+    list[str]
+        Indices of preferred people yet to join the cohort of the person.
     """
-    # find existing people in cohort
-    people_to_update = [x for x in people if x.cohort in [cohort_1, cohort_2]]
+    position = cohorts.positions[person.index]
+    root = cohorts.find(position)
+    unmet = [
+        cohorts.people[i].index
+        for i in sorted(cohorts.graph.preferred[position])
+        if cohorts.find(i) != root and not cohorts.banned[root] >> i & 1
+    ]
+    unmet += sorted(cohorts.graph.missing[position] - cohorts.banned_missing[root])
+    return unmet
 
-    # collect banned people
-    team = next(iter([x.team for x in people_to_update if x.team != ""]), "")
-    banned_people = list(
-        set([index for x in people_to_update for index in x.banned_people])
-    )
 
-    # update people
-    for person_to_update in people_to_update:
-        person_to_update.cohort = cohort_1
-        person_to_update.team = team
-        person_to_update.banned_people = banned_people
+def join_cohorts(person_1: Person, person_2: Person, cohorts: Cohorts) -> Cohorts:
+    """
+    Joins cohorts.
+    The identifier for the first cohort is adopted.
 
-    # update banned people for all people effected by joining cohorts
-    for person in people:
-        if any([x.index in person.banned_people for x in people_to_update]):
-            person.banned_people = list(
-                set(person.banned_people + [x.index for x in people_to_update])
-            )
-    return people
+    Parameters
+    ----------
+    person_1
+        A person in a cohort.
+    person_2
+        A person in a second cohort.
+    cohorts
+        Cohorts of all people to place on teams.
+
+    Returns
+    -------
+    Cohorts
+        Cohorts with the cohorts of both people joined.
+    """
+    cohorts.join(person_1, person_2)
+    return cohorts
 
 
-def list_cohorts(people: list[Person]) -> list[list[str]]:
+def list_cohorts(cohorts: Cohorts) -> list[list[str]]:
     """
     Full names of people who belong to cohorts.
 
+    Parameters
+    ----------
+    cohorts
+        Cohorts of all people to place on teams.
+
     Returns
     -------
     list[str]
         Full names of people who belong to cohorts.
     """
-    cohorts = [
-        [x for x in people if x.cohort == cohort]
-        for cohort in set([x.cohort for x in people])
+    people_in_cohorts = [
+        [cohorts.people[i] for i in sorted(members)]
+        for members in cohorts.members.values()
     ]
-    cohorts.sort(key=lambda x: min(x, key=lambda y: y.order).order)
-    return [[str(person) for person in cohort] for cohort in cohorts]
+    people_in_cohorts.sort(key=lambda x: min(x, key=lambda y: y.order).order)
+    return [[str(person) for person in cohort] for cohort in people_in_cohorts]
@@ -0,0 +1,168 @@
+# native imports
+from heapq import heappop, heappush
+from math import inf
+
+
+class MinCostFlow:
+    """
+    Network sending flow from a source to a sink at the lowest total cost.
+    Solved by successive shortest paths with potentials keeping reduced costs
+    positive so flow already sent may be rerouted when that lowers the cost.
+    Arcs may have negative costs as long as no cycle does.
+
+    Parameters
+    ----------
+    node_count
+        Number of nodes in the network.
+    """
+
+    def __init__(self, node_count: int) -> None:
+        self.node_count = node_count
+
+        # arcs are stored in pairs of an arc and its reverse
+        self.arcs: list[list[int]] = [[] for _ in range(node_count)]
+        self.heads: list[int] = []
+        self.capacities: list[int] = []
+        self.costs: list[float] = []
+
+    def add_arc(self, tail: int, head: int, capacity: int, cost: float) -> int:
+        """
+        Adds an arc between nodes.
+
+        Parameters
+        ----------
+        tail
+            Node flow leaves.
+        head
+            Node flow enters.
+        capacity
+            Most units of flow along the arc.
+        cost
+            Cost per unit of flow along the arc.
+
+        Returns
+        -------
+        int
+            Identifier of the arc.
+        """
+        arc = len(self.heads)
+        self.arcs[tail].append(arc)
+        self.heads.append(head)
+        self.capacities.append(capacity)
+        self.costs.append(cost)
+        self.arcs[head].append(arc + 1)
+        self.heads.append(tail)
+        self.capacities.append(0)
+        self.costs.append(-cost)
+        return arc
+
+    def flow(self, arc: int) -> int:
+        """Units of flow along an arc."""
+        return self.capacities[arc + 1]
+
+    def solve(self, source: int, sink: int) -> float:
+        """
+        Sends as much flow as possible from the source to the sink at the
+        lowest total cost.
+
+        Parameters
+        ----------
+        source
+            Node flow starts from.
+        sink
+            Node flow ends at.
+
+        Returns
+        -------
+        float
+            Total cost of the flow.
+        """
+        potentials = self.initial_potentials(source)
+        total = 0.0
+        while True:
+            distances, parents = self.shortest_paths(source, sink, potentials)
+            if distances[sink] == inf:
+                return total
+
+            # send as much flow as the path allows
+            path = []
+            node = sink
+            while node != source:
+                path.append(parents[node])
+                node = self.heads[parents[node] ^ 1]
+            amount = min([self.capacities[arc] for arc in path])
+            for arc in path:
+                self.capacities[arc] -= amount
+                self.capacities[arc ^ 1] += amount
+                total += amount * self.costs[arc]
+
+            # potentials keep reduced costs positive for the next path
+            for node in range(self.node_count):
+                potentials[node] += min(distances[node], distances[sink])
+
+    def initial_potentials(self, source: int) -> list[float]:
+        """Lowest cost of reaching each node from the source by Bellman-Ford."""
+        potentials = [inf] * self.node_count
+        potentials[source] = 0.0
+        queue = [source]
+        queued = [False] * self.node_count
+        queued[source] = True
+        while len(queue) > 0:
+            node = queue.pop()
+            queued[node] = False
+            for arc in self.arcs[node]:
+                if self.capacities[arc] == 0:
+                    continue
+                head = self.heads[arc]
+                if potentials[node] + self.costs[arc] < potentials[head]:
+                    potentials[head] = potentials[node] + self.costs[arc]
+                    if not queued[head]:
+                        queued[head] = True
+                        queue.append(head)
+
+        # nodes out of reach are never reached by later paths
+        return [0.0 if x == inf else x for x in potentials]
+
+    def shortest_paths(
+        self, source: int, sink: int, potentials: list[float]
+    ) -> tuple[list[float], list[int]]:
+        """
+        Shortest paths by reduced costs from the source by Dijkstra.
+        Nodes further than the sink are left at their first distance found.
+
+        Parameters
+        ----------
+        source
+            Node paths start from.
+        sink
+            Node paths end at.
+        potentials
+            Potential of each node keeping reduced costs positive.
+
+        Returns
+        -------
+        tuple[list[float], list[int]]
+            Distance to each node and the arc entering each node on its path.
+        """
+        distances = [inf] * self.node_count
+        parents = [-1] * self.node_count
+        done = [False] * self.node_count
+        distances[source] = 0.0
+        heap = [(0.0, source)]
+        while len(heap) > 0:
+            distance, node = heappop(heap)
+            if done[node]:
+                continue
+            done[node] = True
+            if node == sink:
+                break
+            for arc in self.arcs[node]:
+                head = self.heads[arc]
+                if self.capacities[arc] == 0 or done[head]:
+                    continue
+                reduced = self.costs[arc] + potentials[node] - potentials[head]
+                if distance + reduced < distances[head]:
+                    distances[head] = distance + reduced
+                    parents[head] = arc
+                    heappush(heap, (distances[head], head))
+        return distances, parents
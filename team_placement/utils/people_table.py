@@ -0,0 +1,76 @@
+# native imports
+from array import array
+
+# external imports
+from team_placement.schemas import BooleanEnum, Collective, Gender, Person
+
+# codes of enumerated attributes stored in columns
+GENDER_CODES = {gender: code for code, gender in enumerate(Gender)}
+COLLECTIVE_CODES = {collective: code for code, collective in enumerate(Collective)}
+COLLECTIVES_BY_CODE = list(Collective)
+
+
+class PeopleTable:
+    """
+    Compact columns of person attributes used during team placement.
+    People are identified by their position in people.
+    Preferences are stored as compressed rows of preferred positions.
+    Attributes are read once so the columns do not follow later changes to people.
+
+    Parameters
+    ----------
+    people
+        All people to place on teams with cohorts already assigned.
+    """
+
+    def __init__(self, people: list[Person]) -> None:
+        self.positions = {person.index: i for i, person in enumerate(people)}
+
+        # attribute columns
+        self.orders = array("q", [x.order for x in people])
+        self.ages = array("q", [x.age for x in people])
+        self.genders = array("b", [GENDER_CODES[x.gender] for x in people])
+        self.collectives = array("b", [COLLECTIVE_CODES[x.collective] for x in people])
+        self.first_times = array("b", [x.firstTime == BooleanEnum.yes for x in people])
+        self.leaders = array("b", [x.leader == BooleanEnum.yes for x in people])
+
+        # position of the first person in the cohort of each person
+        # people without a cohort name are in their own cohorts
+        firsts: dict[str, int] = {}
+        self.cohorts = array(
+            "q",
+            [
+                firsts.setdefault(x.cohort, i) if x.cohort != "" else i
+                for i, x in enumerate(people)
+            ],
+        )
+
+        # preferred positions of each person start at their offset
+        # preferred people missing from people are kept by index
+        self.offsets = array("q", [0])
+        self.preferences = array("q")
+        self.missing: dict[int, set[str]] = {}
+        for i, person in enumerate(people):
+            seen: set[int] = set()
+            for index in person.preferredPeople:
+                if index not in self.positions:
+                    self.missing.setdefault(i, set()).add(index)
+                elif self.positions[index] not in seen:
+                    seen.add(self.positions[index])
+                    self.preferences.append(self.positions[index])
+            self.offsets.append(len(self.preferences))
+
+    def __len__(self) -> int:
+        return len(self.orders)
+
+    def preferred(self, position: int) -> array:
+        """Positions of people preferred by a person by their position."""
+        return self.preferences[self.offsets[position] : self.offsets[position + 1]]
+
+    def is_female(self, position: int) -> bool:
+        """Determines if a person is female by their position."""
+        return self.genders[position] == GENDER_CODES[Gender.female]
+
+    def collective(self, position: int) -> Collective:
+        """Collective of a person by their position."""
+        return COLLECTIVES_BY_CODE[self.collectives[position]]
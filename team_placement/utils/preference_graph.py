@@ -0,0 +1,44 @@
+# external imports
+from team_placement.schemas import Person
+from team_placement.utils.people_table import PeopleTable
+
+
+class PreferenceGraph:
+    """
+    Preferences between people keyed by the position of each person in people.
+    Preferences do not change during team placement so the graph is built once.
+
+    Parameters
+    ----------
+    people
+        All people to place on teams with preferences assigned.
+    table
+        Attributes of people. Created from people if not provided.
+    """
+
+    def __init__(self, people: list[Person], table: PeopleTable | None = None) -> None:
+        if table is None:
+            table = PeopleTable(people)
+        self.positions = table.positions
+
+        # people preferred by each person and people preferring each person
+        self.preferred: list[set[int]] = [set() for _ in people]
+        self.admirers: list[set[int]] = [set() for _ in people]
+
+        # preferred people missing from people are kept by index
+        self.missing: list[set[str]] = [
+            set(table.missing.get(i, set())) for i in range(len(people))
+        ]
+
+        for i in range(len(people)):
+            for j in table.preferred(i):
+                self.preferred[i].add(j)
+                self.admirers[j].add(i)
+
+    def degree(self, position: int) -> int:
+        """Number of unique people preferred by a person by their position."""
+        return len(self.preferred[position]) + len(self.missing[position])
+
+    def is_preferred(self, position: int, friend_position: int) -> bool:
+        """Determines if a person prefers a friend by their positions."""
+        return friend_position in self.preferred[position]
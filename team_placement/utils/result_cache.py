@@ -0,0 +1,115 @@
+# native imports
+from collections import OrderedDict
+import hashlib
+import json
+
+# external imports
+from team_placement.constants import RESULT_CACHE_SIZE
+from team_placement.schemas import Control, Person, Team
+
+# cohort, team and banned people of each person by index
+Placement = dict[str, tuple[str, str, list[str]]]
+
+# person fields replaced before team placement or unused by it
+IGNORED_FIELDS = {"cohort", "room"}
+
+
+def request_key(
+    people: list[Person],
+    controls: list[Control],
+    teams: list[Team],
+    options: dict[str, object],
+) -> str:
+    """
+    Canonical hash of a request to place people on teams.
+    Requests with equal people, controls, teams and options share a hash
+    regardless of how they were serialized.
+
+    Parameters
+    ----------
+    people
+        People to assign to teams as requested.
+    controls
+        Controls by the user to guide people assignment.
+    teams
+        Teams for people assignment.
+    options
+        Options changing how people are placed.
+
+    Returns
+    -------
+    str
+        Hash of the request.
+    """
+    request = {
+        "people": [x.model_dump(mode="json", exclude=IGNORED_FIELDS) for x in people],
+        "controls": [x.model_dump(mode="json") for x in controls],
+        "teams": [x.name for x in teams],
+        "options": options,
+    }
+    text = json.dumps(request, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+class ResultCache:
+    """
+    Placements of people from recent requests with least recently used placements
+    evicted first.
+
+    Parameters
+    ----------
+    size
+        Most placements kept.
+    """
+
+    def __init__(self, size: int = RESULT_CACHE_SIZE) -> None:
+        self.size = size
+        self.placements: OrderedDict[str, Placement] = OrderedDict()
+
+    def __len__(self) -> int:
+        """Number of placements kept."""
+        return len(self.placements)
+
+    def get(self, key: str, people: list[Person]) -> bool:
+        """
+        Writes the placement of a request to people if it is kept.
+
+        Parameters
+        ----------
+        key
+            Hash of a request.
+        people
+            People prepared for team placement from the request.
+
+        Returns
+        -------
+        bool
+            Flag for a placement written to people.
+        """
+        placement = self.placements.get(key)
+        if placement is None:
+            return False
+
+        self.placements.move_to_end(key)
+        for person in people:
+            person.cohort, person.team, banned_people = placement[person.index]
+            person.banned_people = list(banned_people)
+        return True
+
+    def put(self, key: str, people: list[Person]) -> None:
+        """
+        Keeps the placement of people from a request.
+
+        Parameters
+        ----------
+        key
+            Hash of a request.
+        people
+            People placed on teams.
+        """
+        self.placements[key] = {
+            x.index: (x.cohort, x.team, list(x.banned_people)) for x in people
+        }
+        self.placements.move_to_end(key)
+        while len(self.placements) > self.size:
+            self.placements.popitem(last=False)
@@ -0,0 +1,111 @@
+# native imports
+from enum import Enum
+from heapq import heappop, heappush
+
+# external imports
+from team_placement.schemas import Person
+from team_placement.utils.cohorts import Cohorts
+
+
+class Dependency(str, Enum):
+    local = "local"
+    leaders = "leaders"
+    overall = "overall"
+
+
+class Schedule:
+    """
+    Priority queue of people whose candidates may have changed.
+    People are popped in order and parked until cohorts they depend on change.
+    Local dependencies are the cohorts of a person and their preferred people.
+
+    Parameters
+    ----------
+    cohorts
+        Cohorts of all people to place on teams.
+    people
+        People to evaluate first.
+    """
+
+    def __init__(self, cohorts: Cohorts, people: list[Person]) -> None:
+        self.cohorts = cohorts
+        self.pending: list[tuple[int, int]] = []
+        self.queued: set[int] = set()
+        self.parked: dict[Dependency, set[int]] = {
+            Dependency.leaders: set(),
+            Dependency.overall: set(),
+        }
+        self.offset = cohorts.version
+        for person in people:
+            self.push(cohorts.positions[person.index])
+
+    def push(self, position: int) -> None:
+        """Queues a person by their position if not already queued."""
+        if position not in self.queued:
+            self.queued.add(position)
+            heappush(self.pending, (self.cohorts.table.orders[position], position))
+
+    def pop(self) -> Person | None:
+        """
+        Pops the next person in order.
+
+        Returns
+        -------
+        Person | None
+            Next person to evaluate otherwise None when nothing is pending.
+        """
+        if len(self.pending) == 0:
+            return None
+
+        _, position = heappop(self.pending)
+        self.queued.discard(position)
+        for parked in self.parked.values():
+            parked.discard(position)
+        return self.cohorts.people[position]
+
+    def park(self, person: Person, dependency: Dependency) -> None:
+        """
+        Parks a person until a cohort they depend on changes.
+
+        Parameters
+        ----------
+        person
+            A person without an action.
+        dependency
+            Cohorts the outcome for the person depends on.
+        """
+        if dependency != Dependency.local:
+            self.parked[dependency].add(self.cohorts.positions[person.index])
+
+    def refresh(self) -> set[int]:
+        """
+        Queues people affected by cohorts changed since the last refresh.
+
+        Returns
+        -------
+        set[int]
+            Positions of people in changed cohorts and people preferring them.
+        """
+        cohorts = self.cohorts
+        changes = cohorts.changed[self.offset :]
+        self.offset = cohorts.version
+        if len(changes) == 0:
+            return set()
+
+        # people in changed cohorts and people preferring anyone in them
+        roots = set([cohorts.find(x) for x in changes])
+        affected: set[int] = set()
+        for root in roots:
+            for i in cohorts.members[root]:
+                affected.add(i)
+                affected.update(cohorts.graph.admirers[i])
+        requeue = set(affected)
+
+        # leader cohorts are screened by anyone who could join a team
+        if any([cohorts.teams[root] != "" for root in roots]):
+            requeue.update(self.parked[Dependency.leaders])
+        requeue.update(self.parked[Dependency.overall])
+
+        for i in requeue:
+            self.push(i)
+        return affected
@@ -0,0 +1,145 @@
+# native imports
+from math import sqrt
+
+# external imports
+from team_placement.constants import PRIORITIES
+from team_placement.schemas import Person, Targets, Team
+from team_placement.utils.cohort_metrics import (
+    AGE_SQUARES,
+    AGE_SUM,
+    PRIORITY_COLUMNS,
+    ROW_SIZE,
+    TEAM_SIZE,
+    CohortMetrics,
+)
+from team_placement.utils.people_table import PeopleTable
+from team_placement.utils.preference_graph import PreferenceGraph
+
+# priorities are weighted in order of importance
+PRIORITY_WEIGHTS = {
+    priority: float(len(PRIORITIES) - j) for j, priority in enumerate(PRIORITIES)
+}
+
+# cost of a first time person without any preferred people on their team
+PREFERENCE_COST = float(len(PRIORITIES))
+
+# cost of a person left without a team
+UNPLACED_COST = 10 * PREFERENCE_COST
+
+
+def float_stdev(count: int, total: int, squares: int) -> float:
+    """
+    Sample standard deviation from running moments with floats.
+    Cheaper than the exact standard deviation when only scoring teams.
+
+    Parameters
+    ----------
+    count
+        Number of values.
+    total
+        Sum of values.
+    squares
+        Sum of squared values.
+
+    Returns
+    -------
+    float
+        Sample standard deviation otherwise 0 for fewer than 2 values.
+    """
+    if count < 2:
+        return 0.0
+    variance = (squares - total * total / count) / (count - 1)
+    return sqrt(variance) if variance > 0 else 0.0
+
+
+def team_cost(row: list[int], targets: Targets) -> float:
+    """
+    Weighted distance of a team from targets.
+
+    Parameters
+    ----------
+    row
+        Counts and age moments of everyone on a team.
+    targets
+        Targets for each team.
+
+    Returns
+    -------
+    float
+        Cost of the team where 0 meets every target exactly.
+    """
+    cost = 0.0
+    for priority, j in PRIORITY_COLUMNS.items():
+        cost += PRIORITY_WEIGHTS[priority] * abs(row[j] - getattr(targets, priority))
+
+    age_std = float_stdev(row[TEAM_SIZE], row[AGE_SUM], row[AGE_SQUARES])
+    cost += PRIORITY_WEIGHTS["age_std"] * abs(age_std - targets.age_std)
+    return cost
+
+
+def unmet_people(table: PeopleTable, graph: PreferenceGraph, teams: list[int]) -> int:
+    """
+    Counts first time people without any preferred people on their team.
+
+    Parameters
+    ----------
+    table
+        Attributes of all people placed on teams.
+    graph
+        Preferences between people.
+    teams
+        Team of each person by position with -1 for people without a team.
+
+    Returns
+    -------
+    int
+        Number of first time people without any preferred people on their team.
+    """
+    unmet = 0
+    for i, team in enumerate(teams):
+        if not table.first_times[i] or len(graph.preferred[i]) == 0:
+            continue
+        if team == -1 or all([teams[j] != team for j in graph.preferred[i]]):
+            unmet += 1
+    return unmet
+
+
+def score_people(people: list[Person], teams: list[Team], targets: Targets) -> float:
+    """
+    Scores people placed on teams against targets and preferences.
+    Lower scores are better and every placement is scored the same way.
+    Every team is scored including teams without people.
+
+    Parameters
+    ----------
+    people
+        People with teams assigned.
+    teams
+        Teams for people assignment.
+        People on other teams are scored as people without a team.
+    targets
+        Targets for each team.
+
+    Returns
+    -------
+    float
+        Cost of the placement of people on teams.
+    """
+    table = PeopleTable(people)
+    graph = PreferenceGraph(people, table)
+
+    # people are numbered by team with -1 for people without a team
+    numbers = {x.name: t for t, x in enumerate(teams)}
+    team_numbers = [numbers.get(x.team, -1) for x in people]
+
+    rows = [[0] * ROW_SIZE for _ in teams]
+    for i, team in enumerate(team_numbers):
+        if team == -1:
+            continue
+        for j, value in enumerate(CohortMetrics.person_row(table, i)):
+            rows[team][j] += value
+
+    cost = sum([team_cost(row, targets) for row in rows])
+    cost += PREFERENCE_COST * unmet_people(table, graph, team_numbers)
+    cost += UNPLACED_COST * team_numbers.count(-1)
+    return cost
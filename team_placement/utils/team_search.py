@@ -0,0 +1,338 @@
+# external imports
+from team_placement.schemas import Person, Targets, Team
+from team_placement.utils.cohort_metrics import ROW_SIZE
+from team_placement.utils.cohorts import Cohorts, bits
+from team_placement.utils.team_score import (
+    PREFERENCE_COST,
+    UNPLACED_COST,
+    team_cost,
+)
+
+
+class TeamSearch:
+    """
+    Running metrics of units of people on teams for local search.
+    Units are cohorts kept together and are collected before cohorts join teams.
+    Units with teams when collected stay on their team.
+    Costs of moves come from running counts and age moments of each team.
+
+    Parameters
+    ----------
+    cohorts
+        Cohorts of all people before cohorts join teams.
+    targets
+        Targets for each team.
+    teams
+        Teams people are placed on.
+    """
+
+    def __init__(self, cohorts: Cohorts, targets: Targets, teams: list[Team]) -> None:
+        self.cohorts = cohorts
+        self.targets = targets
+        self.team_names = [x.name for x in teams]
+
+        # units by the order of their first person
+        roots = sorted(cohorts.members, key=lambda x: cohorts.firsts[x])
+        self.units = [list(cohorts.members[root]) for root in roots]
+        self.masks = [cohorts.masks[root] for root in roots]
+        self.rows = [list(cohorts.metrics.rows[root]) for root in roots]
+        self.banned = [cohorts.banned[root] for root in roots]
+        self.banned_missing = [set(cohorts.banned_missing[root]) for root in roots]
+        self.names = [cohorts.name(root) for root in roots]
+        self.movable = [cohorts.teams[root] == "" for root in roots]
+
+        # units cannot share a team with people they ban or who ban them
+        unit_of = [0] * len(cohorts.people)
+        for u, members in enumerate(self.units):
+            for i in members:
+                unit_of[i] = u
+        self.conflicts = list(self.banned)
+        for u, banned in enumerate(self.banned):
+            for i in bits(banned):
+                self.conflicts[unit_of[i]] |= self.masks[u]
+
+        # first time people with preferences count towards unmet preferences
+        table = cohorts.table
+        self.tracked = [
+            bool(table.first_times[i]) and len(cohorts.graph.preferred[i]) > 0
+            for i in range(len(table))
+        ]
+        # units are placed on teams once teams are completed
+        self.teams = [-1 for _ in self.units]
+        self.team_cohorts = ["" for _ in self.team_names]
+        self.team_of = [-1] * len(table)
+        self.team_rows = [[0] * ROW_SIZE for _ in self.team_names]
+        self.team_masks = [0 for _ in self.team_names]
+        self.costs = [0.0 for _ in self.team_names]
+        self.unmet = 0
+        self.unplaced = 0
+
+    def place(self, cohorts: Cohorts) -> None:
+        """
+        Places units on the teams of their people once teams are completed.
+
+        Parameters
+        ----------
+        cohorts
+            Cohorts of all people after teams are completed.
+        """
+        numbers = {name: t for t, name in enumerate(self.team_names)}
+        self.reset(
+            [
+                numbers.get(cohorts.teams[cohorts.find(members[0])], -1)
+                for members in self.units
+            ]
+        )
+
+        # names of completed cohorts on each team
+        self.team_cohorts = ["" for _ in self.team_names]
+        for members, team in zip(self.units, self.teams):
+            if team != -1 and self.team_cohorts[team] == "":
+                self.team_cohorts[team] = cohorts.name(cohorts.find(members[0]))
+
+    def reset(self, teams: list[int]) -> None:
+        """
+        Places units on teams and recalculates running metrics.
+        Teams are named after the first unit placed on them.
+
+        Parameters
+        ----------
+        teams
+            Team of each unit with -1 for units without a team.
+        """
+        self.teams = list(teams)
+        self.team_cohorts = ["" for _ in self.team_names]
+        self.team_rows = [[0] * ROW_SIZE for _ in self.team_names]
+        self.team_masks = [0 for _ in self.team_names]
+        self.unplaced = 0
+        for u, team in enumerate(self.teams):
+            for i in self.units[u]:
+                self.team_of[i] = team
+            if team == -1:
+                self.unplaced += len(self.units[u])
+                continue
+            if self.team_cohorts[team] == "":
+                self.team_cohorts[team] = self.names[u]
+            self.team_masks[team] |= self.masks[u]
+            for j, value in enumerate(self.rows[u]):
+                self.team_rows[team][j] += value
+
+        self.costs = [team_cost(row, self.targets) for row in self.team_rows]
+        self.unmet = len([i for i in range(len(self.team_of)) if self.is_unmet(i)])
+
+    def cost(self) -> float:
+        """Cost of the current placement matching the score of people."""
+        return (
+            sum(self.costs)
+            + PREFERENCE_COST * self.unmet
+            + UNPLACED_COST * self.unplaced
+        )
+
+    def is_unmet(self, position: int) -> bool:
+        """Determines if a first time person has no preferred people on their team."""
+        if not self.tracked[position]:
+            return False
+
+        team = self.team_of[position]
+        if team == -1:
+            return True
+        preferred = self.cohorts.graph.preferred[position]
+        return all([self.team_of[j] != team for j in preferred])
+
+    def can_join(self, unit: int, team: int, leaving: int | None = None) -> bool:
+        """
+        Determines if a unit may join a team without sharing it with banned people.
+
+        Parameters
+        ----------
+        unit
+            A unit.
+        team
+            A team the unit is not on.
+        leaving
+            A unit leaving the team at the same time.
+
+        Returns
+        -------
+        bool
+            Flag for a unit that may join the team.
+        """
+        mask = self.team_masks[team]
+        if leaving is not None:
+            mask &= ~self.masks[leaving]
+        return self.conflicts[unit] & mask == 0
+
+    def unmet_change(self, moves: list[tuple[int, int]]) -> int:
+        """
+        Change in unmet preferences from moving units to teams.
+
+        Parameters
+        ----------
+        moves
+            Units and the teams they move to.
+
+        Returns
+        -------
+        int
+            Change in the number of first time people with unmet preferences.
+        """
+        affected: set[int] = set()
+        for unit, _ in moves:
+            for i in self.units[unit]:
+                affected.add(i)
+                affected.update(self.cohorts.graph.admirers[i])
+        affected_people = [i for i in affected if self.tracked[i]]
+        if len(affected_people) == 0:
+            return 0
+
+        before = len([i for i in affected_people if self.is_unmet(i)])
+        previous = [(u, self.teams[u]) for u, _ in moves]
+        self.assign(moves)
+        after = len([i for i in affected_people if self.is_unmet(i)])
+        self.assign(previous)
+        return after - before
+
+    def assign(self, moves: list[tuple[int, int]]) -> None:
+        """Assigns the people of units to teams without updating metrics."""
+        for unit, team in moves:
+            self.teams[unit] = team
+            for i in self.units[unit]:
+                self.team_of[i] = team
+
+    def changed_cost(self, team: int, added: list[int], removed: list[int]) -> float:
+        """Cost of a team after units are added and removed."""
+        row = list(self.team_rows[team])
+        for u in added:
+            for j, value in enumerate(self.rows[u]):
+                row[j] += value
+        for u in removed:
+            for j, value in enumerate(self.rows[u]):
+                row[j] -= value
+        return team_cost(row, self.targets)
+
+    def move_delta(self, unit: int, team: int) -> float:
+        """
+        Change in cost from moving a unit to another team.
+
+        Parameters
+        ----------
+        unit
+            A movable unit.
+        team
+            A team the unit is not on.
+
+        Returns
+        -------
+        float
+            Change in the cost of the placement.
+        """
+        delta = self.changed_cost(team, [unit], []) - self.costs[team]
+        source = self.teams[unit]
+        if source == -1:
+            delta -= UNPLACED_COST * len(self.units[unit])
+        else:
+            delta += self.changed_cost(source, [], [unit]) - self.costs[source]
+        return delta + PREFERENCE_COST * self.unmet_change([(unit, team)])
+
+    def swap_delta(self, unit_1: int, unit_2: int) -> float:
+        """
+        Change in cost from swapping the teams of two units on different teams.
+
+        Parameters
+        ----------
+        unit_1
+            A movable unit on a team.
+        unit_2
+            A movable unit on another team.
+
+        Returns
+        -------
+        float
+            Change in the cost of the placement.
+        """
+        team_1 = self.teams[unit_1]
+        team_2 = self.teams[unit_2]
+        delta = (
+            self.changed_cost(team_1, [unit_2], [unit_1])
+            + self.changed_cost(team_2, [unit_1], [unit_2])
+            - self.costs[team_1]
+            - self.costs[team_2]
+        )
+        moves = [(unit_1, team_2), (unit_2, team_1)]
+        return delta + PREFERENCE_COST * self.unmet_change(moves)
+
+    def move(self, unit: int, team: int) -> None:
+        """Moves a unit to another team updating running metrics."""
+        self.unmet += self.unmet_change([(unit, team)])
+        source = self.teams[unit]
+        if source == -1:
+            self.unplaced -= len(self.units[unit])
+        else:
+            self.update(source, [], [unit])
+        self.update(team, [unit], [])
+        self.assign([(unit, team)])
+        if self.team_cohorts[team] == "":
+            self.team_cohorts[team] = self.names[unit]
+
+    def unplace(self, unit: int) -> None:
+        """Takes a unit off its team updating running metrics."""
+        self.unmet += self.unmet_change([(unit, -1)])
+        self.update(self.teams[unit], [], [unit])
+        self.assign([(unit, -1)])
+        self.unplaced += len(self.units[unit])
+
+    def swap(self, unit_1: int, unit_2: int) -> None:
+        """Swaps the teams of two units on different teams."""
+        team_1 = self.teams[unit_1]
+        team_2 = self.teams[unit_2]
+        moves = [(unit_1, team_2), (unit_2, team_1)]
+        self.unmet += self.unmet_change(moves)
+        self.update(team_1, [unit_2], [unit_1])
+        self.update(team_2, [unit_1], [unit_2])
+        self.assign(moves)
+
+    def update(self, team: int, added: list[int], removed: list[int]) -> None:
+        """Updates running metrics of a team as units are added and removed."""
+        row = self.team_rows[team]
+        for u in added:
+            self.team_masks[team] |= self.masks[u]
+            for j, value in enumerate(self.rows[u]):
+                row[j] += value
+        for u in removed:
+            self.team_masks[team] &= ~self.masks[u]
+            for j, value in enumerate(self.rows[u]):
+                row[j] -= value
+        self.costs[team] = team_cost(row, self.targets)
+
+    def write_back(self, changed: set[int]) -> list[Person]:
+        """
+        Writes teams, cohorts and banned people of changed teams to people.
+
+        Parameters
+        ----------
+        changed
+            Teams units moved to or from.
+
+        Returns
+        -------
+        list[Person]
+            People with updated teams.
+        """
+        people = self.cohorts.people
+        for team in changed:
+            units = [u for u, x in enumerate(self.teams) if x == team]
+            banned = 0
+            banned_missing: set[str] = set()
+            for u in units:
+                banned |= self.banned[u]
+                banned_missing |= self.banned_missing[u]
+            banned_people = sorted(
+                [people[i].index for i in bits(banned)] + list(banned_missing)
+            )
+
+            for u in units:
+                for i in self.units[u]:
+                    people[i].team = self.team_names[team]
+                    people[i].cohort = self.team_cohorts[team]
+                    people[i].banned_people = list(banned_people)
+        return people
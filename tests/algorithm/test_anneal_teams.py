@@ -0,0 +1,286 @@
+# native imports
+from copy import deepcopy
+from random import Random
+from unittest.mock import Mock
+
+# external imports
+from team_placement.algorithm.anneal_teams import anneal_people, is_accepted
+from team_placement.algorithm.define_targets import define_targets
+from team_placement.algorithm.prepare_people_for_teams import prepare_people_for_teams
+from team_placement.algorithm.run_teams import run_teams
+from team_placement.constants import ANNEAL_MOVES
+from team_placement.schemas import BooleanEnum, Collective, Engine, Gender, Person, Team
+
+TEAMS = [
+    Team(index="Team 1", name="Team A"),
+    Team(index="Team 2", name="Team B"),
+    Team(index="Team 3", name="Team C"),
+]
+
+# leaders on teams and pairs of new people every fourth person
+PEOPLE = [
+    Person(
+        index="Person 0",
+        order=0,
+        firstName="Jane",
+        lastName="Doe 0",
+        age=20,
+        gender=Gender.female,
+        firstTime=BooleanEnum.no,
+        collective=Collective.new,
+        leader=BooleanEnum.yes,
+        participant=BooleanEnum.yes,
+        team="Team A",
+    ),
+    Person(
+        index="Person 1",
+        order=1,
+        firstName="Jane",
+        lastName="Doe 1",
+        age=21,
+        gender=Gender.male,
+        firstTime=BooleanEnum.no,
+        collective=Collective.newish,
+        leader=BooleanEnum.yes,
+        participant=BooleanEnum.yes,
+        team="Team B",
+    ),
+    Person(
+        index="Person 2",
+        order=2,
+        firstName="Jane",
+        lastName="Doe 2",
+        age=22,
+        gender=Gender.male,
+        firstTime=BooleanEnum.no,
+        collective=Collective.oldish,
+        leader=BooleanEnum.yes,
+        participant=BooleanEnum.yes,
+        team="Team C",
+    ),
+    Person(
+        index="Person 3",
+        order=3,
+        firstName="Jane",
+        lastName="Doe 3",
+        age=23,
+        gender=Gender.female,
+        firstTime=BooleanEnum.yes,
+        collective=Collective.old,
+        leader=BooleanEnum.no,
+        participant=BooleanEnum.yes,
+    ),
+    Person(
+        index="Person 4",
+        order=4,
+        firstName="Jane",
+        lastName="Doe 4",
+        age=24,
+        gender=Gender.male,
+        firstTime=BooleanEnum.yes,
+        collective=Collective.new,
+        leader=BooleanEnum.no,
+        participant=BooleanEnum.yes,
+        preferredPeople=["Person 5"],
+    ),
+    Person(
+        index="Person 5",
+        order=5,
+        firstName="Jane",
+        lastName="Doe 5",
+        age=25,
+        gender=Gender.male,
+        firstTime=BooleanEnum.yes,
+        collective=Collective.newish,
+        leader=BooleanEnum.no,
+        participant=BooleanEnum.yes,
+    ),
+    Person(
+        index="Person 6",
+        order=6,
+        firstName="Jane",
+        lastName="Doe 6",
+        age=26,
+        gender=Gender.female,
+        firstTime=BooleanEnum.yes,
+        collective=Collective.oldish,
+        leader=BooleanEnum.no,
+        participant=BooleanEnum.yes,
+    ),
+    Person(
+        index="Person 7",
+        order=7,
+        firstName="Jane",
+        lastName="Doe 7",
+        age=20,
+        gender=Gender.male,
+        firstTime=BooleanEnum.yes,
+        collective=Collective.old,
+        leader=BooleanEnum.no,
+        participant=BooleanEnum.yes,
+    ),
+    Person(
+        index="Person 8",
+        order=8,
+        firstName="Jane",
+        lastName="Doe 8",
+        age=21,
+        gender=Gender.male,
+        firstTime=BooleanEnum.yes,
+        collective=Collective.new,
+        leader=BooleanEnum.no,
+        participant=BooleanEnum.yes,
+        preferredPeople=["Person 9"],
+    ),
+    Person(
+        index="Person 9",
+        order=9,
+        firstName="Jane",
+        lastName="Doe 9",
+        age=22,
+        gender=Gender.female,
+        firstTime=BooleanEnum.yes,
+        collective=Collective.newish,
+        leader=BooleanEnum.no,
+        participant=BooleanEnum.yes,
+    ),
+    Person(
+        index="Person 10",
+        order=10,
+        firstName="Jane",
+        lastName="Doe 10",
+        age=23,
+        gender=Gender.male,
+        firstTime=BooleanEnum.yes,
+        collective=Collective.oldish,
+        leader=BooleanEnum.no,
+        participant=BooleanEnum.yes,
+    ),
+    Person(
+        index="Person 11",
+        order=11,
+        firstName="Jane",
+        lastName="Doe 11",
+        age=24,
+        gender=Gender.male,
+        firstTime=BooleanEnum.yes,
+        collective=Collective.old,
+        leader=BooleanEnum.no,
+        participant=BooleanEnum.yes,
+    ),
+    Person(
+        index="Person 12",
+        order=12,
+        firstName="Jane",
+        lastName="Doe 12",
+        age=25,
+        gender=Gender.female,
+        firstTime=BooleanEnum.yes,
+        collective=Collective.new,
+        leader=BooleanEnum.no,
+        participant=BooleanEnum.yes,
+        preferredPeople=["Person 13"],
+    ),
+    Person(
+        index="Person 13",
+        order=13,
+        firstName="Jane",
+        lastName="Doe 13",
+        age=26,
+        gender=Gender.male,
+        firstTime=BooleanEnum.yes,
+        collective=Collective.newish,
+        leader=BooleanEnum.no,
+        participant=BooleanEnum.yes,
+    ),
+    Person(
+        index="Person 14",
+        order=14,
+        firstName="Jane",
+        lastName="Doe 14",
+        age=20,
+        gender=Gender.male,
+        firstTime=BooleanEnum.yes,
+        collective=Collective.oldish,
+        leader=BooleanEnum.no,
+        participant=BooleanEnum.yes,
+    ),
+    Person(
+        index="Person 15",
+        order=15,
+        firstName="Jane",
+        lastName="Doe 15",
+        age=21,
+        gender=Gender.female,
+        firstTime=BooleanEnum.yes,
+        collective=Collective.old,
+        leader=BooleanEnum.no,
+        participant=BooleanEnum.yes,
+    ),
+    Person(
+        index="Person 16",
+        order=16,
+        firstName="Jane",
+        lastName="Doe 16",
+        age=22,
+        gender=Gender.male,
+        firstTime=BooleanEnum.yes,
+        collective=Collective.new,
+        leader=BooleanEnum.no,
+        participant=BooleanEnum.yes,
+        preferredPeople=["Person 17"],
+    ),
+    Person(
+        index="Person 17",
+        order=17,
+        firstName="Jane",
+        lastName="Doe 17",
+        age=23,
+        gender=Gender.male,
+        firstTime=BooleanEnum.yes,
+        collective=Collective.newish,
+        leader=BooleanEnum.no,
+        participant=BooleanEnum.yes,
+    ),
+]
+
+
+def anneal(people: list[Person], seed: int) -> list[Person]:
+    """Anneals teams of people for a number of moves."""
+    people = prepare_people_for_teams(people)
+    targets = define_targets(people, TEAMS)
+    return anneal_people(people, [], TEAMS, targets, 10, seed, moves=2000)
+
+
+def test_anneal_people():
+    """Everyone is placed while leaders and cohorts stay together."""
+    people = anneal(deepcopy(PEOPLE), 0)
+    assert all([x.team != "" for x in people])
+    assert [x.team for x in people[:3]] == [x.name for x in TEAMS]
+    for i in range(4, 18, 4):
+        assert people[i].team == people[i + 1].team
+    assert len(set([x.cohort for x in people])) == len(TEAMS)
+
+
+def test_anneal_people_seed():
+    """Placements are reproducible for a seed and number of moves."""
+    teams = [x.team for x in anneal(deepcopy(PEOPLE), 1)]
+    assert teams == [x.team for x in anneal(deepcopy(PEOPLE), 1)]
+
+
+def test_is_accepted():
+    """Improvements are always accepted."""
+    rng = Random(0)
+    assert is_accepted(-1, 1e-9, rng)
+    assert is_accepted(0, 1e-9, rng)
+    assert not is_accepted(1, 1e-9, rng)
+
+
+def test_run_teams_anneal(monkeypatch):
+    """Annealing from run teams tries a number of moves from the seed."""
+    anneal_mock = Mock(side_effect=lambda people, *args, **kwargs: people)
+    monkeypatch.setattr("team_placement.algorithm.run_teams.anneal_people", anneal_mock)
+
+    run_teams(deepcopy(PEOPLE), [], TEAMS, seed=3, engine=Engine.anneal)
+    assert anneal_mock.call_args.kwargs["seed"] == 3
+    assert anneal_mock.call_args.kwargs["moves"] == ANNEAL_MOVES
@@ -0,0 +1,172 @@
+# native imports
+from copy import deepcopy
+from unittest.mock import Mock
+
+# third-party imports
+import pytest
+
+# external imports
+from team_placement.algorithm.balance_teams import add_count_arcs, balance_teams
+from team_placement.algorithm.run_teams import run_teams
+from team_placement.schemas import (
+    BooleanEnum,
+    Collective,
+    Completion,
+    Gender,
+    Person,
+    Targets,
+    Team,
+)
+from team_placement.utils.min_cost_flow import MinCostFlow
+
+TEAMS = [
+    Team(index="Team 1", name="Team A"),
+    Team(index="Team 2", name="Team B"),
+]
+
+# targets for teams of three with a new person, a newish person and a girl
+TARGETS = Targets(
+    team_size=3,
+    collective_new=1,
+    collective_newish=1,
+    collective_oldish=0,
+    collective_old=0,
+    age_std=0,
+    girl_count=1,
+)
+
+# a leader on each of two teams and four people without teams
+PEOPLE = [
+    Person(
+        index="Person 0",
+        order=0,
+        firstName="Jane",
+        lastName="Doe 0",
+        age=25,
+        gender=Gender.male,
+        firstTime=BooleanEnum.no,
+        collective=Collective.old,
+        leader=BooleanEnum.yes,
+        participant=BooleanEnum.yes,
+        team="Team A",
+        cohort="Cohort 0",
+    ),
+    Person(
+        index="Person 1",
+        order=1,
+        firstName="Jane",
+        lastName="Doe 1",
+        age=25,
+        gender=Gender.male,
+        firstTime=BooleanEnum.no,
+        collective=Collective.old,
+        leader=BooleanEnum.yes,
+        participant=BooleanEnum.yes,
+        team="Team B",
+        cohort="Cohort 1",
+    ),
+    Person(
+        index="Person 2",
+        order=2,
+        firstName="Jane",
+        lastName="Doe 2",
+        age=25,
+        gender=Gender.female,
+        firstTime=BooleanEnum.no,
+        collective=Collective.new,
+        leader=BooleanEnum.no,
+        participant=BooleanEnum.yes,
+        cohort="Cohort 2",
+    ),
+    Person(
+        index="Person 3",
+        order=3,
+        firstName="Jane",
+        lastName="Doe 3",
+        age=25,
+        gender=Gender.female,
+        firstTime=BooleanEnum.no,
+        collective=Collective.newish,
+        leader=BooleanEnum.no,
+        participant=BooleanEnum.yes,
+        cohort="Cohort 3",
+    ),
+    Person(
+        index="Person 4",
+        order=4,
+        firstName="Jane",
+        lastName="Doe 4",
+        age=25,
+        gender=Gender.male,
+        firstTime=BooleanEnum.no,
+        collective=Collective.new,
+        leader=BooleanEnum.no,
+        participant=BooleanEnum.yes,
+        cohort="Cohort 4",
+    ),
+    Person(
+        index="Person 5",
+        order=5,
+        firstName="Jane",
+        lastName="Doe 5",
+        age=25,
+        gender=Gender.male,
+        firstTime=BooleanEnum.no,
+        collective=Collective.newish,
+        leader=BooleanEnum.no,
+        participant=BooleanEnum.yes,
+        cohort="Cohort 5",
+    ),
+]
+
+
+def test_balance_teams():
+    """People fill teams evenly while meeting collective targets."""
+    people = balance_teams(deepcopy(PEOPLE), TARGETS, 2)
+    assert all([x.team != "" for x in people])
+    for team in ["Team A", "Team B"]:
+        members = [x for x in people if x.team == team]
+        assert len(members) == 3
+        assert len([x for x in members if x.collective == Collective.new]) == 1
+
+
+def test_balance_teams_banned():
+    """People never join teams with people they ban."""
+    people = deepcopy(PEOPLE)
+    people[2].banned_people = ["Person 0"]
+    people[4].banned_people = ["Person 0"]
+    people = balance_teams(people, TARGETS, 2)
+    assert people[2].team == "Team B"
+    assert people[4].team == "Team B"
+
+
+def test_balance_teams_cohorts():
+    """Cohorts of several people join a team whole."""
+    people = deepcopy(PEOPLE)
+    for person in people[2:4]:
+        person.cohort = "Cohort 2"
+    people = balance_teams(people, TARGETS, 2)
+    assert people[2].team == people[3].team != ""
+
+
+def test_add_count_arcs():
+    """Units below the target cost less than nothing and later units cost more."""
+    network = MinCostFlow(2)
+    add_count_arcs(network, 0, 1, 1, 2.5, 2, 4)
+    assert network.capacities[::2] == [1, 1, 2]
+    assert network.costs[::2] == [-2, 0, 2]
+
+
+@pytest.mark.parametrize(
+    "completion, passes",
+    [(Completion.greedy, 5), (Completion.flow, 1), (Completion.assignment, 1)],
+)
+def test_completion(monkeypatch, completion: Completion, passes: int):
+    """Balancing or filling teams replaces the greedy passes by collective."""
+    third_pass_mock = Mock(side_effect=lambda people, *args: people)
+    monkeypatch.setattr(
+        "team_placement.algorithm.run_teams.third_pass", third_pass_mock
+    )
+
+    run_teams(deepcopy(PEOPLE), [], TEAMS, completion=completion)
+    assert third_pass_mock.call_count == passes
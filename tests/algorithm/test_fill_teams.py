@@ -0,0 +1,123 @@
+# native imports
+from copy import deepcopy
+
+# external imports
+from team_placement.algorithm.fill_teams import fill_teams
+from team_placement.schemas import BooleanEnum, Collective, Gender, Person, Targets
+
+# targets for teams of three with a new person, a newish person and a girl
+TARGETS = Targets(
+    team_size=3,
+    collective_new=1,
+    collective_newish=1,
+    collective_oldish=0,
+    collective_old=0,
+    age_std=0,
+    girl_count=1,
+)
+
+# a leader on each of two teams and four people without teams
+PEOPLE = [
+    Person(
+        index="Person 0",
+        order=0,
+        firstName="Jane",
+        lastName="Doe 0",
+        age=25,
+        gender=Gender.male,
+        firstTime=BooleanEnum.no,
+        collective=Collective.old,
+        leader=BooleanEnum.yes,
+        participant=BooleanEnum.yes,
+        team="Team A",
+        cohort="Cohort 0",
+    ),
+    Person(
+        index="Person 1",
+        order=1,
+        firstName="Jane",
+        lastName="Doe 1",
+        age=25,
+        gender=Gender.male,
+        firstTime=BooleanEnum.no,
+        collective=Collective.old,
+        leader=BooleanEnum.yes,
+        participant=BooleanEnum.yes,
+        team="Team B",
+        cohort="Cohort 1",
+    ),
+    Person(
+        index="Person 2",
+        order=2,
+        firstName="Jane",
+        lastName="Doe 2",
+        age=25,
+        gender=Gender.female,
+        firstTime=BooleanEnum.no,
+        collective=Collective.new,
+        leader=BooleanEnum.no,
+        participant=BooleanEnum.yes,
+        cohort="Cohort 2",
+    ),
+    Person(
+        index="Person 3",
+        order=3,
+        firstName="Jane",
+        lastName="Doe 3",
+        age=25,
+        gender=Gender.female,
+        firstTime=BooleanEnum.no,
+        collective=Collective.newish,
+        leader=BooleanEnum.no,
+        participant=BooleanEnum.yes,
+        cohort="Cohort 3",
+    ),
+    Person(
+        index="Person 4",
+        order=4,
+        firstName="Jane",
+        lastName="Doe 4",
+        age=25,
+        gender=Gender.male,
+        firstTime=BooleanEnum.no,
+        collective=Collective.new,
+        leader=BooleanEnum.no,
+        participant=BooleanEnum.yes,
+        cohort="Cohort 4",
+    ),
+    Person(
+        index="Person 5",
+        order=5,
+        firstName="Jane",
+        lastName="Doe 5",
+        age=25,
+        gender=Gender.male,
+        firstTime=BooleanEnum.no,
+        collective=Collective.newish,
+        leader=BooleanEnum.no,
+        participant=BooleanEnum.yes,
+        cohort="Cohort 5",
+    ),
+]
+
+
+def test_fill_teams():
+    """Teams take one cohort a round and meet demographic targets."""
+    people = fill_teams(deepcopy(PEOPLE), TARGETS, 2)
+    assert all([x.team != "" for x in people])
+    for team in ["Team A", "Team B"]:
+        members = [x for x in people if x.team == team]
+        assert len(members) == 3
+        assert len([x for x in members if x.gender == Gender.female]) == 1
+        assert len([x for x in members if x.collective == Collective.new]) == 1
+
+
+def test_fill_teams_banned():
+    """Cohorts never join teams with people they ban."""
+    people = deepcopy(PEOPLE)
+    people[2].banned_people = ["Person 0"]
+    people[3].banned_people = ["Person 0"]
+    people = fill_teams(people, TARGETS, 2)
+    assert people[2].team == "Team B"
+    assert people[3].team == "Team B"
+    assert all([x.team != "" for x in people])
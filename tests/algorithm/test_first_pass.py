@@ -119,3 +119,26 @@ def test_leader_conflict(people_leader_conflict: list[Person]):
     assert len(list(set([x.cohort for x in people]))) == 2
     assert len([x for x in people if x.team == "Team A"]) == 1
     assert len([x for x in people if x.team == "Team B"]) == 2
+
+
+def test_long_chain():
+    """Tests that a long chain of preferences collapses without recursion."""
+    people = [
+        Person(
+            index=f"Person {i}",
+            order=i,
+            firstName="John",
+            lastName=f"Doe {i}",
+            age=25,
+            gender=Gender.male,
+            firstTime=BooleanEnum.yes,
+            collective=Collective.new,
+            leader=BooleanEnum.no,
+            participant=BooleanEnum.yes,
+            preferredPeople=[f"Person {i + 1}"] if i < 1999 else [],
+            cohort=f"Cohort {i}",
+        )
+        for i in range(2000)
+    ]
+    people = first_pass(people)
+    assert len(list(set([x.cohort for x in people]))) == 1
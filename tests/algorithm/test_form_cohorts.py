@@ -0,0 +1,153 @@
+# native imports
+from copy import deepcopy
+from unittest.mock import Mock
+
+# external imports
+from team_placement.algorithm.form_cohorts import form_cohorts
+from team_placement.algorithm.prepare_people_for_teams import prepare_people_for_teams
+from team_placement.schemas import BooleanEnum, Collective, Gender, Person, Team
+from team_placement.utils.result_cache import ResultCache
+
+TEAMS = [
+    Team(index="Team 1", name="Team A"),
+    Team(index="Team 2", name="Team B"),
+]
+
+# a leader on each team and new people preferring the next person
+PEOPLE = [
+    Person(
+        index="Person 0",
+        order=0,
+        firstName="Jane",
+        lastName="Doe 0",
+        age=20,
+        gender=Gender.female,
+        firstTime=BooleanEnum.no,
+        collective=Collective.new,
+        leader=BooleanEnum.yes,
+        participant=BooleanEnum.yes,
+        team="Team A",
+    ),
+    Person(
+        index="Person 1",
+        order=1,
+        firstName="Jane",
+        lastName="Doe 1",
+        age=21,
+        gender=Gender.male,
+        firstTime=BooleanEnum.no,
+        collective=Collective.newish,
+        leader=BooleanEnum.yes,
+        participant=BooleanEnum.yes,
+        team="Team B",
+    ),
+    Person(
+        index="Person 2",
+        order=2,
+        firstName="Jane",
+        lastName="Doe 2",
+        age=22,
+        gender=Gender.male,
+        firstTime=BooleanEnum.yes,
+        collective=Collective.oldish,
+        leader=BooleanEnum.no,
+        participant=BooleanEnum.yes,
+        preferredPeople=["Person 3"],
+    ),
+    Person(
+        index="Person 3",
+        order=3,
+        firstName="Jane",
+        lastName="Doe 3",
+        age=23,
+        gender=Gender.female,
+        firstTime=BooleanEnum.yes,
+        collective=Collective.old,
+        leader=BooleanEnum.no,
+        participant=BooleanEnum.yes,
+        preferredPeople=["Person 4"],
+    ),
+    Person(
+        index="Person 4",
+        order=4,
+        firstName="Jane",
+        lastName="Doe 4",
+        age=24,
+        gender=Gender.male,
+        firstTime=BooleanEnum.yes,
+        collective=Collective.new,
+        leader=BooleanEnum.no,
+        participant=BooleanEnum.yes,
+        preferredPeople=["Person 5"],
+    ),
+    Person(
+        index="Person 5",
+        order=5,
+        firstName="Jane",
+        lastName="Doe 5",
+        age=25,
+        gender=Gender.male,
+        firstTime=BooleanEnum.yes,
+        collective=Collective.newish,
+        leader=BooleanEnum.no,
+        participant=BooleanEnum.yes,
+        preferredPeople=["Person 6"],
+    ),
+    Person(
+        index="Person 6",
+        order=6,
+        firstName="Jane",
+        lastName="Doe 6",
+        age=26,
+        gender=Gender.female,
+        firstTime=BooleanEnum.yes,
+        collective=Collective.oldish,
+        leader=BooleanEnum.no,
+        participant=BooleanEnum.yes,
+        preferredPeople=["Person 7"],
+    ),
+    Person(
+        index="Person 7",
+        order=7,
+        firstName="Jane",
+        lastName="Doe 7",
+        age=20,
+        gender=Gender.male,
+        firstTime=BooleanEnum.yes,
+        collective=Collective.old,
+        leader=BooleanEnum.no,
+        participant=BooleanEnum.yes,
+        preferredPeople=["Person 8"],
+    ),
+]
+
+
+def test_form_cohorts():
+    """People preferring one person join their cohort and leaders their teams."""
+    cohorts = form_cohorts(prepare_people_for_teams(deepcopy(PEOPLE)), TEAMS)
+    people = cohorts.write_back()
+    assert [x.cohort for x in people[:2]] == ["Team A", "Team B"]
+    assert len(set([x.cohort for x in people[2:]])) == 1
+
+
+def test_form_cohorts_checkpoint(monkeypatch):
+    """Equal people and teams resume from the checkpoint of the first pass."""
+    checkpoints = ResultCache()
+    formed = form_cohorts(
+        prepare_people_for_teams(deepcopy(PEOPLE)), TEAMS, checkpoints
+    ).write_back()
+    assert len(checkpoints) == 1
+
+    first_pass_mock = Mock()
+    monkeypatch.setattr(
+        "team_placement.algorithm.form_cohorts.first_pass", first_pass_mock
+    )
+    resumed = form_cohorts(
+        prepare_people_for_teams(deepcopy(PEOPLE)), TEAMS, checkpoints
+    ).write_back()
+    assert first_pass_mock.call_count == 0
+    assert [(x.cohort, x.team) for x in resumed] == [(x.cohort, x.team) for x in formed]
+
+    # other teams form cohorts again
+    form_cohorts(prepare_people_for_teams(deepcopy(PEOPLE)), TEAMS[:1], checkpoints)
+    assert first_pass_mock.call_count == 1
@@ -0,0 +1,148 @@
+# native imports
+from copy import deepcopy
+
+# external imports
+from team_placement.algorithm.improve_teams import improve_teams
+from team_placement.schemas import (
+    BooleanEnum,
+    Collective,
+    Gender,
+    Person,
+    Targets,
+    Team,
+)
+from team_placement.utils.cohorts import Cohorts
+from team_placement.utils.team_score import score_people
+from team_placement.utils.team_search import TeamSearch
+
+TEAMS = [
+    Team(index="Team 1", name="Team A"),
+    Team(index="Team 2", name="Team B"),
+]
+
+TARGETS = Targets(
+    team_size=2,
+    collective_new=1,
+    collective_newish=1,
+    collective_oldish=0,
+    collective_old=0,
+    age_std=0,
+    girl_count=1,
+)
+
+# a male leader per team and a girl and a boy without teams
+PEOPLE = [
+    Person(
+        index="Person 0",
+        order=0,
+        firstName="Jane",
+        lastName="Doe 0",
+        age=25,
+        gender=Gender.male,
+        firstTime=BooleanEnum.no,
+        collective=Collective.newish,
+        leader=BooleanEnum.yes,
+        participant=BooleanEnum.yes,
+        team="Team A",
+        cohort="Cohort 0",
+    ),
+    Person(
+        index="Person 1",
+        order=1,
+        firstName="Jane",
+        lastName="Doe 1",
+        age=25,
+        gender=Gender.male,
+        firstTime=BooleanEnum.no,
+        collective=Collective.newish,
+        leader=BooleanEnum.yes,
+        participant=BooleanEnum.yes,
+        team="Team B",
+        cohort="Cohort 1",
+    ),
+    Person(
+        index="Person 2",
+        order=2,
+        firstName="Jane",
+        lastName="Doe 2",
+        age=25,
+        gender=Gender.female,
+        firstTime=BooleanEnum.no,
+        collective=Collective.new,
+        leader=BooleanEnum.no,
+        participant=BooleanEnum.yes,
+        cohort="Cohort 2",
+    ),
+    Person(
+        index="Person 3",
+        order=3,
+        firstName="Jane",
+        lastName="Doe 3",
+        age=25,
+        gender=Gender.male,
+        firstTime=BooleanEnum.no,
+        collective=Collective.new,
+        leader=BooleanEnum.no,
+        participant=BooleanEnum.yes,
+        cohort="Cohort 3",
+    ),
+]
+
+
+def test_improve_teams():
+    """Cohorts move to balance teams and the cost matches the score."""
+    people = deepcopy(PEOPLE)
+    cohorts = Cohorts(people)
+    search = TeamSearch(cohorts, TARGETS, TEAMS)
+
+    # both new people join the first team
+    cohorts.join(people[0], people[2])
+    cohorts.join(people[0], people[3])
+    cohorts.write_back()
+    before = score_people(people, TEAMS, TARGETS)
+
+    people = improve_teams(search, cohorts)
+    assert people[0].team != people[1].team
+    assert people[2].team != people[3].team
+    assert len([x for x in people if x.team == "Team A"]) == 2
+    assert score_people(people, TEAMS, TARGETS) < before
+    assert search.cost() == score_people(people, TEAMS, TARGETS)
+
+
+def test_improve_teams_banned():
+    """Cohorts never move onto a team with people banning them."""
+    people = deepcopy(PEOPLE)
+    cohorts = Cohorts(people)
+    cohorts.ban(people[1], people[3].index)
+    cohorts.ban(people[3], people[1].index)
+    search = TeamSearch(cohorts, TARGETS, TEAMS)
+
+    cohorts.join(people[0], people[2])
+    cohorts.join(people[0], people[3])
+    cohorts.write_back()
+
+    people = improve_teams(search, cohorts)
+    assert people[3].team == "Team A"
+    assert people[2].team == "Team B"
+    assert "Person 1" in people[3].banned_people
+
+
+def test_improve_teams_swap():
+    """Cohorts swap teams when moving either cohort alone raises the cost."""
+    people = deepcopy(PEOPLE)
+    people[0].gender = Gender.female
+    cohorts = Cohorts(people)
+    search = TeamSearch(cohorts, TARGETS, TEAMS)
+
+    # both girls are on the first team
+    cohorts.join(people[0], people[2])
+    cohorts.join(people[1], people[3])
+    cohorts.write_back()
+    search.place(cohorts)
+    for unit in [2, 3]:
+        assert search.move_delta(unit, 1 - search.teams[unit]) > 0
+
+    people = improve_teams(search, cohorts)
+    assert people[2].team == "Team B"
+    assert people[3].team == "Team A"
+    assert search.cost() == 0
@@ -0,0 +1,255 @@
+# native imports
+from copy import deepcopy
+from multiprocessing import active_children, parent_process
+import time
+
+# external imports
+from team_placement.algorithm.define_targets import define_targets
+from team_placement.algorithm.multi_start import (
+    multi_start,
+    place_start,
+    shuffle_people,
+)
+from team_placement.algorithm.prepare_people_for_teams import prepare_people_for_teams
+from team_placement.algorithm.run_teams import place_people
+from team_placement.schemas import (
+    BooleanEnum,
+    Collective,
+    Control,
+    Gender,
+    Person,
+    PlacementReport,
+    Targets,
+    Team,
+)
+from team_placement.utils.team_score import score_people
+
+TEAMS = [
+    Team(index="Team 1", name="Team A"),
+    Team(index="Team 2", name="Team B"),
+]
+
+# leaders on teams and people whose order of placement changes their teams
+PEOPLE = [
+    Person(
+        index="Person 0",
+        order=1,
+        firstName="Jane",
+        lastName="Doe 0",
+        age=28,
+        gender=Gender.female,
+        firstTime=BooleanEnum.yes,
+        collective=Collective.oldish,
+        leader=BooleanEnum.yes,
+        participant=BooleanEnum.yes,
+        team="Team A",
+        preferredPeople=["Person 6", "Person 4"],
+    ),
+    Person(
+        index="Person 1",
+        order=2,
+        firstName="Jane",
+        lastName="Doe 1",
+        age=31,
+        gender=Gender.female,
+        firstTime=BooleanEnum.yes,
+        collective=Collective.newish,
+        leader=BooleanEnum.yes,
+        participant=BooleanEnum.yes,
+        team="Team A",
+    ),
+    Person(
+        index="Person 2",
+        order=3,
+        firstName="Jane",
+        lastName="Doe 2",
+        age=24,
+        gender=Gender.male,
+        firstTime=BooleanEnum.no,
+        collective=Collective.new,
+        leader=BooleanEnum.yes,
+        participant=BooleanEnum.yes,
+        team="Team B",
+        preferredPeople=["Person 7"],
+    ),
+    Person(
+        index="Person 3",
+        order=4,
+        firstName="Jane",
+        lastName="Doe 3",
+        age=33,
+        gender=Gender.male,
+        firstTime=BooleanEnum.no,
+        collective=Collective.old,
+        leader=BooleanEnum.yes,
+        participant=BooleanEnum.yes,
+        team="Team B",
+        preferredPeople=["Person 8"],
+    ),
+    Person(
+        index="Person 4",
+        order=5,
+        firstName="Jane",
+        lastName="Doe 4",
+        age=31,
+        gender=Gender.female,
+        firstTime=BooleanEnum.no,
+        collective=Collective.new,
+        leader=BooleanEnum.no,
+        participant=BooleanEnum.yes,
+        preferredPeople=["Person 0", "Person 1", "Person 6"],
+    ),
+    Person(
+        index="Person 5",
+        order=6,
+        firstName="Jane",
+        lastName="Doe 5",
+        age=16,
+        gender=Gender.female,
+        firstTime=BooleanEnum.no,
+        collective=Collective.newish,
+        leader=BooleanEnum.no,
+        participant=BooleanEnum.yes,
+    ),
+    Person(
+        index="Person 6",
+        order=7,
+        firstName="Jane",
+        lastName="Doe 6",
+        age=22,
+        gender=Gender.male,
+        firstTime=BooleanEnum.yes,
+        collective=Collective.newish,
+        leader=BooleanEnum.no,
+        participant=BooleanEnum.yes,
+        preferredPeople=["Person 1", "Person 11"],
+    ),
+    Person(
+        index="Person 7",
+        order=8,
+        firstName="Jane",
+        lastName="Doe 7",
+        age=26,
+        gender=Gender.female,
+        firstTime=BooleanEnum.yes,
+        collective=Collective.oldish,
+        leader=BooleanEnum.no,
+        participant=BooleanEnum.yes,
+    ),
+    Person(
+        index="Person 8",
+        order=9,
+        firstName="Jane",
+        lastName="Doe 8",
+        age=33,
+        gender=Gender.female,
+        firstTime=BooleanEnum.yes,
+        collective=Collective.oldish,
+        leader=BooleanEnum.no,
+        participant=BooleanEnum.yes,
+        preferredPeople=["Person 6", "Person 5", "Person 9"],
+    ),
+    Person(
+        index="Person 9",
+        order=10,
+        firstName="Jane",
+        lastName="Doe 9",
+        age=23,
+        gender=Gender.female,
+        firstTime=BooleanEnum.yes,
+        collective=Collective.newish,
+        leader=BooleanEnum.no,
+        participant=BooleanEnum.yes,
+    ),
+    Person(
+        index="Person 10",
+        order=11,
+        firstName="Jane",
+        lastName="Doe 10",
+        age=24,
+        gender=Gender.female,
+        firstTime=BooleanEnum.yes,
+        collective=Collective.new,
+        leader=BooleanEnum.no,
+        participant=BooleanEnum.yes,
+        preferredPeople=["Person 2"],
+    ),
+    Person(
+        index="Person 11",
+        order=12,
+        firstName="Jane",
+        lastName="Doe 11",
+        age=17,
+        gender=Gender.male,
+        firstTime=BooleanEnum.no,
+        collective=Collective.oldish,
+        leader=BooleanEnum.no,
+        participant=BooleanEnum.yes,
+        preferredPeople=["Person 3"],
+    ),
+]
+
+
+def slow_place(
+    people: list[Person],
+    controls: list[Control],
+    teams: list[Team],
+    targets: Targets,
+    report: PlacementReport | None = None,
+) -> list[Person]:
+    """Places people in this process and outlasts any time budget elsewhere."""
+    if parent_process() is not None:
+        time.sleep(60)
+    return place_people(people, controls, teams, targets, report=report)
+
+
+def test_shuffle_people():
+    """Copies of people are shuffled and keep the same orders."""
+    people = deepcopy(PEOPLE)
+    shuffled = shuffle_people(people, 1)
+    assert [x.order for x in shuffled] == [x.order for x in people]
+    assert sorted([x.index for x in shuffled]) == sorted([x.index for x in people])
+    assert [x.index for x in shuffled] != [x.index for x in people]
+    assert all([x is not y for x, y in zip(shuffled, people)])
+
+
+def test_multi_start():
+    """The lowest scoring order is written back and the same seed repeats it."""
+    people = prepare_people_for_teams(deepcopy(PEOPLE))
+    targets = define_targets(people, TEAMS)
+
+    # score every order one at a time with the given order first
+    placed = place_people(deepcopy(people), [], TEAMS, targets)
+    scores = [score_people(placed, TEAMS, targets)]
+    for k in range(1, 4):
+        score, _, _ = place_start(place_people, people, [], TEAMS, targets, k)
+        scores.append(score)
+    assert min(scores) < scores[0]
+
+    report = PlacementReport()
+    placed = multi_start(place_people, people, [], TEAMS, targets, 4, 2, report=report)
+    assert placed is people
+    assert not report.timed_out
+    assert all([x.team != "" for x in people])
+    assert score_people(people, TEAMS, targets) == min(scores)
+
+    repeated = prepare_people_for_teams(deepcopy(PEOPLE))
+    multi_start(place_people, repeated, [], TEAMS, targets, 4, 2)
+    assert [x.team for x in repeated] == [x.team for x in people]
+
+
+def test_multi_start_time_budget():
+    """Orders still being placed after the time budget are stopped."""
+    people = prepare_people_for_teams(deepcopy(PEOPLE))
+    targets = define_targets(people, TEAMS)
+    single = place_people(deepcopy(people), [], TEAMS, targets)
+
+    start = time.monotonic()
+    report = PlacementReport()
+    multi_start(
+        slow_place, people, [], TEAMS, targets, 3, 2, time_budget=0.5, report=report
+    )
+    assert time.monotonic() - start < 30
+    assert active_children() == []
+    assert report.timed_out
+    assert [x.team for x in people] == [x.team for x in single]
@@ -1,6 +1,7 @@
 # external imports
 from team_placement.algorithm.prepare_people_for_teams import prepare_people_for_teams
 from team_placement.schemas import BooleanEnum, Collective, Gender, Person
+from team_placement.utils.people_table import PeopleTable
 
 PEOPLE = [
     Person(
@@ -65,3 +66,7 @@ def test_process():
         iter([x for x in people if x.index == "Non-Participant"]), None
     )
     assert non_participant is None
+
+    # participants start in their own cohorts identified by position
+    assert [x.cohort for x in people] == ["", ""]
+    assert list(PeopleTable(people).cohorts) == [0, 1]
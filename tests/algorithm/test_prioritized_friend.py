@@ -0,0 +1,242 @@
+# native imports
+from copy import deepcopy
+from random import Random
+from statistics import stdev
+
+# third-party imports
+import pytest
+
+# external imports
+from team_placement.algorithm.prioritized_friend import (
+    AGE_STD,
+    age_offset,
+    could_be_more_flexible,
+    is_more_flexible,
+)
+from team_placement.schemas import BooleanEnum, Collective, Gender, Person
+from team_placement.utils.cohorts import Cohorts
+
+# people in their own cohorts given random ages by each test
+PEOPLE = [
+    Person(
+        index="Person 0",
+        order=0,
+        firstName="Jane",
+        lastName="Doe 0",
+        age=24,
+        gender=Gender.female,
+        firstTime=BooleanEnum.no,
+        collective=Collective.new,
+        leader=BooleanEnum.no,
+        participant=BooleanEnum.yes,
+        cohort="Cohort 0",
+    ),
+    Person(
+        index="Person 1",
+        order=1,
+        firstName="Jane",
+        lastName="Doe 1",
+        age=30,
+        gender=Gender.male,
+        firstTime=BooleanEnum.no,
+        collective=Collective.newish,
+        leader=BooleanEnum.no,
+        participant=BooleanEnum.yes,
+        cohort="Cohort 1",
+    ),
+    Person(
+        index="Person 2",
+        order=2,
+        firstName="Jane",
+        lastName="Doe 2",
+        age=24,
+        gender=Gender.female,
+        firstTime=BooleanEnum.no,
+        collective=Collective.oldish,
+        leader=BooleanEnum.no,
+        participant=BooleanEnum.yes,
+        cohort="Cohort 2",
+    ),
+    Person(
+        index="Person 3",
+        order=3,
+        firstName="Jane",
+        lastName="Doe 3",
+        age=18,
+        gender=Gender.male,
+        firstTime=BooleanEnum.no,
+        collective=Collective.old,
+        leader=BooleanEnum.no,
+        participant=BooleanEnum.yes,
+        cohort="Cohort 3",
+    ),
+    Person(
+        index="Person 4",
+        order=4,
+        firstName="Jane",
+        lastName="Doe 4",
+        age=22,
+        gender=Gender.female,
+        firstTime=BooleanEnum.no,
+        collective=Collective.new,
+        leader=BooleanEnum.no,
+        participant=BooleanEnum.yes,
+        cohort="Cohort 4",
+    ),
+    Person(
+        index="Person 5",
+        order=5,
+        firstName="Jane",
+        lastName="Doe 5",
+        age=26,
+        gender=Gender.male,
+        firstTime=BooleanEnum.no,
+        collective=Collective.newish,
+        leader=BooleanEnum.no,
+        participant=BooleanEnum.yes,
+        cohort="Cohort 5",
+    ),
+    Person(
+        index="Person 6",
+        order=6,
+        firstName="Jane",
+        lastName="Doe 6",
+        age=25,
+        gender=Gender.female,
+        firstTime=BooleanEnum.no,
+        collective=Collective.oldish,
+        leader=BooleanEnum.no,
+        participant=BooleanEnum.yes,
+        cohort="Cohort 6",
+    ),
+    Person(
+        index="Person 7",
+        order=7,
+        firstName="Jane",
+        lastName="Doe 7",
+        age=24,
+        gender=Gender.male,
+        firstTime=BooleanEnum.no,
+        collective=Collective.old,
+        leader=BooleanEnum.no,
+        participant=BooleanEnum.yes,
+        cohort="Cohort 7",
+    ),
+    Person(
+        index="Person 8",
+        order=8,
+        firstName="Jane",
+        lastName="Doe 8",
+        age=30,
+        gender=Gender.female,
+        firstTime=BooleanEnum.no,
+        collective=Collective.new,
+        leader=BooleanEnum.no,
+        participant=BooleanEnum.yes,
+        cohort="Cohort 8",
+    ),
+    Person(
+        index="Person 9",
+        order=9,
+        firstName="Jane",
+        lastName="Doe 9",
+        age=22,
+        gender=Gender.male,
+        firstTime=BooleanEnum.no,
+        collective=Collective.newish,
+        leader=BooleanEnum.no,
+        participant=BooleanEnum.yes,
+        cohort="Cohort 9",
+    ),
+    Person(
+        index="Person 10",
+        order=10,
+        firstName="Jane",
+        lastName="Doe 10",
+        age=25,
+        gender=Gender.female,
+        firstTime=BooleanEnum.no,
+        collective=Collective.oldish,
+        leader=BooleanEnum.no,
+        participant=BooleanEnum.yes,
+        cohort="Cohort 10",
+    ),
+    Person(
+        index="Person 11",
+        order=11,
+        firstName="Jane",
+        lastName="Doe 11",
+        age=23,
+        gender=Gender.male,
+        firstTime=BooleanEnum.no,
+        collective=Collective.old,
+        leader=BooleanEnum.no,
+        participant=BooleanEnum.yes,
+        cohort="Cohort 11",
+    ),
+]
+
+
+def padded_age_offset(
+    ages: list[int], other_ages: list[int], team_size: int, target_age_std: float
+) -> int:
+    """Finds the age offset by padding ages with the mean age."""
+    for count in range(team_size):
+        if len(other_ages) == 0:
+            return team_size
+
+        mean_age = sum(ages) / len(ages)
+        new_ages = ages + [mean_age] * (team_size - len(ages))
+        if stdev(new_ages) > target_age_std:
+            return count
+
+        worst_age = max(other_ages, key=lambda x: abs(x - mean_age))
+        ages = ages + [worst_age]
+        other_ages.remove(worst_age)
+    return team_size
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_age_offset(seed: int):
+    """Age offsets from age moments match padding ages with the mean age."""
+    people = deepcopy(PEOPLE)
+    random = Random(seed)
+    for person in people:
+        person.age = random.randint(18, 30)
+    cohorts = Cohorts(people)
+    cohorts.join(people[0], people[1])
+    cohorts.join(people[0], people[2])
+
+    ages = [x.age for x in people[:3]]
+    other_ages = [x.age for x in people[3:]]
+    for team_size in [4, 6, 8, 14]:
+        for target_age_std in [1.0, 2.5, 4.0]:
+            assert age_offset(
+                [people[0]], cohorts, team_size, target_age_std
+            ) == padded_age_offset(
+                list(ages), list(other_ages), team_size, target_age_std
+            )
+
+
+def test_is_more_flexible():
+    """Friends with a larger minimum offset are more flexible."""
+    selected = [1, 2, 3, 4, 5, 6, 7]
+    assert not is_more_flexible(selected, list(selected))
+    assert is_more_flexible(selected, [2, 2, 3, 4, 5, 6, 7])
+    assert not is_more_flexible(selected, [0, 2, 3, 4, 5, 6, 7])
+
+    # ties go to the friend reaching the minimum in an earlier priority
+    assert not is_more_flexible(selected, [3, 1, 3, 4, 5, 6, 7])
+    assert is_more_flexible([2, 1, 3, 4, 5, 6, 7], [1, 3, 3, 4, 5, 6, 7])
+
+
+def test_could_be_more_flexible():
+    """Friends are pruned when no age offset makes them more flexible."""
+    selected = [2, 2, 2, 2, 2, 2, 2]
+    friend: list[float | None] = [1, 2, 2, 2, 2, 2, 2]
+    friend[AGE_STD] = None
+    assert not could_be_more_flexible(selected, friend, 8)
+
+    friend = [3, 3, 3, 3, 3, 3, 3]
+    friend[AGE_STD] = None
+    assert could_be_more_flexible(selected, friend, 8)
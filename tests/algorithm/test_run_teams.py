@@ -81,13 +81,13 @@ def test_process(monkeypatch):
     assign_leaders_mock = Mock()
     assign_leaders_mock.return_value = []
     monkeypatch.setattr(
-        "team_placement.algorithm.run_teams.assign_leaders", assign_leaders_mock
+        "team_placement.algorithm.form_cohorts.assign_leaders", assign_leaders_mock
     )
 
     first_pass_mock = Mock()
     first_pass_mock.return_value = []
     monkeypatch.setattr(
-        "team_placement.algorithm.run_teams.first_pass", first_pass_mock
+        "team_placement.algorithm.form_cohorts.first_pass", first_pass_mock
     )
 
     apply_controls_mock = Mock()
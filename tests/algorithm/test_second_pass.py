@@ -2,12 +2,16 @@
 from copy import deepcopy
 
 # external imports
+from team_placement.algorithm.prepare_people_for_teams import prepare_people_for_teams
+from team_placement.algorithm.run_teams import place_people
 from team_placement.algorithm.second_pass import second_pass
 from team_placement.schemas import (
     BooleanEnum,
     Collective,
     Gender,
+    PassCounters,
     Person,
+    PlacementReport,
     Targets,
     Team,
 )
@@ -380,3 +384,30 @@ def test_two_meet_targets_must_assign():
     assert new_girl is not None and extra_guy_1 is not None and extra_guy_3 is not None
     assert new_girl.cohort == extra_guy_1.cohort
     assert new_girl.cohort != extra_guy_3.cohort
+
+
+def test_counters():
+    """
+    Tests the second pass counters when both preferred people meet targets.
+    The new person is evaluated once without must assign and joined with must assign.
+    """
+    counters = PassCounters()
+    people = second_pass(deepcopy(PEOPLE_3), TARGETS, len(TEAMS), counters=counters)
+    assert counters.evaluations == 1
+    assert counters.candidates == 2
+    assert counters.joins == 0
+
+    second_pass(people, TARGETS, len(TEAMS), True, counters=counters)
+    assert counters.evaluations == 2
+    assert counters.joins == 1
+
+
+def test_place_people_counters(capsys):
+    """Counters of both second passes are reported rather than printed."""
+    report = PlacementReport()
+    place_people(
+        prepare_people_for_teams(deepcopy(PEOPLE_3)), [], TEAMS, TARGETS, report=report
+    )
+    assert report.counters.evaluations == 2
+    assert report.counters.joins == 1
+    assert "evaluations" not in capsys.readouterr().out
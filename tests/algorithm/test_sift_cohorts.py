@@ -2,7 +2,8 @@
 from copy import deepcopy
 
 # external imports
-from team_placement.algorithm.sift_cohorts import sift_cohorts
+from team_placement.algorithm.sift_cohorts import name_length, sift_cohorts
+from team_placement.constants import UNNAMED_COHORT_LENGTH
 from team_placement.schemas import (
     BooleanEnum,
     Collective,
@@ -11,6 +12,7 @@ from team_placement.schemas import (
     Targets,
     Team,
 )
+from team_placement.utils.cohorts import Cohorts
 
 TEAMS = [
     Team(index="Team 1", name="Team A"),
@@ -272,3 +274,12 @@ def test_available_team():
     girl_3 = next(iter([x for x in people if x.index == "Girl 3"]), None)
     assert girl_3 is not None
     assert girl_3.team == "Team C"
+
+
+def test_name_length():
+    """Cohorts count the characters of their names or of a former random id."""
+    people = deepcopy(PEOPLE_4)
+    people[0].cohort = ""
+    cohorts = Cohorts(people)
+    assert name_length(cohorts, cohorts.root(people[2])) == len("Preset Cohort")
+    assert name_length(cohorts, cohorts.root(people[0])) == UNNAMED_COHORT_LENGTH
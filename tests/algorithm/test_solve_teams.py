@@ -0,0 +1,528 @@
+# native imports
+from copy import deepcopy
+from itertools import product
+
+# external imports
+from team_placement.algorithm.apply_controls import apply_controls
+from team_placement.algorithm.assign_leaders import assign_leaders
+from team_placement.algorithm.define_targets import define_targets
+from team_placement.algorithm.first_pass import first_pass
+from team_placement.algorithm.prepare_people_for_teams import prepare_people_for_teams
+from team_placement.algorithm.run_teams import place_people, run_teams
+from team_placement.algorithm.solve_teams import solve_people, solve_teams
+from team_placement.schemas import (
+    BooleanEnum,
+    Collective,
+    Engine,
+    Gender,
+    Person,
+    PlacementReport,
+    Team,
+)
+from team_placement.utils.cohorts import Cohorts
+from team_placement.utils.team_score import score_people
+from team_placement.utils.team_search import TeamSearch
+
+TEAMS = [
+    Team(index="Team 1", name="Team A"),
+    Team(index="Team 2", name="Team B"),
+    Team(index="Team 3", name="Team C"),
+]
+
+
+# a leader per team and every fourth person preferring the next
+PEOPLE = [
+    Person(
+        index="Person 0",
+        order=0,
+        firstName="Jane",
+        lastName="Doe 0",
+        age=20,
+        gender=Gender.female,
+        firstTime=BooleanEnum.no,
+        collective=Collective.new,
+        leader=BooleanEnum.yes,
+        participant=BooleanEnum.yes,
+        team="Team A",
+    ),
+    Person(
+        index="Person 1",
+        order=1,
+        firstName="Jane",
+        lastName="Doe 1",
+        age=21,
+        gender=Gender.male,
+        firstTime=BooleanEnum.no,
+        collective=Collective.newish,
+        leader=BooleanEnum.yes,
+        participant=BooleanEnum.yes,
+        team="Team B",
+    ),
+    Person(
+        index="Person 2",
+        order=2,
+        firstName="Jane",
+        lastName="Doe 2",
+        age=22,
+        gender=Gender.male,
+        firstTime=BooleanEnum.no,
+        collective=Collective.oldish,
+        leader=BooleanEnum.yes,
+        participant=BooleanEnum.yes,
+        team="Team C",
+    ),
+    Person(
+        index="Person 3",
+        order=3,
+        firstName="Jane",
+        lastName="Doe 3",
+        age=23,
+        gender=Gender.female,
+        firstTime=BooleanEnum.yes,
+        collective=Collective.old,
+        leader=BooleanEnum.no,
+        participant=BooleanEnum.yes,
+    ),
+    Person(
+        index="Person 4",
+        order=4,
+        firstName="Jane",
+        lastName="Doe 4",
+        age=24,
+        gender=Gender.male,
+        firstTime=BooleanEnum.yes,
+        collective=Collective.new,
+        leader=BooleanEnum.no,
+        participant=BooleanEnum.yes,
+        preferredPeople=["Person 5"],
+    ),
+    Person(
+        index="Person 5",
+        order=5,
+        firstName="Jane",
+        lastName="Doe 5",
+        age=25,
+        gender=Gender.male,
+        firstTime=BooleanEnum.yes,
+        collective=Collective.newish,
+        leader=BooleanEnum.no,
+        participant=BooleanEnum.yes,
+    ),
+    Person(
+        index="Person 6",
+        order=6,
+        firstName="Jane",
+        lastName="Doe 6",
+        age=26,
+        gender=Gender.female,
+        firstTime=BooleanEnum.yes,
+        collective=Collective.oldish,
+        leader=BooleanEnum.no,
+        participant=BooleanEnum.yes,
+    ),
+    Person(
+        index="Person 7",
+        order=7,
+        firstName="Jane",
+        lastName="Doe 7",
+        age=20,
+        gender=Gender.male,
+        firstTime=BooleanEnum.yes,
+        collective=Collective.old,
+        leader=BooleanEnum.no,
+        participant=BooleanEnum.yes,
+    ),
+    Person(
+        index="Person 8",
+        order=8,
+        firstName="Jane",
+        lastName="Doe 8",
+        age=21,
+        gender=Gender.male,
+        firstTime=BooleanEnum.yes,
+        collective=Collective.new,
+        leader=BooleanEnum.no,
+        participant=BooleanEnum.yes,
+        preferredPeople=["Person 9"],
+    ),
+    Person(
+        index="Person 9",
+        order=9,
+        firstName="Jane",
+        lastName="Doe 9",
+        age=22,
+        gender=Gender.female,
+        firstTime=BooleanEnum.yes,
+        collective=Collective.newish,
+        leader=BooleanEnum.no,
+        participant=BooleanEnum.yes,
+    ),
+    Person(
+        index="Person 10",
+        order=10,
+        firstName="Jane",
+        lastName="Doe 10",
+        age=23,
+        gender=Gender.male,
+        firstTime=BooleanEnum.yes,
+        collective=Collective.oldish,
+        leader=BooleanEnum.no,
+        participant=BooleanEnum.yes,
+    ),
+]
+
+# two leaders per team and people with up to 3 preferred people
+ROSTER = [
+    Person(
+        index="Person 0",
+        order=1,
+        firstName="Jane",
+        lastName="Doe 0",
+        age=26,
+        gender=Gender.male,
+        firstTime=BooleanEnum.no,
+        collective=Collective.new,
+        leader=BooleanEnum.yes,
+        participant=BooleanEnum.yes,
+        team="Team A",
+        preferredPeople=["Person 3", "Person 11", "Person 1"],
+    ),
+    Person(
+        index="Person 1",
+        order=2,
+        firstName="Jane",
+        lastName="Doe 1",
+        age=32,
+        gender=Gender.male,
+        firstTime=BooleanEnum.yes,
+        collective=Collective.new,
+        leader=BooleanEnum.yes,
+        participant=BooleanEnum.yes,
+        team="Team A",
+    ),
+    Person(
+        index="Person 2",
+        order=3,
+        firstName="Jane",
+        lastName="Doe 2",
+        age=23,
+        gender=Gender.male,
+        firstTime=BooleanEnum.no,
+        collective=Collective.new,
+        leader=BooleanEnum.yes,
+        participant=BooleanEnum.yes,
+        team="Team B",
+    ),
+    Person(
+        index="Person 3",
+        order=4,
+        firstName="Jane",
+        lastName="Doe 3",
+        age=23,
+        gender=Gender.male,
+        firstTime=BooleanEnum.no,
+        collective=Collective.new,
+        leader=BooleanEnum.yes,
+        participant=BooleanEnum.yes,
+        team="Team B",
+    ),
+    Person(
+        index="Person 4",
+        order=5,
+        firstName="Jane",
+        lastName="Doe 4",
+        age=33,
+        gender=Gender.male,
+        firstTime=BooleanEnum.no,
+        collective=Collective.old,
+        leader=BooleanEnum.yes,
+        participant=BooleanEnum.yes,
+        team="Team C",
+    ),
+    Person(
+        index="Person 5",
+        order=6,
+        firstName="Jane",
+        lastName="Doe 5",
+        age=34,
+        gender=Gender.female,
+        firstTime=BooleanEnum.yes,
+        collective=Collective.new,
+        leader=BooleanEnum.yes,
+        participant=BooleanEnum.yes,
+        team="Team C",
+        preferredPeople=["Person 11"],
+    ),
+    Person(
+        index="Person 6",
+        order=7,
+        firstName="Jane",
+        lastName="Doe 6",
+        age=19,
+        gender=Gender.male,
+        firstTime=BooleanEnum.yes,
+        collective=Collective.newish,
+        leader=BooleanEnum.no,
+        participant=BooleanEnum.yes,
+        preferredPeople=["Person 13", "Person 10", "Person 14"],
+    ),
+    Person(
+        index="Person 7",
+        order=8,
+        firstName="Jane",
+        lastName="Doe 7",
+        age=34,
+        gender=Gender.female,
+        firstTime=BooleanEnum.no,
+        collective=Collective.oldish,
+        leader=BooleanEnum.no,
+        participant=BooleanEnum.yes,
+    ),
+    Person(
+        index="Person 8",
+        order=9,
+        firstName="Jane",
+        lastName="Doe 8",
+        age=18,
+        gender=Gender.female,
+        firstTime=BooleanEnum.no,
+        collective=Collective.oldish,
+        leader=BooleanEnum.no,
+        participant=BooleanEnum.yes,
+        preferredPeople=["Person 19"],
+    ),
+    Person(
+        index="Person 9",
+        order=10,
+        firstName="Jane",
+        lastName="Doe 9",
+        age=18,
+        gender=Gender.male,
+        firstTime=BooleanEnum.no,
+        collective=Collective.newish,
+        leader=BooleanEnum.no,
+        participant=BooleanEnum.yes,
+        preferredPeople=["Person 15"],
+    ),
+    Person(
+        index="Person 10",
+        order=11,
+        firstName="Jane",
+        lastName="Doe 10",
+        age=29,
+        gender=Gender.male,
+        firstTime=BooleanEnum.yes,
+        collective=Collective.oldish,
+        leader=BooleanEnum.no,
+        participant=BooleanEnum.yes,
+        preferredPeople=["Person 19"],
+    ),
+    Person(
+        index="Person 11",
+        order=12,
+        firstName="Jane",
+        lastName="Doe 11",
+        age=31,
+        gender=Gender.female,
+        firstTime=BooleanEnum.yes,
+        collective=Collective.new,
+        leader=BooleanEnum.no,
+        participant=BooleanEnum.yes,
+        preferredPeople=["Person 2", "Person 1"],
+    ),
+    Person(
+        index="Person 12",
+        order=13,
+        firstName="Jane",
+        lastName="Doe 12",
+        age=25,
+        gender=Gender.female,
+        firstTime=BooleanEnum.no,
+        collective=Collective.old,
+        leader=BooleanEnum.no,
+        participant=BooleanEnum.yes,
+        preferredPeople=["Person 0"],
+    ),
+    Person(
+        index="Person 13",
+        order=14,
+        firstName="Jane",
+        lastName="Doe 13",
+        age=30,
+        gender=Gender.female,
+        firstTime=BooleanEnum.yes,
+        collective=Collective.new,
+        leader=BooleanEnum.no,
+        participant=BooleanEnum.yes,
+        preferredPeople=["Person 9"],
+    ),
+    Person(
+        index="Person 14",
+        order=15,
+        firstName="Jane",
+        lastName="Doe 14",
+        age=20,
+        gender=Gender.male,
+        firstTime=BooleanEnum.no,
+        collective=Collective.old,
+        leader=BooleanEnum.no,
+        participant=BooleanEnum.yes,
+        preferredPeople=["Person 2", "Person 5"],
+    ),
+    Person(
+        index="Person 15",
+        order=16,
+        firstName="Jane",
+        lastName="Doe 15",
+        age=30,
+        gender=Gender.female,
+        firstTime=BooleanEnum.no,
+        collective=Collective.newish,
+        leader=BooleanEnum.no,
+        participant=BooleanEnum.yes,
+        preferredPeople=["Person 8", "Person 13", "Person 11"],
+    ),
+    Person(
+        index="Person 16",
+        order=17,
+        firstName="Jane",
+        lastName="Doe 16",
+        age=28,
+        gender=Gender.male,
+        firstTime=BooleanEnum.yes,
+        collective=Collective.new,
+        leader=BooleanEnum.no,
+        participant=BooleanEnum.yes,
+        preferredPeople=["Person 7"],
+    ),
+    Person(
+        index="Person 17",
+        order=18,
+        firstName="Jane",
+        lastName="Doe 17",
+        age=16,
+        gender=Gender.female,
+        firstTime=BooleanEnum.yes,
+        collective=Collective.oldish,
+        leader=BooleanEnum.no,
+        participant=BooleanEnum.yes,
+        preferredPeople=["Person 13"],
+    ),
+    Person(
+        index="Person 18",
+        order=19,
+        firstName="Jane",
+        lastName="Doe 18",
+        age=33,
+        gender=Gender.female,
+        firstTime=BooleanEnum.no,
+        collective=Collective.newish,
+        leader=BooleanEnum.no,
+        participant=BooleanEnum.yes,
+        preferredPeople=["Person 19", "Person 1", "Person 14"],
+    ),
+    Person(
+        index="Person 19",
+        order=20,
+        firstName="Jane",
+        lastName="Doe 19",
+        age=33,
+        gender=Gender.female,
+        firstTime=BooleanEnum.no,
+        collective=Collective.old,
+        leader=BooleanEnum.no,
+        participant=BooleanEnum.yes,
+        preferredPeople=["Person 12", "Person 1"],
+    ),
+]
+
+
+def create_search(people: list[Person]) -> TeamSearch:
+    """Collects cohorts formed by the first pass on teams of their leaders."""
+    people = prepare_people_for_teams(people)
+    targets = define_targets(people, TEAMS)
+    people = assign_leaders(people, TEAMS)
+    cohorts = Cohorts(people)
+    first_pass(people, cohorts)
+    apply_controls(people, [], cohorts)
+    search = TeamSearch(cohorts, targets, TEAMS)
+    search.place(cohorts)
+    return search
+
+
+def test_solve_teams():
+    """The lowest cost of every placement is found and proved."""
+    people = deepcopy(PEOPLE)
+    search = create_search(people)
+    units = [u for u, movable in enumerate(search.movable) if movable]
+    lowest = None
+    for choice in product(range(-1, len(TEAMS)), repeat=len(units)):
+        teams = list(search.teams)
+        for unit, team in zip(units, choice):
+            teams[unit] = team
+        search.reset(teams)
+        if lowest is None or search.cost() < lowest:
+            lowest = search.cost()
+
+    search.reset(
+        [-1 if movable else x for x, movable in zip(search.teams, search.movable)]
+    )
+    cost, proved = solve_teams(search, 60)
+    assert proved
+    assert abs(cost - lowest) < 1e-9
+    assert abs(search.cost() - cost) < 1e-9
+
+
+def test_solve_teams_time_budget():
+    """The lowest cost placement found is kept when there is no time to search."""
+    people = deepcopy(PEOPLE)
+    search = create_search(people)
+    start = search.cost()
+    cost, _ = solve_teams(search, 0)
+    assert cost <= start
+    assert abs(cost - search.cost()) < 1e-9
+
+
+def test_solve_people():
+    """Everyone is placed while leaders and cohorts stay together."""
+    people = deepcopy(PEOPLE)
+    people = prepare_people_for_teams(people)
+    targets = define_targets(people, TEAMS)
+    people = solve_people(people, [], TEAMS, targets, 60)
+    assert all([x.team != "" for x in people])
+    assert [x.team for x in people[:3]] == [x.name for x in TEAMS]
+    for i in range(4, 11, 4):
+        assert people[i].team == people[i + 1].team
+    assert len(set([x.cohort for x in people])) == len(TEAMS)
+
+
+def test_solve_people_report():
+    """The cost of the placement is reported with whether it is proved optimal."""
+    people = deepcopy(PEOPLE)
+    people = prepare_people_for_teams(people)
+    targets = define_targets(people, TEAMS)
+    report = PlacementReport()
+    people = solve_people(people, [], TEAMS, targets, 60, report=report)
+    assert report.proved
+    assert abs(report.cost - score_people(people, TEAMS, targets)) < 1e-9
+
+
+def test_run_teams_report():
+    """Run teams fills the report when branch and bound places people."""
+    people = deepcopy(PEOPLE)
+    report = PlacementReport()
+    run_teams(people, [], TEAMS, engine=Engine.exact, report=report)
+    assert report.proved
+
+
+def test_solve_people_proved():
+    """A roster of 20 people is proved optimal and beats the greedy passes."""
+    people = prepare_people_for_teams(deepcopy(ROSTER))
+    targets = define_targets(people, TEAMS)
+    greedy = place_people(deepcopy(people), [], TEAMS, targets)
+
+    report = PlacementReport()
+    people = solve_people(people, [], TEAMS, targets, 60, report=report)
+    assert report.proved
+    assert abs(report.cost - score_people(people, TEAMS, targets)) < 1e-9
+    assert report.cost < score_people(greedy, TEAMS, targets)
@@ -0,0 +1,29 @@
+# native imports
+from itertools import permutations
+from random import Random
+
+# external imports
+from team_placement.utils.assignment import assign_rows
+
+
+def test_assign_rows():
+    """Rows take different columns at the lowest total cost."""
+    rng = Random(0)
+    for _ in range(20):
+        costs = [[rng.randint(-5, 9) for _ in range(4)] for _ in range(3)]
+        columns = assign_rows(costs)
+        lowest = min(
+            [
+                sum([costs[i][j] for i, j in enumerate(x)])
+                for x in permutations(range(4), 3)
+            ]
+        )
+        assert len(set(columns)) == 3
+        assert sum([costs[i][j] for i, j in enumerate(columns)]) == lowest
+
+
+def test_assign_rows_forbidden():
+    """Forbidden pairs are avoided and rows left with them are not assigned."""
+    assert assign_rows([[None, 5], [1, 1]]) == [1, 0]
+    assert assign_rows([[None, 1], [None, 1]]) in ([None, 1], [1, None])
+    assert assign_rows([]) == []
@@ -0,0 +1,268 @@
+# native imports
+from copy import deepcopy
+from statistics import stdev
+
+# third-party imports
+import pytest
+
+# external imports
+from team_placement.constants import PRIORITIES
+from team_placement.schemas import BooleanEnum, Collective, Gender, Person, Targets
+from team_placement.utils.cohorts import Cohorts
+from team_placement.utils.cohort_metrics import (
+    adjusted_sample_stdev,
+    count_rows,
+    sample_stdev,
+)
+from team_placement.utils.helpers import adjusted_stdev, collect_metrics
+
+COLLECTIVES = list(Collective)
+
+# people with varied demographics in their own cohorts
+PEOPLE = [
+    Person(
+        index="Person 0",
+        order=0,
+        firstName="Jane",
+        lastName="Doe 0",
+        age=18,
+        gender=Gender.female,
+        firstTime=BooleanEnum.no,
+        collective=Collective.new,
+        leader=BooleanEnum.no,
+        participant=BooleanEnum.yes,
+        cohort="Cohort 0",
+    ),
+    Person(
+        index="Person 1",
+        order=1,
+        firstName="Jane",
+        lastName="Doe 1",
+        age=25,
+        gender=Gender.male,
+        firstTime=BooleanEnum.no,
+        collective=Collective.newish,
+        leader=BooleanEnum.no,
+        participant=BooleanEnum.yes,
+        cohort="Cohort 1",
+    ),
+    Person(
+        index="Person 2",
+        order=2,
+        firstName="Jane",
+        lastName="Doe 2",
+        age=19,
+        gender=Gender.male,
+        firstTime=BooleanEnum.no,
+        collective=Collective.oldish,
+        leader=BooleanEnum.no,
+        participant=BooleanEnum.yes,
+        cohort="Cohort 2",
+    ),
+    Person(
+        index="Person 3",
+        order=3,
+        firstName="Jane",
+        lastName="Doe 3",
+        age=26,
+        gender=Gender.female,
+        firstTime=BooleanEnum.no,
+        collective=Collective.old,
+        leader=BooleanEnum.no,
+        participant=BooleanEnum.yes,
+        cohort="Cohort 3",
+    ),
+    Person(
+        index="Person 4",
+        order=4,
+        firstName="Jane",
+        lastName="Doe 4",
+        age=20,
+        gender=Gender.male,
+        firstTime=BooleanEnum.no,
+        collective=Collective.new,
+        leader=BooleanEnum.no,
+        participant=BooleanEnum.yes,
+        cohort="Cohort 4",
+    ),
+    Person(
+        index="Person 5",
+        order=5,
+        firstName="Jane",
+        lastName="Doe 5",
+        age=27,
+        gender=Gender.male,
+        firstTime=BooleanEnum.no,
+        collective=Collective.newish,
+        leader=BooleanEnum.no,
+        participant=BooleanEnum.yes,
+        cohort="Cohort 5",
+    ),
+    Person(
+        index="Person 6",
+        order=6,
+        firstName="Jane",
+        lastName="Doe 6",
+        age=21,
+        gender=Gender.female,
+        firstTime=BooleanEnum.no,
+        collective=Collective.oldish,
+        leader=BooleanEnum.no,
+        participant=BooleanEnum.yes,
+        cohort="Cohort 6",
+    ),
+    Person(
+        index="Person 7",
+        order=7,
+        firstName="Jane",
+        lastName="Doe 7",
+        age=28,
+        gender=Gender.male,
+        firstTime=BooleanEnum.no,
+        collective=Collective.old,
+        leader=BooleanEnum.no,
+        participant=BooleanEnum.yes,
+        cohort="Cohort 7",
+    ),
+    Person(
+        index="Person 8",
+        order=8,
+        firstName="Jane",
+        lastName="Doe 8",
+        age=22,
+        gender=Gender.male,
+        firstTime=BooleanEnum.no,
+        collective=Collective.new,
+        leader=BooleanEnum.no,
+        participant=BooleanEnum.yes,
+        cohort="Cohort 8",
+    ),
+    Person(
+        index="Person 9",
+        order=9,
+        firstName="Jane",
+        lastName="Doe 9",
+        age=29,
+        gender=Gender.female,
+        firstTime=BooleanEnum.no,
+        collective=Collective.newish,
+        leader=BooleanEnum.no,
+        participant=BooleanEnum.yes,
+        cohort="Cohort 9",
+    ),
+]
+
+
+def test_sample_stdev():
+    """Running moments match the standard library within float tolerance."""
+    ages = [18, 21, 21, 25, 30, 19]
+    squares = sum([x * x for x in ages])
+    assert sample_stdev(len(ages), sum(ages), squares) == pytest.approx(stdev(ages))
+
+    # equal values have no spread
+    assert sample_stdev(3, 75, 1875) == 0
+
+
+def test_join_metrics():
+    """Metrics of joined cohorts are the sum of their rows."""
+    people = deepcopy(PEOPLE)
+    cohorts = Cohorts(people)
+    for person in people[1:6]:
+        cohorts.join(people[0], person)
+
+    metrics = cohorts.metrics.targets([cohorts.root(people[0])])
+    members = people[:6]
+    assert metrics.team_size == 6
+    assert metrics.girl_count == len([x for x in members if x.gender == "Female"])
+    assert metrics.collective_new == len(
+        [x for x in members if x.collective == Collective.new]
+    )
+    assert metrics.age_std == pytest.approx(stdev([x.age for x in members]))
+
+    # combined cohorts do not need to be joined
+    roots = [cohorts.root(people[0]), cohorts.root(people[7])]
+    metrics = cohorts.metrics.targets(roots)
+    assert metrics.team_size == 7
+    assert metrics.age_std == pytest.approx(
+        stdev([x.age for x in members + [people[7]]])
+    )
+
+
+def test_count_rows():
+    """Rows are summed by label."""
+    rows = [[1, 2], [3, 4], [5, 6]]
+    assert count_rows([0, 2, 0], rows) == {0: [6, 8], 2: [3, 4]}
+
+
+def test_matrix():
+    """Metrics of each cohort match targets of the cohort."""
+    people = deepcopy(PEOPLE)
+    cohorts = Cohorts(people)
+    cohorts.join(people[0], people[1])
+    cohorts.join(people[2], people[3])
+    cohorts.join(people[0], people[2])
+
+    roots = cohorts.roots(people)
+    matrix = cohorts.metrics.matrix(roots)
+    for root, row in zip(roots, matrix):
+        metrics = cohorts.metrics.targets([root])
+        assert row == [getattr(metrics, x) for x in PRIORITIES]
+
+    totals = cohorts.metrics.totals(roots)
+    assert totals["team_size"] == len(people)
+    girl_count = PRIORITIES.index("girl_count")
+    assert totals["girl_count"] == sum([x[girl_count] for x in matrix])
+
+
+def test_adjusted_sample_stdev():
+    """Running moments adjusted for a team size match the standard library."""
+    ages = [18, 21, 21, 25, 30, 19, 27]
+    for count in range(2, len(ages) + 1):
+        for team_size in [count, count + 1, 9.0, 12.0]:
+            team_ages = ages[:count]
+            total = sum(team_ages)
+            squares = sum([x * x for x in team_ages])
+            mean_age = total / count
+            padded_ages = team_ages + [mean_age] * (int(team_size) - count)
+            assert adjusted_sample_stdev(
+                count, total, squares, team_size
+            ) == pytest.approx(stdev(padded_ages))
+            assert adjusted_stdev(team_ages, team_size) == pytest.approx(
+                stdev(padded_ages)
+            )
+
+
+def test_feasibility():
+    """Feasibility of each friend and leader cohort matches meeting targets."""
+    people = deepcopy(PEOPLE)
+    cohorts = Cohorts(people)
+    targets = Targets(
+        team_size=4,
+        collective_new=2,
+        collective_newish=2,
+        collective_oldish=2,
+        collective_old=2,
+        age_std=4.0,
+        girl_count=2,
+    )
+    friends = people[1:5]
+    leaders = people[5:]
+    feasible = cohorts.metrics.feasibility(
+        [cohorts.root(people[0])],
+        [cohorts.root(x) for x in friends],
+        [cohorts.root(x) for x in leaders],
+        targets,
+    )
+    for friend, row in zip(friends, feasible):
+        for leader, valid in zip(leaders, row):
+            metrics = collect_metrics(
+                cohorts,
+                [people[0], friend, leader],
+                adjust_age=True,
+                target_team_size=targets.team_size,
+            )
+            assert valid == all(
+                [getattr(metrics, x) <= getattr(targets, x) for x in PRIORITIES]
+            )
+    assert any([any(row) for row in feasible])
+    assert not all([all(row) for row in feasible])
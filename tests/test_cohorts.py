@@ -0,0 +1,262 @@
+# native imports
+from copy import deepcopy
+
+# external imports
+from team_placement.schemas import BooleanEnum, Collective, Gender, Person
+from team_placement.utils.cohort_metrics import AGE_SUM, TEAM_SIZE
+from team_placement.utils.cohorts import Cohorts
+
+# people in their own cohorts except for two leaders
+PEOPLE = [
+    Person(
+        index="Person 0",
+        order=0,
+        firstName="John",
+        lastName="Doe 0",
+        age=25,
+        gender=Gender.male,
+        firstTime=BooleanEnum.no,
+        collective=Collective.new,
+        leader=BooleanEnum.yes,
+        participant=BooleanEnum.yes,
+        team="Team A",
+        cohort="Team A",
+    ),
+    Person(
+        index="Person 1",
+        order=1,
+        firstName="John",
+        lastName="Doe 1",
+        age=25,
+        gender=Gender.male,
+        firstTime=BooleanEnum.no,
+        collective=Collective.new,
+        leader=BooleanEnum.yes,
+        participant=BooleanEnum.yes,
+        team="Team A",
+        cohort="Team A",
+    ),
+    Person(
+        index="Person 2",
+        order=2,
+        firstName="John",
+        lastName="Doe 2",
+        age=25,
+        gender=Gender.male,
+        firstTime=BooleanEnum.no,
+        collective=Collective.new,
+        leader=BooleanEnum.no,
+        participant=BooleanEnum.yes,
+        cohort="Cohort 2",
+    ),
+    Person(
+        index="Person 3",
+        order=3,
+        firstName="John",
+        lastName="Doe 3",
+        age=25,
+        gender=Gender.male,
+        firstTime=BooleanEnum.no,
+        collective=Collective.new,
+        leader=BooleanEnum.no,
+        participant=BooleanEnum.yes,
+        cohort="Cohort 3",
+    ),
+    Person(
+        index="Person 4",
+        order=4,
+        firstName="John",
+        lastName="Doe 4",
+        age=25,
+        gender=Gender.male,
+        firstTime=BooleanEnum.no,
+        collective=Collective.new,
+        leader=BooleanEnum.no,
+        participant=BooleanEnum.yes,
+        cohort="Cohort 4",
+    ),
+    Person(
+        index="Person 5",
+        order=5,
+        firstName="John",
+        lastName="Doe 5",
+        age=25,
+        gender=Gender.male,
+        firstTime=BooleanEnum.no,
+        collective=Collective.new,
+        leader=BooleanEnum.no,
+        participant=BooleanEnum.yes,
+        cohort="Cohort 5",
+    ),
+]
+
+
+def test_existing_cohorts():
+    """People sharing a cohort are indexed together."""
+    people = deepcopy(PEOPLE)
+    cohorts = Cohorts(people)
+    assert cohorts.root(people[0]) == cohorts.root(people[1])
+    assert cohorts.size(people[0]) == 2
+    assert len(cohorts.members) == 5
+
+
+def test_join():
+    """Joined cohorts share members, the first label and any team."""
+    people = deepcopy(PEOPLE)
+    cohorts = Cohorts(people)
+    cohorts.join(people[2], people[3])
+    cohorts.join(people[4], people[2])
+    cohorts.join(people[3], people[0])
+    assert cohorts.size(people[4]) == 5
+    assert cohorts.team(people[4]) == "Team A"
+
+    # people are only updated when written back
+    assert people[4].cohort == "Cohort 4"
+    cohorts.write_back()
+    assert len(set([x.cohort for x in people])) == 2
+    assert people[2].cohort == "Cohort 4"
+    assert people[2].team == "Team A"
+
+
+def test_banned_people_spread():
+    """Cohorts banning a person ban anyone joining the person."""
+    people = deepcopy(PEOPLE)
+    cohorts = Cohorts(people)
+    cohorts.ban(people[2], people[3].index)
+    cohorts.ban(people[3], people[2].index)
+    assert cohorts.is_banned(people[2], people[3])
+    assert not cohorts.is_banned(people[2], people[4])
+
+    cohorts.join(people[3], people[4])
+    assert cohorts.is_banned(people[2], people[4])
+    assert cohorts.is_banned(people[4], people[2])
+
+    cohorts.write_back()
+    assert people[4].index in people[2].banned_people
+    assert people[2].index in people[4].banned_people
+
+
+def test_version():
+    """Versions and merges only increase as cohorts change."""
+    people = deepcopy(PEOPLE)
+    cohorts = Cohorts(people)
+    version = cohorts.version
+    cohorts.join(people[2], people[3])
+    assert cohorts.merges == 1
+    assert cohorts.changed_since(people[3], version)
+    assert not cohorts.changed_since(people[4], version)
+    assert cohorts.leaders_changed == 0
+
+    # joining a cohort with itself does not merge cohorts
+    cohorts.join(people[2], people[3])
+    assert cohorts.merges == 1
+
+    version = cohorts.version
+    cohorts.set_team(people[4], "Team B")
+    assert cohorts.merges == 1
+    assert cohorts.version > version
+    assert cohorts.leaders_changed == cohorts.version
+
+
+def test_names():
+    """Cohorts are identified by integers and written back by name."""
+    people = deepcopy(PEOPLE)
+    cohorts = Cohorts(people)
+    assert cohorts.labels[cohorts.root(people[1])] == 0
+    assert cohorts.name(cohorts.root(people[1])) == "Team A"
+
+    cohorts.join(people[3], people[0])
+    assert cohorts.labels[cohorts.root(people[0])] == 3
+    cohorts.write_back()
+    assert people[0].cohort == "Cohort 3"
+    assert people[0].team == "Team A"
+
+    # cohorts without names are written back by their integer label
+    people = deepcopy(PEOPLE)
+    for person in people:
+        person.cohort = ""
+    cohorts = Cohorts(people)
+    assert cohorts.labels[cohorts.root(people[2])] == 2
+    cohorts.write_back()
+    assert [x.cohort for x in people] == [str(i) for i in range(len(people))]
+
+
+def test_leader_row():
+    """Leader totals follow cohorts as they join teams."""
+    people = deepcopy(PEOPLE)
+    cohorts = Cohorts(people)
+    assert cohorts.leader_row[TEAM_SIZE] == 2
+    assert cohorts.leader_row[AGE_SUM] == 50
+
+    cohorts.join(people[2], people[3])
+    assert cohorts.leader_row[TEAM_SIZE] == 2
+
+    cohorts.join(people[0], people[2])
+    assert cohorts.leader_row[TEAM_SIZE] == 4
+
+    cohorts.set_team(people[4], "Team B")
+    assert cohorts.leader_row[TEAM_SIZE] == 5
+    cohorts.set_team(people[4], "Team C")
+    assert cohorts.leader_row[TEAM_SIZE] == 5
+
+    roots = [cohorts.root(people[0]), cohorts.root(people[4])]
+    assert cohorts.leader_row == cohorts.metrics.row(roots)
+
+
+def test_banned_people_boundary():
+    """Banned people are kept as bitsets and written back as sorted indices."""
+    people = deepcopy(PEOPLE)
+    people[2].banned_people = ["Person 5", "Person 9"]
+    cohorts = Cohorts(people)
+    assert cohorts.bans(people[2], "Person 5")
+    assert cohorts.bans(people[2], "Person 9")
+    assert not cohorts.bans(people[2], "Person 4")
+    assert cohorts.is_banned(people[2], people[5])
+
+    cohorts.ban(people[2], people[3].index)
+    assert cohorts.ban_count(cohorts.root(people[2])) == 3
+
+    cohorts.write_back()
+    assert people[2].banned_people == ["Person 3", "Person 5", "Person 9"]
+
+
+def mask(cohorts: Cohorts, person: Person, friend: Person) -> bool:
+    """Determines if a friend is a candidate for the cohort of a person."""
+    return cohorts.candidates(person) >> cohorts.positions[friend.index] & 1 == 1
+
+
+def test_candidates():
+    """Cohorts may merge with people in other cohorts who are not banned."""
+    people = deepcopy(PEOPLE)
+    cohorts = Cohorts(people)
+    cohorts.join(people[2], people[3])
+    cohorts.ban(people[4], people[3].index)
+
+    candidates = [x for x in people if mask(cohorts, people[4], x)]
+    assert candidates == [people[0], people[1], people[5]]
+
+    # leader cohorts only merge with people without teams
+    candidates = [x for x in people if mask(cohorts, people[0], x)]
+    assert candidates == people[2:]
+
+    cohorts.set_team(people[5], "Team B")
+    candidates = [x for x in people if mask(cohorts, people[0], x)]
+    assert candidates == people[2:5]
+
+    # cohorts leaving teams are candidates for leader cohorts again
+    cohorts.set_team(people[5], "")
+    candidates = [x for x in people if mask(cohorts, people[0], x)]
+    assert candidates == people[2:]
+
+
+def test_roots():
+    """Cohorts of people are collected once in order of people."""
+    people = deepcopy(PEOPLE)
+    cohorts = Cohorts(people)
+    cohorts.join(people[2], people[4])
+    roots = cohorts.roots([people[4], people[0], people[2], people[1], people[3]])
+    assert roots == [
+        cohorts.root(people[4]),
+        cohorts.root(people[0]),
+        cohorts.root(people[3]),
+    ]
@@ -0,0 +1,30 @@
+# external imports
+from team_placement.utils.min_cost_flow import MinCostFlow
+
+
+def test_min_cost_flow():
+    """Flow already sent is rerouted when that lowers the total cost."""
+    # two people may join two teams with room for one person each
+    network = MinCostFlow(6)
+    network.add_arc(0, 1, 1, 0)
+    network.add_arc(0, 2, 1, 0)
+    arc_1 = network.add_arc(1, 3, 1, 1)
+    arc_2 = network.add_arc(1, 4, 1, 2)
+    arc_3 = network.add_arc(2, 3, 1, 1)
+    arc_4 = network.add_arc(2, 4, 1, 10)
+    network.add_arc(3, 5, 1, 0)
+    network.add_arc(4, 5, 1, 0)
+
+    assert network.solve(0, 5) == 3
+    assert [network.flow(x) for x in [arc_1, arc_2, arc_3, arc_4]] == [0, 1, 1, 0]
+
+
+def test_min_cost_flow_negative_costs():
+    """Arcs may cost less than nothing and unreachable flow is not sent."""
+    network = MinCostFlow(4)
+    network.add_arc(0, 1, 2, 0)
+    arc = network.add_arc(1, 2, 5, -3)
+    network.add_arc(3, 2, 1, 0)
+
+    assert network.solve(0, 2) == -6
+    assert network.flow(arc) == 2
@@ -0,0 +1,87 @@
+# native imports
+from copy import deepcopy
+
+# external imports
+from team_placement.schemas import BooleanEnum, Collective, Gender, Person
+from team_placement.utils.people_table import PeopleTable
+
+# people preferring the next person with two sharing a cohort
+PEOPLE = [
+    Person(
+        index="Person 0",
+        order=0,
+        firstName="Jane",
+        lastName="Doe 0",
+        age=20,
+        gender=Gender.female,
+        firstTime=BooleanEnum.yes,
+        collective=Collective.new,
+        leader=BooleanEnum.no,
+        participant=BooleanEnum.yes,
+        preferredPeople=["Person 1", "Person 1"],
+        cohort="Cohort 0",
+    ),
+    Person(
+        index="Person 1",
+        order=1,
+        firstName="Jane",
+        lastName="Doe 1",
+        age=21,
+        gender=Gender.male,
+        firstTime=BooleanEnum.yes,
+        collective=Collective.new,
+        leader=BooleanEnum.no,
+        participant=BooleanEnum.yes,
+        preferredPeople=["Person 2", "Person 2"],
+        cohort="Cohort 0",
+    ),
+    Person(
+        index="Person 2",
+        order=2,
+        firstName="Jane",
+        lastName="Doe 2",
+        age=22,
+        gender=Gender.female,
+        firstTime=BooleanEnum.no,
+        collective=Collective.new,
+        leader=BooleanEnum.no,
+        participant=BooleanEnum.yes,
+        preferredPeople=["Person 3", "Person 3"],
+        cohort="Cohort 2",
+    ),
+    Person(
+        index="Person 3",
+        order=3,
+        firstName="Jane",
+        lastName="Doe 3",
+        age=23,
+        gender=Gender.male,
+        firstTime=BooleanEnum.no,
+        collective=Collective.old,
+        leader=BooleanEnum.no,
+        participant=BooleanEnum.yes,
+        preferredPeople=["Person 4", "Person 4"],
+        cohort="Cohort 3",
+    ),
+]
+
+
+def test_columns():
+    """Attributes are stored in columns by position."""
+    table = PeopleTable(deepcopy(PEOPLE))
+    assert len(table) == 4
+    assert list(table.ages) == [20, 21, 22, 23]
+    assert list(table.first_times) == [1, 1, 0, 0]
+    assert list(table.cohorts) == [0, 0, 2, 3]
+    assert table.is_female(2)
+    assert not table.is_female(3)
+    assert table.collective(3) == Collective.old
+
+
+def test_preferences():
+    """Preferences are compressed rows of unique positions."""
+    table = PeopleTable(deepcopy(PEOPLE))
+    assert list(table.offsets) == [0, 1, 2, 3, 3]
+    assert list(table.preferred(0)) == [1]
+    assert list(table.preferred(3)) == []
+    assert table.missing == {3: {"Person 4"}}
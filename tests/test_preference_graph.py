@@ -0,0 +1,105 @@
+# native imports
+from copy import deepcopy
+
+# external imports
+from team_placement.schemas import BooleanEnum, Collective, Gender, Person
+from team_placement.utils.cohorts import Cohorts
+from team_placement.utils.helpers import find_friends, unmet_preferences
+from team_placement.utils.preference_graph import PreferenceGraph
+
+# first time people preferring the next two people
+PEOPLE = [
+    Person(
+        index="Person 0",
+        order=0,
+        firstName="Jane",
+        lastName="Doe 0",
+        age=25,
+        gender=Gender.female,
+        firstTime=BooleanEnum.yes,
+        collective=Collective.new,
+        leader=BooleanEnum.no,
+        participant=BooleanEnum.yes,
+        preferredPeople=["Person 1", "Person 2"],
+        cohort="Cohort 0",
+    ),
+    Person(
+        index="Person 1",
+        order=1,
+        firstName="Jane",
+        lastName="Doe 1",
+        age=25,
+        gender=Gender.female,
+        firstTime=BooleanEnum.yes,
+        collective=Collective.new,
+        leader=BooleanEnum.no,
+        participant=BooleanEnum.yes,
+        preferredPeople=["Person 2", "Person 3"],
+        cohort="Cohort 1",
+    ),
+    Person(
+        index="Person 2",
+        order=2,
+        firstName="Jane",
+        lastName="Doe 2",
+        age=25,
+        gender=Gender.female,
+        firstTime=BooleanEnum.yes,
+        collective=Collective.new,
+        leader=BooleanEnum.no,
+        participant=BooleanEnum.yes,
+        preferredPeople=["Person 3", "Person 4"],
+        cohort="Cohort 2",
+    ),
+    Person(
+        index="Person 3",
+        order=3,
+        firstName="Jane",
+        lastName="Doe 3",
+        age=25,
+        gender=Gender.female,
+        firstTime=BooleanEnum.yes,
+        collective=Collective.new,
+        leader=BooleanEnum.no,
+        participant=BooleanEnum.yes,
+        preferredPeople=["Person 4", "Person 5"],
+        cohort="Cohort 3",
+    ),
+    Person(
+        index="Person 4",
+        order=4,
+        firstName="Jane",
+        lastName="Doe 4",
+        age=25,
+        gender=Gender.female,
+        firstTime=BooleanEnum.yes,
+        collective=Collective.new,
+        leader=BooleanEnum.no,
+        participant=BooleanEnum.yes,
+        preferredPeople=["Person 5", "Person 6"],
+        cohort="Cohort 4",
+    ),
+]
+
+
+def test_adjacency():
+    """Preferences are indexed forward and in reverse by position."""
+    graph = PreferenceGraph(deepcopy(PEOPLE))
+    assert graph.preferred[0] == {1, 2}
+    assert graph.admirers[2] == {0, 1}
+    assert graph.preferred[4] == set()
+    assert graph.missing[4] == {"Person 5", "Person 6"}
+    assert graph.degree(3) == 2
+
+
+def test_unmet_preferences():
+    """Preferred people already in a cohort or banned are met."""
+    people = deepcopy(PEOPLE)
+    cohorts = Cohorts(people)
+    cohorts.join(people[0], people[1])
+    assert find_friends(people[0], cohorts) == [people[2]]
+    assert unmet_preferences(people[0], cohorts) == ["Person 2"]
+
+    cohorts.ban(people[0], "Person 2")
+    assert unmet_preferences(people[0], cohorts) == []
+    assert unmet_preferences(people[3], cohorts) == ["Person 4", "Person 5"]
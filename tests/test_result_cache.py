@@ -0,0 +1,250 @@
+# native imports
+from copy import deepcopy
+
+# third-party imports
+import pytest
+
+# external imports
+from team_placement.algorithm.run_teams import run_teams
+from team_placement.schemas import (
+    BooleanEnum,
+    Collective,
+    Engine,
+    Gender,
+    Person,
+    PlacementReport,
+    Team,
+)
+from team_placement.utils.result_cache import ResultCache, request_key
+
+TEAMS = [
+    Team(index="Team 1", name="Team A"),
+    Team(index="Team 2", name="Team B"),
+]
+
+# two leaders on each team and new people preferring the next person
+PEOPLE = [
+    Person(
+        index="Person 0",
+        order=0,
+        firstName="Jane",
+        lastName="Doe 0",
+        age=20,
+        gender=Gender.female,
+        firstTime=BooleanEnum.no,
+        collective=Collective.new,
+        leader=BooleanEnum.yes,
+        participant=BooleanEnum.yes,
+        team="Team A",
+    ),
+    Person(
+        index="Person 1",
+        order=1,
+        firstName="Jane",
+        lastName="Doe 1",
+        age=21,
+        gender=Gender.male,
+        firstTime=BooleanEnum.no,
+        collective=Collective.newish,
+        leader=BooleanEnum.yes,
+        participant=BooleanEnum.yes,
+        team="Team B",
+    ),
+    Person(
+        index="Person 2",
+        order=2,
+        firstName="Jane",
+        lastName="Doe 2",
+        age=22,
+        gender=Gender.male,
+        firstTime=BooleanEnum.no,
+        collective=Collective.oldish,
+        leader=BooleanEnum.yes,
+        participant=BooleanEnum.yes,
+        team="Team A",
+    ),
+    Person(
+        index="Person 3",
+        order=3,
+        firstName="Jane",
+        lastName="Doe 3",
+        age=23,
+        gender=Gender.female,
+        firstTime=BooleanEnum.no,
+        collective=Collective.old,
+        leader=BooleanEnum.yes,
+        participant=BooleanEnum.yes,
+        team="Team B",
+    ),
+    Person(
+        index="Person 4",
+        order=4,
+        firstName="Jane",
+        lastName="Doe 4",
+        age=24,
+        gender=Gender.male,
+        firstTime=BooleanEnum.yes,
+        collective=Collective.new,
+        leader=BooleanEnum.no,
+        participant=BooleanEnum.yes,
+        preferredPeople=["Person 5"],
+    ),
+    Person(
+        index="Person 5",
+        order=5,
+        firstName="Jane",
+        lastName="Doe 5",
+        age=25,
+        gender=Gender.male,
+        firstTime=BooleanEnum.yes,
+        collective=Collective.newish,
+        leader=BooleanEnum.no,
+        participant=BooleanEnum.yes,
+        preferredPeople=["Person 6"],
+    ),
+    Person(
+        index="Person 6",
+        order=6,
+        firstName="Jane",
+        lastName="Doe 6",
+        age=26,
+        gender=Gender.female,
+        firstTime=BooleanEnum.yes,
+        collective=Collective.oldish,
+        leader=BooleanEnum.no,
+        participant=BooleanEnum.yes,
+        preferredPeople=["Person 7"],
+    ),
+    Person(
+        index="Person 7",
+        order=7,
+        firstName="Jane",
+        lastName="Doe 7",
+        age=20,
+        gender=Gender.male,
+        firstTime=BooleanEnum.yes,
+        collective=Collective.old,
+        leader=BooleanEnum.no,
+        participant=BooleanEnum.yes,
+        preferredPeople=["Person 8"],
+    ),
+    Person(
+        index="Person 8",
+        order=8,
+        firstName="Jane",
+        lastName="Doe 8",
+        age=21,
+        gender=Gender.male,
+        firstTime=BooleanEnum.yes,
+        collective=Collective.new,
+        leader=BooleanEnum.no,
+        participant=BooleanEnum.yes,
+        preferredPeople=["Person 9"],
+    ),
+    Person(
+        index="Person 9",
+        order=9,
+        firstName="Jane",
+        lastName="Doe 9",
+        age=22,
+        gender=Gender.female,
+        firstTime=BooleanEnum.yes,
+        collective=Collective.newish,
+        leader=BooleanEnum.no,
+        participant=BooleanEnum.yes,
+        preferredPeople=["Person 10"],
+    ),
+    Person(
+        index="Person 10",
+        order=10,
+        firstName="Jane",
+        lastName="Doe 10",
+        age=23,
+        gender=Gender.male,
+        firstTime=BooleanEnum.yes,
+        collective=Collective.oldish,
+        leader=BooleanEnum.no,
+        participant=BooleanEnum.yes,
+        preferredPeople=["Person 11"],
+    ),
+    Person(
+        index="Person 11",
+        order=11,
+        firstName="Jane",
+        lastName="Doe 11",
+        age=24,
+        gender=Gender.male,
+        firstTime=BooleanEnum.yes,
+        collective=Collective.old,
+        leader=BooleanEnum.no,
+        participant=BooleanEnum.yes,
+        preferredPeople=["Person 12"],
+    ),
+]
+
+
+def test_request_key():
+    """Equal requests share a key and changed people or options do not."""
+    key = request_key(deepcopy(PEOPLE), [], TEAMS, {"starts": 1})
+    assert request_key(deepcopy(PEOPLE), [], TEAMS, {"starts": 1}) == key
+    assert request_key(deepcopy(PEOPLE), [], TEAMS, {"starts": 2}) != key
+
+    people = deepcopy(PEOPLE)
+    people[5].age = 40
+    assert request_key(people, [], TEAMS, {"starts": 1}) != key
+
+    # cohorts are replaced before placement
+    people = deepcopy(PEOPLE)
+    people[5].cohort = "Cohort 9"
+    assert request_key(people, [], TEAMS, {"starts": 1}) == key
+
+
+def test_result_cache():
+    """Placements are written back and least recently used placements evicted."""
+    cache = ResultCache(2)
+    people = deepcopy(PEOPLE)
+    for i, person in enumerate(people):
+        person.team = TEAMS[i % 2].name
+    cache.put("a", people)
+    cache.put("b", people)
+    assert cache.get("a", [])
+    cache.put("c", people)
+    assert len(cache) == 2
+    assert not cache.get("b", [])
+
+    copies = deepcopy(PEOPLE)
+    assert cache.get("a", copies)
+    assert [x.team for x in copies] == [x.team for x in people]
+
+
+def test_run_teams_cache(capsys):
+    """Equal requests reuse the placement of the first."""
+    cache = ResultCache()
+    placed = run_teams(deepcopy(PEOPLE), [], TEAMS, cache=cache)
+    assert len(cache) == 1
+    assert "reuse placement" not in capsys.readouterr().out
+    assert all(x.team in ["Team A", "Team B"] for x in placed)
+
+    reused = run_teams(deepcopy(PEOPLE), [], TEAMS, cache=cache)
+    assert len(cache) == 1
+    assert "reuse placement" in capsys.readouterr().out
+    assert [x.team for x in reused] == [x.team for x in placed]
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        {"engine": Engine.anneal, "anneal_time_budget": 0},
+        {"engine": Engine.exact, "exact_time_budget": 0},
+    ],
+)
+def test_run_teams_timed_out(options):
+    """Placements cut short by time are returned but not reused."""
+    cache = ResultCache()
+    report = PlacementReport()
+    placed = run_teams(
+        deepcopy(PEOPLE), [], TEAMS, cache=cache, report=report, **options
+    )
+    assert report.timed_out
+    assert len(cache) == 0
+    assert all(x.team in ["Team A", "Team B"] for x in placed)
@@ -39,3 +39,38 @@ def test_process(monkeypatch):
 
     assert response.status_code == 200
     run_mock.call_count == 1
+
+
+@pytest.mark.usefixtures("my_fs")
+def test_seed(monkeypatch):
+    """Seed and moves of annealing are passed to team placement."""
+    run_mock = Mock()
+    run_mock.return_value = []
+    monkeypatch.setattr("team_placement.api.run_teams", run_mock)
+
+    response = client.post(
+        "/run-teams?engine=anneal&seed=3&anneal_moves=1000",
+        json={"people": [], "controls": [], "teams": []},
+    )
+
+    assert response.status_code == 200
+    assert run_mock.call_args.kwargs["seed"] == 3
+    assert run_mock.call_args.kwargs["anneal_moves"] == 1000
+
+
+@pytest.mark.usefixtures("my_fs")
+def test_starts(monkeypatch):
+    """Orders, workers and the time budget are passed to team placement."""
+    run_mock = Mock()
+    run_mock.return_value = []
+    monkeypatch.setattr("team_placement.api.run_teams", run_mock)
+
+    response = client.post(
+        "/run-teams?starts=4&workers=2&time_budget=1.5",
+        json={"people": [], "controls": [], "teams": []},
+    )
+
+    assert response.status_code == 200
+    assert run_mock.call_args.kwargs["starts"] == 4
+    assert run_mock.call_args.kwargs["workers"] == 2
+    assert run_mock.call_args.kwargs["time_budget"] == 1.5
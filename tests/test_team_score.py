@@ -0,0 +1,134 @@
+# native imports
+from copy import deepcopy
+
+# external imports
+from team_placement.schemas import (
+    BooleanEnum,
+    Collective,
+    Gender,
+    Person,
+    Targets,
+    Team,
+)
+from team_placement.utils.cohorts import Cohorts
+from team_placement.utils.team_score import (
+    PREFERENCE_COST,
+    UNPLACED_COST,
+    float_stdev,
+    score_people,
+    team_cost,
+)
+from team_placement.utils.team_search import TeamSearch
+
+TEAMS = [
+    Team(index="Team 1", name="Team A"),
+    Team(index="Team 2", name="Team B"),
+]
+
+TARGETS = Targets(
+    team_size=2,
+    collective_new=2,
+    collective_newish=0,
+    collective_oldish=0,
+    collective_old=0,
+    age_std=0,
+    girl_count=1,
+)
+
+# a first time person preferring the next person on two teams
+PEOPLE = [
+    Person(
+        index="Person 0",
+        order=0,
+        firstName="Jane",
+        lastName="Doe 0",
+        age=25,
+        gender=Gender.female,
+        firstTime=BooleanEnum.yes,
+        collective=Collective.new,
+        leader=BooleanEnum.no,
+        participant=BooleanEnum.yes,
+        team="Team A",
+        preferredPeople=["Person 1"],
+    ),
+    Person(
+        index="Person 1",
+        order=1,
+        firstName="Jane",
+        lastName="Doe 1",
+        age=25,
+        gender=Gender.male,
+        firstTime=BooleanEnum.no,
+        collective=Collective.new,
+        leader=BooleanEnum.no,
+        participant=BooleanEnum.yes,
+        team="Team A",
+    ),
+    Person(
+        index="Person 2",
+        order=2,
+        firstName="Jane",
+        lastName="Doe 2",
+        age=25,
+        gender=Gender.female,
+        firstTime=BooleanEnum.no,
+        collective=Collective.new,
+        leader=BooleanEnum.no,
+        participant=BooleanEnum.yes,
+        team="Team B",
+    ),
+    Person(
+        index="Person 3",
+        order=3,
+        firstName="Jane",
+        lastName="Doe 3",
+        age=25,
+        gender=Gender.male,
+        firstTime=BooleanEnum.no,
+        collective=Collective.new,
+        leader=BooleanEnum.no,
+        participant=BooleanEnum.yes,
+        team="Team B",
+    ),
+]
+
+
+def test_float_stdev():
+    """Standard deviations are calculated from moments."""
+    assert float_stdev(1, 25, 625) == 0
+    assert float_stdev(3, 6, 14) == 1
+
+
+def test_team_cost():
+    """Teams meeting every target cost nothing."""
+    assert team_cost([2, 2, 0, 0, 0, 1, 50, 1250], TARGETS) == 0
+    assert team_cost([3, 3, 0, 0, 0, 1, 75, 1875], TARGETS) > 0
+
+
+def test_score_people():
+    """Unmet preferences and people without teams are scored."""
+    people = deepcopy(PEOPLE)
+    assert score_people(people, TEAMS, TARGETS) == 0
+
+    people[1].team = "Team B"
+    people[3].team = "Team A"
+    assert score_people(people, TEAMS, TARGETS) == PREFERENCE_COST
+
+    people[2].team = ""
+    score = score_people(people, TEAMS, TARGETS)
+    assert score > PREFERENCE_COST + UNPLACED_COST
+
+
+def test_score_people_empty_team():
+    """Teams without people are scored the same as by team search."""
+    people = deepcopy(PEOPLE)
+    teams = TEAMS + [Team(index="Team 3", name="Team C")]
+    assert score_people(people, teams, TARGETS) == team_cost([0] * 8, TARGETS)
+
+    # people on a team form its cohort
+    for person in people:
+        person.cohort = person.team
+    cohorts = Cohorts(people)
+    search = TeamSearch(cohorts, TARGETS, teams)
+    search.place(cohorts)
+    assert search.cost() == score_people(people, teams, TARGETS)